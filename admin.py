@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from .models import Property, Tenant, Lease
+from .models import (
+    ArchivedRow, CPIIndex, EscalationRule, Lease, LeaseBalance, LedgerEntry, ModuleSettings, Property, RentHistory,
+    Tenant, TenantBalance,
+)
 
 @admin.register(Property)
 class PropertyAdmin(admin.ModelAdmin):
@@ -20,3 +23,45 @@ class LeaseAdmin(admin.ModelAdmin):
     search_fields = ['status']
     readonly_fields = ['created_at', 'updated_at']
 
+@admin.register(EscalationRule)
+class EscalationRuleAdmin(admin.ModelAdmin):
+    list_display = ['lease', 'kind', 'percent', 'index_name', 'next_review_date', 'reviews_applied']
+    list_filter = ['kind']
+    readonly_fields = ['reviews_applied', 'created_at', 'updated_at']
+
+@admin.register(RentHistory)
+class RentHistoryAdmin(admin.ModelAdmin):
+    list_display = ['lease', 'effective_date', 'old_rent', 'new_rent', 'reason']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(CPIIndex)
+class CPIIndexAdmin(admin.ModelAdmin):
+    list_display = ['index_name', 'period', 'value']
+    list_filter = ['index_name']
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ['lease', 'tenant', 'kind', 'posted_on', 'amount', 'reference']
+    list_filter = ['kind']
+    readonly_fields = ['running_debits', 'created_at', 'updated_at']
+
+@admin.register(LeaseBalance)
+class LeaseBalanceAdmin(admin.ModelAdmin):
+    list_display = ['lease', 'tenant', 'balance', 'arrears_since']
+    readonly_fields = ['debits', 'credits', 'balance', 'arrears_since', 'updated_at']
+
+@admin.register(TenantBalance)
+class TenantBalanceAdmin(admin.ModelAdmin):
+    list_display = ['tenant', 'balance', 'arrears_since']
+    readonly_fields = ['balance', 'arrears_since', 'updated_at']
+
+@admin.register(ModuleSettings)
+class ModuleSettingsAdmin(admin.ModelAdmin):
+    list_display = ['hub_id', 'default_page_size', 'currency', 'billing_day', 'search_backend', 'retention_days', 'updated_at']
+    readonly_fields = ['updated_at']
+
+@admin.register(ArchivedRow)
+class ArchivedRowAdmin(admin.ModelAdmin):
+    list_display = ['model_name', 'object_id', 'hub_id', 'deleted_at', 'archived_at']
+    list_filter = ['model_name']
+    readonly_fields = ['hub_id', 'model_name', 'object_id', 'deleted_at', 'archived_at', 'data']
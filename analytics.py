@@ -0,0 +1,184 @@
+"""
+Vectorized portfolio analytics.
+
+``Property`` and ``Lease`` columns are read once with ``values_list`` into
+NumPy arrays and every KPI is computed with array operations (masks,
+``bincount``, ``unique``) instead of looping over model instances:
+
+- occupancy rate: lettable properties with a lease covering the reference date
+- vacancy days: days in the window not covered by any lease, per property
+- rent yield: lease rent earned over the window as a share of the asking
+  rent of every lettable property for the same days
+- rent per m²: asking rent over ``area_sqm`` where the area is known
+- breakdowns of the above by ``property_type`` and ``bedrooms``
+
+NumPy is optional; without it ``is_available()`` is ``False`` and
+``get_portfolio_analytics`` returns ``None``. Results are cached per hub
+for ``PROPERTY_MGMT_ANALYTICS_TTL`` seconds (default 900) and are not
+invalidated on writes, so they may lag recent edits by up to the TTL.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .cache import hub_cache_key
+from .models import Property, Lease
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+CACHE_KEY = 'property_mgmt:analytics:{hub_id}'
+WINDOW_DAYS = 365
+# Ended leases still count towards leased days inside the window.
+LEASE_STATUSES = ('active', 'ended')
+
+
+def is_available():
+    return np is not None
+
+
+def _ttl():
+    return getattr(settings, 'PROPERTY_MGMT_ANALYTICS_TTL', 900)
+
+
+def _float_array(values):
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+
+
+def load_arrays(hub_id):
+    """
+    Column arrays for a hub's properties and leases.
+
+    Lease rows reference properties by position (``lease_prop``) and dates
+    are stored as proleptic ordinals so ranges are plain integer math.
+    """
+    prop_rows = list(
+        Property.objects.filter(hub_id=hub_id, is_deleted=False)
+        .values_list('id', 'property_type', 'bedrooms', 'area_sqm', 'monthly_rent', 'status')
+    )
+    ids, types, bedrooms, areas, rents, statuses = zip(*prop_rows) if prop_rows else ((),) * 6
+    position = {pk: i for i, pk in enumerate(ids)}
+
+    lease_rows = list(
+        Lease.objects.filter(hub_id=hub_id, is_deleted=False, status__in=LEASE_STATUSES)
+        .values_list('property_id', 'start_date', 'end_date', 'monthly_rent')
+    )
+    lease_rows = [r for r in lease_rows if r[0] in position]
+    lease_prop, starts, ends, lease_rents = zip(*lease_rows) if lease_rows else ((),) * 4
+    open_end = timezone.localdate().toordinal() + 100 * 366
+
+    type_labels, type_codes = np.unique(np.array(types, dtype=object).astype(str), return_inverse=True)
+    return {
+        'type_labels': [str(t) for t in type_labels],
+        'type_codes': type_codes.astype(int).ravel(),
+        'bedrooms': np.array(bedrooms, dtype=int),
+        'area': _float_array(areas),
+        'rent': _float_array(rents),
+        'lettable': np.array([s != 'sold' for s in statuses], dtype=bool),
+        'lease_prop': np.array([position[p] for p in lease_prop], dtype=int),
+        'lease_start': np.array([d.toordinal() for d in starts], dtype=int),
+        'lease_end': np.array([d.toordinal() if d else open_end for d in ends], dtype=int),
+        'lease_rent': _float_array(lease_rents),
+    }
+
+
+def _group(codes, labels, **columns):
+    """Per-group row counts and per-group sums of each array in ``columns``."""
+    size = len(labels)
+    counts = np.bincount(codes, minlength=size)
+    sums = {name: np.bincount(codes, weights=values, minlength=size) for name, values in columns.items()}
+    return counts, sums
+
+
+def _ratio(num, den, scale=1.0, digits=2):
+    return round(float(num) * scale / float(den), digits) if den else 0
+
+
+def compute_portfolio_analytics(hub_id, as_of=None, window_days=WINDOW_DAYS):
+    """Portfolio KPIs for a hub as of ``as_of`` over the preceding window."""
+    as_of = as_of or timezone.localdate()
+    a = load_arrays(hub_id)
+    n = len(a['rent'])
+    today = as_of.toordinal()
+    window_start = (as_of - timedelta(days=window_days - 1)).toordinal()
+
+    # Occupied: any lease covering the reference date.
+    current = (a['lease_start'] <= today) & (a['lease_end'] >= today)
+    occupied = np.zeros(n, dtype=bool)
+    occupied[a['lease_prop'][current]] = True
+    occupied &= a['lettable']
+
+    # Leased days inside the window, summed per property. Leases on one
+    # property don't overlap, so the sum never exceeds the window.
+    overlap = (
+        np.minimum(a['lease_end'], today) - np.maximum(a['lease_start'], window_start) + 1
+    ).clip(min=0)
+    leased_days = np.minimum(np.bincount(a['lease_prop'], weights=overlap, minlength=n), window_days)
+    vacancy_days = np.where(a['lettable'], window_days - leased_days, 0)
+
+    # Rent earned (lease rent pro rata per day) vs asking rent for the window.
+    daily_factor = 12 / 365.0
+    earned = np.bincount(a['lease_prop'], weights=a['lease_rent'] * overlap * daily_factor, minlength=n)
+    earned = np.where(a['lettable'], earned, 0)
+    asking = np.where(a['lettable'], np.nan_to_num(a['rent']) * window_days * daily_factor, 0)
+
+    has_area = ~np.isnan(a['area']) & (a['area'] > 0)
+    rent_sqm = np.full(n, np.nan)
+    rent_sqm[has_area] = a['rent'][has_area] / a['area'][has_area]
+
+    lettable_count = int(a['lettable'].sum())
+    summary = {
+        'properties': n,
+        'lettable': lettable_count,
+        'occupied': int(occupied.sum()),
+        'occupancy_rate': _ratio(occupied.sum(), lettable_count, 100, 1),
+        'vacancy_days': int(vacancy_days.sum()),
+        'avg_vacancy_days': _ratio(vacancy_days.sum(), lettable_count, digits=1),
+        'rent_yield': _ratio(earned.sum(), asking.sum(), 100, 1),
+        'avg_rent_sqm': round(float(np.nanmean(rent_sqm)), 2) if has_area.any() else 0,
+        'median_rent_sqm': round(float(np.nanmedian(rent_sqm)), 2) if has_area.any() else 0,
+        'window_days': window_days,
+    }
+
+    def breakdown(codes, labels):
+        counts, sums = _group(
+            codes, labels,
+            occupied=occupied.astype(float),
+            lettable=a['lettable'].astype(float),
+            vacancy=vacancy_days.astype(float),
+            rent=np.nan_to_num(a['rent']),
+            rent_sqm=np.nan_to_num(rent_sqm),
+            with_area=has_area.astype(float),
+        )
+        return [
+            {
+                'label': label,
+                'count': int(counts[i]),
+                'occupancy_rate': _ratio(sums['occupied'][i], sums['lettable'][i], 100, 1),
+                'avg_vacancy_days': _ratio(sums['vacancy'][i], sums['lettable'][i], digits=1),
+                'avg_rent': _ratio(sums['rent'][i], counts[i]),
+                'avg_rent_sqm': _ratio(sums['rent_sqm'][i], sums['with_area'][i]),
+            }
+            for i, label in enumerate(labels) if counts[i]
+        ]
+
+    bedroom_labels, bedroom_codes = np.unique(a['bedrooms'], return_inverse=True)
+    summary['by_type'] = breakdown(a['type_codes'], a['type_labels'])
+    summary['by_bedrooms'] = breakdown(bedroom_codes.ravel(), [int(b) for b in bedroom_labels])
+    return summary
+
+
+def get_portfolio_analytics(hub_id):
+    """Cached analytics for a hub, or ``None`` when NumPy isn't installed."""
+    if not is_available():
+        return None
+    key = hub_cache_key(hub_id, CACHE_KEY)
+    data = cache.get(key)
+    if data is None:
+        data = compute_portfolio_analytics(hub_id)
+        cache.set(key, data, _ttl())
+    return data
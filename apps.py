@@ -9,4 +9,4 @@ class PropertyMgmtConfig(AppConfig):
     verbose_name = _('Property Management')
 
     def ready(self):
-        pass
+        from . import ledger, renewals, signals  # noqa: F401
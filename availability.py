@@ -0,0 +1,109 @@
+"""
+Occupancy timeline and availability search.
+
+Every active, non-deleted lease has one ``OccupancySpan`` row holding its
+property and date range, with open ends stored as ``date.max``. Spans are
+kept in sync incrementally: each lease save rewrites or drops its own span
+(see ``signals.py``), and bulk lease writes rebuild the hub's spans.
+
+"Which properties are free between A and B" is then a single anti-join:
+properties with no span where ``start_date <= B`` and ``end_date >= A``,
+answered from the ``(property, start_date, end_date)`` index.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .leasing import OCCUPYING_STATUSES, OPEN_END
+from .models import Lease, OccupancySpan, Property
+
+REBUILD_CHUNK_SIZE = 2000
+
+# Properties that can't be let whatever the dates.
+UNLETTABLE_STATUSES = ('sold',)
+
+
+def sync_lease(lease):
+    """
+    Create, move or drop the span of one lease to match its current state.
+
+    Returns the ids of the properties whose timeline changed: the lease's
+    property and, if the lease moved, its previous one.
+    """
+    previous = OccupancySpan.objects.filter(lease_id=lease.pk).values_list('property_id', flat=True).first()
+    touched = {lease.property_id} | ({previous} if previous else set())
+    if lease.is_deleted or lease.status not in OCCUPYING_STATUSES:
+        if previous:
+            OccupancySpan.objects.filter(lease_id=lease.pk).delete()
+        return touched
+    OccupancySpan.objects.update_or_create(
+        lease_id=lease.pk,
+        defaults={
+            'hub_id': lease.hub_id,
+            'property_id': lease.property_id,
+            'start_date': lease.start_date,
+            'end_date': lease.end_date or OPEN_END,
+        },
+    )
+    return touched
+
+
+def rebuild_timeline(hub_id=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """Recreate the spans of one hub (or every hub). Returns the span count."""
+    leases = Lease.objects.filter(is_deleted=False, status__in=OCCUPYING_STATUSES)
+    spans = OccupancySpan.objects.all()
+    if hub_id is not None:
+        leases = leases.filter(hub_id=hub_id)
+        spans = spans.filter(hub_id=hub_id)
+    rows = leases.values_list('id', 'hub_id', 'property_id', 'start_date', 'end_date')
+    created = 0
+    with transaction.atomic():
+        spans.delete()
+        batch = []
+        for lease_id, lease_hub_id, property_id, start_date, end_date in rows.iterator(chunk_size=chunk_size):
+            batch.append(OccupancySpan(
+                lease_id=lease_id, hub_id=lease_hub_id, property_id=property_id,
+                start_date=start_date, end_date=end_date or OPEN_END,
+            ))
+            if len(batch) >= chunk_size:
+                OccupancySpan.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        OccupancySpan.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def occupied_between(start_date, end_date=None):
+    """Spans intersecting ``[start_date, end_date]``, correlated to the outer property."""
+    return OccupancySpan.objects.filter(
+        property_id=OuterRef('pk'),
+        start_date__lte=end_date or OPEN_END,
+        end_date__gte=start_date,
+    )
+
+
+def filter_available(qs, start_date, end_date=None, min_bedrooms=None, max_rent=None):
+    """
+    Narrow a ``Property`` queryset to lettable properties free for the whole
+    range, optionally with at least ``min_bedrooms`` and rent up to ``max_rent``.
+    """
+    qs = qs.filter(is_active=True).exclude(status__in=UNLETTABLE_STATUSES)
+    if min_bedrooms is not None:
+        qs = qs.filter(bedrooms__gte=min_bedrooms)
+    if max_rent is not None:
+        qs = qs.filter(monthly_rent__lte=max_rent)
+    return qs.filter(~Exists(occupied_between(start_date, end_date)))
+
+
+def available_properties(hub_id, start_date, end_date=None, min_bedrooms=None, max_rent=None):
+    """Properties of a hub free between ``start_date`` and ``end_date`` (open-ended if ``None``)."""
+    qs = Property.objects.filter(hub_id=hub_id, is_deleted=False)
+    return filter_available(qs, start_date, end_date, min_bedrooms, max_rent)
+
+
+def occupancy_timeline(property_id):
+    """A property's occupied ranges in date order, as ``(start, end, lease_id)``."""
+    return list(
+        OccupancySpan.objects.filter(property_id=property_id)
+        .order_by('start_date').values_list('start_date', 'end_date', 'lease_id')
+    )
@@ -0,0 +1,119 @@
+"""
+Performance benchmarks for the property management module.
+
+Scenarios seed their own hub and are run through
+``python manage.py property_mgmt_benchmark <scenario>``. Point the command
+at a disposable database: seeding inserts large volumes of rows and some
+scenarios temporarily drop indexes to measure the "before" case.
+
+Results can be stored as a baseline (``--save-baseline``) and later runs
+checked against it (``--check``): a row fails when it runs more queries
+than its baseline, or is slower by more than the tolerance and by more
+than ``MIN_SLOWDOWN_MS``. Baselines are keyed by scenario and portfolio
+size; query counts carry across machines, timings only within one.
+"""
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SCENARIOS = {}
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+DEFAULT_TOLERANCE = 0.5
+# Slowdowns smaller than this are timer noise, whatever the ratio.
+MIN_SLOWDOWN_MS = 2.0
+
+
+def scenario(name):
+    """Register a benchmark scenario under ``name``."""
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+def measure(func, repeat=5):
+    """
+    Run ``func`` ``repeat`` times and return ``(median_ms, query_count)``.
+
+    The query count is taken from the last run so warm caches are reflected.
+    """
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = len(ctx.captured_queries)
+    return statistics.median(timings), queries
+
+
+def explain(queryset):
+    """Return the backend's query plan for ``queryset`` as a single string."""
+    try:
+        return queryset.explain()
+    except Exception as exc:  # Not every backend supports EXPLAIN
+        return f'<no plan: {exc}>'
+
+
+def analyze():
+    """Refresh planner statistics after seeding so plans reflect the data."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def result(name, ms, queries=None, **extra):
+    """Build a result row in the shape the command renders."""
+    row = {'name': name, 'ms': round(ms, 3)}
+    if queries is not None:
+        row['queries'] = queries
+    row.update(extra)
+    return row
+
+
+def load_scenarios():
+    """Import every scenario module so the registry is populated."""
+    from . import (  # noqa: F401
+        analytics, availability, billing, concurrency, escalation, exports, importer, indexes, reconcile, render, search, views,
+    )
+
+
+def baseline_key(name, properties):
+    return f'{name}@{properties}'
+
+
+def load_baseline(path=BASELINE_PATH):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(key, rows, path=BASELINE_PATH):
+    """Store ``rows`` under ``key``, keeping the file's other entries."""
+    baseline = load_baseline(path)
+    baseline[key] = {
+        row['name']: {k: row[k] for k in ('ms', 'queries') if k in row}
+        for row in rows
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+
+
+def compare(rows, expected, tolerance=DEFAULT_TOLERANCE):
+    """Regression messages for ``rows`` against one baseline entry; rows it lacks are skipped."""
+    failures = []
+    for row in rows:
+        base = expected.get(row['name'])
+        if base is None:
+            continue
+        if 'queries' in base and row.get('queries', 0) > base['queries']:
+            failures.append(f'{row["name"]}: {row["queries"]} queries, baseline {base["queries"]}')
+        limit = base['ms'] * (1 + tolerance)
+        if row['ms'] > limit and row['ms'] - base['ms'] > MIN_SLOWDOWN_MS:
+            failures.append(f'{row["name"]}: {row["ms"]:.3f} ms, baseline {base["ms"]:.3f} ms (limit {limit:.3f})')
+    return failures
@@ -0,0 +1,64 @@
+"""
+Analytics benchmark.
+
+Times the vectorized ``compute_portfolio_analytics`` against a naive
+version that walks model instances in Python, on the same seeded hub.
+``--properties`` scales leases at 1.5x, so 7000/70000/700000 properties
+give roughly 10k/100k/1M lease rows.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from property_mgmt.analytics import LEASE_STATUSES, WINDOW_DAYS, compute_portfolio_analytics, is_available
+from property_mgmt.models import Property, Lease
+
+from . import analyze, measure, result, scenario
+from .seed import seed_portfolio
+
+
+def naive_portfolio_analytics(hub_id, window_days=WINDOW_DAYS):
+    """Reference implementation: one Python iteration per property and lease."""
+    today = timezone.localdate()
+    window_start = today - timedelta(days=window_days - 1)
+    properties = list(Property.objects.filter(hub_id=hub_id, is_deleted=False))
+    leased_days = defaultdict(int)
+    occupied = set()
+    for lease in Lease.objects.filter(hub_id=hub_id, is_deleted=False, status__in=LEASE_STATUSES):
+        end = lease.end_date or today
+        if lease.start_date <= today <= (lease.end_date or today):
+            occupied.add(lease.property_id)
+        days = (min(end, today) - max(lease.start_date, window_start)).days + 1
+        if days > 0:
+            leased_days[lease.property_id] += days
+
+    lettable = [p for p in properties if p.status != 'sold']
+    by_type = defaultdict(lambda: {'count': 0, 'occupied': 0, 'rent_sqm': []})
+    rent_sqm = []
+    vacancy = 0
+    for prop in lettable:
+        vacancy += window_days - min(leased_days[prop.pk], window_days)
+        group = by_type[prop.property_type]
+        group['count'] += 1
+        group['occupied'] += prop.pk in occupied
+        if prop.area_sqm:
+            group['rent_sqm'].append(prop.monthly_rent / prop.area_sqm)
+            rent_sqm.append(prop.monthly_rent / prop.area_sqm)
+    return {
+        'occupancy_rate': round(sum(p.pk in occupied for p in lettable) * 100 / len(lettable), 1) if lettable else 0,
+        'vacancy_days': vacancy,
+        'avg_rent_sqm': round(sum(rent_sqm) / len(rent_sqm), 2) if rent_sqm else 0,
+        'by_type': dict(by_type),
+    }
+
+
+@scenario('analytics')
+def run(properties=7000, repeat=3, **options):
+    hub_id = seed_portfolio(properties=properties)
+    analyze()
+    leases = Lease.objects.filter(hub_id=hub_id).count()
+    rows = [result('naive ORM loop', *measure(lambda: naive_portfolio_analytics(hub_id), repeat), leases=leases)]
+    if is_available():
+        rows.append(result('vectorized', *measure(lambda: compute_portfolio_analytics(hub_id), repeat), leases=leases))
+    return rows
@@ -0,0 +1,66 @@
+"""
+Availability search benchmark.
+
+Answers "free between A and B with at least N bedrooms under X rent" three
+ways: the original shape (one overlap query per candidate property), a
+``NOT EXISTS`` against ``Lease`` (with its ``end_date IS NULL`` branch), and
+the anti-join against the occupancy timeline.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from property_mgmt.availability import available_properties
+from property_mgmt.leasing import OCCUPYING_STATUSES, overlapping_leases
+from property_mgmt.models import Lease, Property
+
+from . import analyze, explain, measure, result, scenario
+from .seed import seed_portfolio
+
+
+def _candidates(hub_id, min_bedrooms, max_rent):
+    return (
+        Property.objects.filter(hub_id=hub_id, is_deleted=False, is_active=True)
+        .exclude(status='sold').filter(bedrooms__gte=min_bedrooms, monthly_rent__lte=max_rent)
+    )
+
+
+def naive_available(hub_id, start, end, min_bedrooms, max_rent):
+    return [
+        p for p in _candidates(hub_id, min_bedrooms, max_rent)
+        if not overlapping_leases(p.pk, start, end).exists()
+    ]
+
+
+def lease_anti_join(hub_id, start, end, min_bedrooms, max_rent):
+    busy = Lease.objects.filter(
+        property_id=OuterRef('pk'), is_deleted=False, status__in=OCCUPYING_STATUSES, start_date__lte=end,
+    ).filter(Q(end_date__isnull=True) | Q(end_date__gte=start))
+    return list(_candidates(hub_id, min_bedrooms, max_rent).filter(~Exists(busy)))
+
+
+@scenario('availability')
+def run(properties=20000, repeat=5, **options):
+    hub_id = seed_portfolio(properties=properties)
+    analyze()
+    today = timezone.localdate()
+    searches = [
+        ('next-month:2bed:<2000', today + timedelta(days=30), today + timedelta(days=60), 2, Decimal('2000')),
+        ('next-year:any', today + timedelta(days=365), today + timedelta(days=730), 0, Decimal('100000')),
+    ]
+    rows = []
+    for label, start, end, beds, rent in searches:
+        args = (hub_id, start, end, beds, rent)
+        for name, func in (
+            ('naive', naive_available),
+            ('lease-anti-join', lease_anti_join),
+            ('timeline', lambda *a: list(available_properties(*a))),
+        ):
+            found = len(func(*args))
+            ms, queries = measure(lambda: func(*args), repeat=1 if name == 'naive' else repeat)
+            rows.append(result(f'{name}:{label}', ms, queries, found=found))
+    plan = explain(available_properties(hub_id, *searches[0][1:]))
+    rows.append(result('plan:timeline', 0, plan=plan.replace('\n', ' | ')))
+    return rows
@@ -0,0 +1,40 @@
+"""
+Rent billing benchmark.
+
+Bills the current month for a seeded hub, then reruns the same period to
+time the idempotent path (every lease already billed).
+"""
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from property_mgmt.billing import generate_rent_charges, parse_period
+
+from . import analyze, result, scenario
+from .seed import seed_portfolio
+
+
+def _run(name, period, hub_id):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        billing = generate_rent_charges(period, hub_id)
+        elapsed = time.perf_counter() - start
+    return result(
+        name, elapsed * 1000, len(ctx.captured_queries),
+        leases=billing.leases, created=billing.created, skipped=billing.skipped,
+        leases_per_sec=int(billing.leases / elapsed) if elapsed else 0,
+    )
+
+
+@scenario('billing')
+def run(properties=100000, repeat=1, **options):
+    # 1.5 leases per property; about two thirds are current.
+    hub_id = seed_portfolio(properties=properties)
+    analyze()
+    period = parse_period(timezone.localdate())
+    return [
+        _run('generate', period, hub_id),
+        _run('rerun (idempotent)', period, hub_id),
+    ]
@@ -0,0 +1,126 @@
+"""
+Concurrent-user load test: sync views against their async variants.
+
+Each simulated user requests the dashboard, a deep properties page and the
+first tenants page ``repeat`` times, back to back. Sync views are driven
+from a pool of threads with one test ``Client`` each, as a threaded server
+runs them; async views through ``AsyncClient`` on one event loop, routed
+with ``PROPERTY_MGMT_ASYNC_VIEWS``. Every row is one (mode, users) level
+with its throughput and latency percentiles; ``ms`` is the wall time of
+the whole level.
+"""
+import asyncio
+import importlib
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import clear_url_caches, reverse
+
+import property_mgmt.urls
+
+from . import result, scenario
+from .seed import seed_portfolio
+from .views import HTMX_LIST, _client
+
+USER_LEVELS = (1, 8, 32)
+
+
+def _pages(properties):
+    return [
+        (reverse('property_mgmt:dashboard'), {}, {}),
+        (reverse('property_mgmt:properties_list'), {'per_page': 25, 'page': max(1, properties // 50)}, HTMX_LIST),
+        (reverse('property_mgmt:tenants_list'), {'per_page': 25}, HTMX_LIST),
+    ]
+
+
+def _reload_urls():
+    # urls.py picks the views when imported; the root urlconf holds its patterns.
+    importlib.reload(property_mgmt.urls)
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@contextmanager
+def _async_routes():
+    try:
+        with override_settings(PROPERTY_MGMT_ASYNC_VIEWS=True):
+            _reload_urls()
+            yield
+    finally:
+        _reload_urls()
+
+
+def _sync_user(cookies, pages, repeat):
+    client = Client()
+    client.cookies = cookies
+    latencies = []
+    try:
+        for _ in range(repeat):
+            for url, data, headers in pages:
+                start = time.perf_counter()
+                response = client.get(url, data, **headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, f'{url}: HTTP {response.status_code}'
+    finally:
+        # Worker threads open their own connections.
+        connections.close_all()
+    return latencies
+
+
+async def _async_user(cookies, pages, repeat):
+    client = AsyncClient()
+    client.cookies = cookies
+    latencies = []
+    for _ in range(repeat):
+        for url, data, headers in pages:
+            start = time.perf_counter()
+            response = await client.get(url, data, **headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, f'{url}: HTTP {response.status_code}'
+    return latencies
+
+
+def _run_sync(cookies, pages, users, repeat):
+    with ThreadPoolExecutor(users) as pool:
+        return [ms for user in pool.map(lambda _: _sync_user(cookies, pages, repeat), range(users)) for ms in user]
+
+
+async def _run_async(cookies, pages, users, repeat):
+    per_user = await asyncio.gather(*(_async_user(cookies, pages, repeat) for _ in range(users)))
+    return [ms for user in per_user for ms in user]
+
+
+def _row(mode, users, wall_ms, latencies):
+    p50 = statistics.median(latencies)
+    p95 = statistics.quantiles(latencies, n=20)[18] if len(latencies) > 1 else p50
+    return result(
+        f'{mode}:{users}_users', wall_ms, requests=len(latencies),
+        req_per_sec=round(len(latencies) / (wall_ms / 1000), 1), p50_ms=round(p50, 1), p95_ms=round(p95, 1),
+    )
+
+
+@scenario('concurrency')
+def run(properties=1000, repeat=5, **options):
+    hub_id = seed_portfolio(properties=properties)
+    cookies = _client(hub_id).cookies
+    rows = []
+    with override_settings(ALLOWED_HOSTS=['*']):
+        pages = _pages(properties)
+        # Warm the dashboard and count caches once for both modes.
+        _sync_user(cookies, pages, 1)
+        for users in USER_LEVELS:
+            start = time.perf_counter()
+            latencies = _run_sync(cookies, pages, users, repeat)
+            rows.append(_row('sync', users, (time.perf_counter() - start) * 1000, latencies))
+        with _async_routes():
+            for users in USER_LEVELS:
+                start = time.perf_counter()
+                latencies = asyncio.run(_run_async(cookies, pages, users, repeat))
+                rows.append(_row('async', users, (time.perf_counter() - start) * 1000, latencies))
+    return rows
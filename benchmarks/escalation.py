@@ -0,0 +1,72 @@
+"""
+Rent escalation benchmark.
+
+Gives every active lease of a seeded hub a due escalation rule (a mix of
+fixed, CPI and step rules), then times the preview and one applied run.
+For comparison it also times writing the same rents with
+``bulk_update``, rolled back.
+"""
+import time
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from property_mgmt.escalation import apply_escalations, cpi_periods, preview_escalations
+from property_mgmt.models import CPIIndex, EscalationRule, Lease
+
+from . import measure, result, scenario
+from .seed import seed_portfolio
+
+
+def _seed_rules(hub_id, today):
+    base, current = cpi_periods(today, 12)
+    CPIIndex.objects.bulk_create([
+        CPIIndex(index_name='BENCH-CPI', period=base, value=Decimal('100.000')),
+        CPIIndex(index_name='BENCH-CPI', period=current, value=Decimal('103.400')),
+    ], ignore_conflicts=True)
+    leases = Lease.objects.filter(hub_id=hub_id, is_deleted=False, status='active').values_list('id', flat=True)
+    rules = []
+    for i, lease_id in enumerate(leases.iterator(chunk_size=5000)):
+        kind = ('fixed', 'cpi', 'step')[i % 3]
+        rules.append(EscalationRule(
+            hub_id=hub_id, lease_id=lease_id, kind=kind, next_review_date=today,
+            percent=Decimal('2.5') if kind == 'fixed' else None,
+            index_name='BENCH-CPI' if kind == 'cpi' else '', cap_percent=Decimal('3') if kind == 'cpi' else None,
+            steps=['1500.00', '1600.00'] if kind == 'step' else [],
+        ))
+    EscalationRule.objects.bulk_create(rules, batch_size=5000)
+    return len(rules)
+
+
+@scenario('escalation')
+def run(properties=70000, repeat=3, **options):
+    hub_id = seed_portfolio(properties=properties)
+    review = timezone.localdate()
+    rules = _seed_rules(hub_id, review)
+    rows = []
+
+    ms, queries = measure(lambda: preview_escalations(hub_id, review), repeat=repeat)
+    changes, skipped = preview_escalations(hub_id, review)
+    rows.append(result('preview', ms, queries, rules=rules, changes=len(changes), skipped=len(skipped)))
+
+    objs = [Lease(pk=c.lease_id, monthly_rent=c.new_rent) for c in changes]
+
+    def bulk_update():
+        with transaction.atomic():
+            Lease.objects.bulk_update(objs, ['monthly_rent'], batch_size=1000)
+            transaction.set_rollback(True)
+
+    ms, queries = measure(bulk_update, repeat=1)
+    rows.append(result('bulk_update (lease rent only, rolled back)', ms, queries, leases=len(objs)))
+
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        applied = apply_escalations(hub_id, review)
+        ms = (time.perf_counter() - start) * 1000
+    rows.append(result(
+        'apply', ms, len(ctx.captured_queries), changed=applied.changed,
+        leases_per_sec=int(applied.changed / (ms / 1000)) if ms else applied.changed,
+    ))
+    return rows
@@ -0,0 +1,60 @@
+"""
+Export benchmark.
+
+Compares peak Python memory (tracemalloc) and throughput of the in-memory
+``apps.core.services`` exporters against the streaming ones. Throughput is
+timed on a separate untraced run since tracemalloc slows allocation down.
+"""
+import time
+import tracemalloc
+
+from apps.core.services import export_to_csv, export_to_excel
+
+from property_mgmt.exports import stream_csv, stream_excel
+from property_mgmt.models import Property
+
+from . import result, scenario
+from .seed import seed_portfolio
+
+FIELDS = ['name', 'status', 'is_active', 'monthly_rent', 'area_sqm', 'bathrooms']
+HEADERS = ['Name', 'Status', 'Is Active', 'Monthly Rent', 'Area Sqm', 'Bathrooms']
+
+
+def _consume(response):
+    if response.streaming:
+        size = 0
+        for chunk in response.streaming_content:
+            size += len(chunk)
+        return size
+    return len(response.content)
+
+
+def _profile(name, build, rows):
+    start = time.perf_counter()
+    size = _consume(build())
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    _consume(build())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result(
+        name, elapsed * 1000,
+        rows=rows,
+        rows_per_sec=int(rows / elapsed) if elapsed else 0,
+        peak_mb=round(peak / 1024 / 1024, 2),
+        bytes=size,
+    )
+
+
+@scenario('export')
+def run(properties=100000, repeat=1, **options):
+    hub_id = seed_portfolio(properties=properties, leases=0)
+    qs = Property.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name', 'id')
+    rows = qs.count()
+    return [
+        _profile('legacy:csv', lambda: export_to_csv(qs, fields=FIELDS, headers=HEADERS, filename='p.csv'), rows),
+        _profile('stream:csv', lambda: stream_csv(qs, FIELDS, HEADERS, 'p.csv'), rows),
+        _profile('legacy:excel', lambda: export_to_excel(qs, fields=FIELDS, headers=HEADERS, filename='p.xlsx'), rows),
+        _profile('stream:excel', lambda: stream_excel(qs, FIELDS, HEADERS, 'p.xlsx'), rows),
+    ]
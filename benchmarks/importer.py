@@ -0,0 +1,80 @@
+"""
+Import benchmark.
+
+Writes a synthetic properties CSV and a tenants CSV (with 10% repeated
+tenants to exercise dedupe) and imports both. The properties file is also
+dry-run twice: once for parse/validate throughput and once under
+tracemalloc for peak Python memory (slower, so its timing isn't comparable).
+"""
+import csv
+import random
+import tempfile
+import tracemalloc
+import uuid
+
+from property_mgmt.importer import import_file
+
+from . import result, scenario
+from .seed import FIRST_NAMES, LAST_NAMES, PROPERTY_TYPES, STATUSES, STREETS
+
+
+def _write_csv(path, headers, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _property_rows(count, rng):
+    for i in range(count):
+        street = rng.choice(STREETS)
+        yield (
+            f'{street} {rng.randint(1, 300)}, {i}', f'{street} {rng.randint(1, 300)}',
+            rng.choice(PROPERTY_TYPES), rng.randint(0, 5), rng.randint(1, 3),
+            rng.randint(25, 400), rng.randint(300, 5000), rng.choice(STATUSES), 'Yes',
+        )
+
+
+def _tenant_rows(count, rng):
+    for i in range(count):
+        n = rng.randrange(i) if i and rng.random() < 0.1 else i
+        first, last = FIRST_NAMES[n % 10], LAST_NAMES[n // 10 % 10]
+        yield f'{first} {last} {n}', f'{first.lower()}.{n}@example.com', f'+346{n:08d}', f'ID{n:08d}', 'Yes'
+
+
+def _report_row(name, report, **extra):
+    return result(
+        name, report.seconds * 1000, rows=report.rows, created=report.created, updated=report.updated,
+        duplicates=report.duplicates, errors=report.error_count, rows_per_sec=report.rows_per_sec, **extra,
+    )
+
+
+@scenario('import')
+def run(properties=100000, repeat=1, **options):
+    rng = random.Random(42)
+    hub_id = uuid.uuid4()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        prop_path, tenant_path = f'{tmp}/properties.csv', f'{tmp}/tenants.csv'
+        _write_csv(
+            prop_path,
+            ['Name', 'Address', 'Property Type', 'Bedrooms', 'Bathrooms', 'Area Sqm', 'Monthly Rent', 'Status', 'Is Active'],
+            _property_rows(properties, rng),
+        )
+        _write_csv(tenant_path, ['Name', 'Email', 'Phone', 'Id Number', 'Is Active'], _tenant_rows(properties, rng))
+
+        with open(prop_path, 'rb') as fh:
+            rows.append(_report_row('properties (dry run)', import_file('properties', fh, prop_path, hub_id, dry_run=True)))
+
+        tracemalloc.start()
+        with open(prop_path, 'rb') as fh:
+            report = import_file('properties', fh, prop_path, hub_id, dry_run=True)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append(_report_row('properties (dry run, traced)', report, peak_mb=round(peak / 1024 / 1024, 2)))
+
+        with open(prop_path, 'rb') as fh:
+            rows.append(_report_row('properties', import_file('properties', fh, prop_path, hub_id)))
+        with open(tenant_path, 'rb') as fh:
+            rows.append(_report_row('tenants', import_file('tenants', fh, tenant_path, hub_id)))
+    return rows
@@ -0,0 +1,75 @@
+"""
+Hub-scoped index benchmark.
+
+Times every list/sort path of the property and tenant datatables plus the
+lease lookup paths, first with the composite indexes in place and then with
+them temporarily dropped, and captures the query plan for each case.
+"""
+from datetime import date, timedelta
+
+from django.db import connection
+
+from property_mgmt.models import Property, Tenant, Lease
+from property_mgmt.views import PROPERTY_SORT_FIELDS, TENANT_SORT_FIELDS
+
+from . import analyze, explain, measure, result, scenario
+from .seed import seed_portfolio
+
+
+def _query_paths(hub_id):
+    props = Property.objects.filter(hub_id=hub_id, is_deleted=False)
+    tenants = Tenant.objects.filter(hub_id=hub_id, is_deleted=False)
+    leases = Lease.objects.filter(hub_id=hub_id, is_deleted=False)
+    sample = Lease.objects.filter(hub_id=hub_id).values('property_id', 'tenant_id').first() or {}
+    today = date.today()
+
+    paths = {}
+    for field in sorted(set(PROPERTY_SORT_FIELDS.values())):
+        paths[f'property.sort.{field}'] = props.order_by(field, 'id')[:25]
+        paths[f'property.sort.-{field}'] = props.order_by(f'-{field}', '-id')[:25]
+    for field in sorted(set(TENANT_SORT_FIELDS.values())):
+        paths[f'tenant.sort.{field}'] = tenants.order_by(field, 'id')[:25]
+    paths['lease.by_property'] = leases.filter(property_id=sample.get('property_id')).order_by('start_date')
+    paths['lease.by_tenant'] = leases.filter(tenant_id=sample.get('tenant_id')).order_by('start_date')
+    paths['lease.by_status'] = leases.filter(status='active').order_by('end_date')[:25]
+    paths['lease.expiring'] = leases.filter(end_date__range=(today, today + timedelta(days=60)))
+    paths['lease.started_since'] = leases.filter(start_date__gte=today - timedelta(days=30))
+    return paths
+
+
+def _run_paths(paths, repeat, label):
+    rows = []
+    for name, qs in paths.items():
+        ms, queries = measure(lambda qs=qs: list(qs.all()), repeat=repeat)
+        plan = ' | '.join(line.strip() for line in explain(qs).splitlines())
+        rows.append(result(f'{label}:{name}', ms, queries, plan=plan))
+    return rows
+
+
+@scenario('indexes')
+def run(properties=50000, repeat=5, **options):
+    hub_id = seed_portfolio(properties=properties)
+    # A second hub so hub_id selectivity is realistic.
+    seed_portfolio(properties=max(properties // 10, 1), seed=7)
+    analyze()
+    paths = _query_paths(hub_id)
+
+    rows = _run_paths(paths, repeat, 'after')
+
+    if not connection.features.supports_partial_indexes:
+        return rows
+
+    dropped = []
+    try:
+        with connection.schema_editor() as editor:
+            for model in (Property, Tenant, Lease):
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+                    dropped.append((model, index))
+        analyze()
+        rows.extend(_run_paths(paths, repeat, 'before'))
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in dropped:
+                editor.add_index(model, index)
+    return rows
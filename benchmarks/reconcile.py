@@ -0,0 +1,35 @@
+"""
+Status reconciliation benchmark.
+
+The seeded statuses are random, so the first pass rewrites most of the hub
+with ``bulk_update``; the second pass finds nothing to change and times the
+read-only path the nightly job takes on a quiet day.
+"""
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from property_mgmt.occupancy import reconcile_hub
+
+from . import analyze, result, scenario
+from .seed import seed_portfolio
+
+
+def _run(name, hub_id):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        r = reconcile_hub(hub_id)
+        elapsed = time.perf_counter() - start
+    return result(
+        name, elapsed * 1000, len(ctx.captured_queries),
+        properties=r.properties, updated=r.updated, expired_leases=r.expired_leases,
+        properties_per_sec=int(r.properties / elapsed) if elapsed else 0,
+    )
+
+
+@scenario('reconcile')
+def run(properties=50000, repeat=1, **options):
+    hub_id = seed_portfolio(properties=properties)
+    analyze()
+    return [_run('reconcile', hub_id), _run('rerun (no changes)', hub_id)]
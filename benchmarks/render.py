@@ -0,0 +1,49 @@
+"""
+Datatable render benchmark.
+
+Renders the property and tenant list partials at each page size with a
+cold row cache (every row rendered) and a warm one (every row served from
+its cached fragment). Rows are fetched once up front so only template
+time is measured.
+"""
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+
+from property_mgmt.models import Property, Tenant
+
+from . import measure, result, scenario
+from .seed import seed_portfolio
+
+PAGE_SIZES = [10, 25, 50, 100]
+LISTS = [
+    (Property, 'properties', 'property_mgmt/partials/properties_list.html'),
+    (Tenant, 'tenants', 'property_mgmt/partials/tenants_list.html'),
+]
+
+
+@scenario('render')
+def run(properties=1000, repeat=5, **options):
+    hub_id = seed_portfolio(properties=min(properties, 1000), leases=0)
+    rows = []
+    for model, context_name, template in LISTS:
+        qs = model.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name', 'id')
+        for per_page in PAGE_SIZES:
+            page_obj = Paginator(qs, per_page).get_page(1)
+            page_obj.object_list = list(page_obj.object_list)
+            ctx = {
+                context_name: page_obj, 'page_obj': page_obj, 'paging': 'offset', 'per_page': per_page,
+                'sort_field': 'name', 'sort_dir': 'asc',
+                'page_range': page_obj.paginator.get_elided_page_range(1, on_each_side=2, on_ends=1),
+            }
+
+            def render(cold):
+                if cold:
+                    cache.clear()
+                return render_to_string(template, ctx)
+
+            for mode, cold in (('cold', True), ('warm', False)):
+                render(cold)
+                ms, _ = measure(lambda: render(cold), repeat=repeat)
+                rows.append(result(f'{mode}:{context_name}:{per_page}', ms, rows=per_page, ms_per_row=round(ms / per_page, 4)))
+    return rows
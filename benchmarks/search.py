@@ -0,0 +1,31 @@
+"""
+Search backend benchmark.
+
+Compares the original OR'd ``icontains`` filter with the indexed backend
+for the datatable search box on a 100k+ row hub, both ranked by relevance
+and in the datatable's column order.
+"""
+from property_mgmt.models import Property, Tenant
+from property_mgmt.search import get_search_backend
+
+from . import analyze, measure, result, scenario
+from .seed import seed_portfolio
+
+QUERIES = ['gran', 'calle mayor', 'garcia', 'example.com', 'commercial', 'zzz-no-match']
+
+
+@scenario('search')
+def run(properties=100000, repeat=5, **options):
+    hub_id = seed_portfolio(properties=properties)
+    analyze()
+    rows = []
+    for backend in (get_search_backend('basic'), get_search_backend()):
+        for model in (Property, Tenant):
+            base = model.objects.filter(hub_id=hub_id, is_deleted=False)
+            for query in QUERIES:
+                sorted_qs = backend.filter(base, query, hub_id).order_by('name', 'id')
+                for mode, qs in (('sorted', sorted_qs), ('ranked', backend.order_by_rank(sorted_qs))):
+                    qs = qs[:25]
+                    ms, queries = measure(lambda qs=qs: list(qs.all()), repeat=repeat)
+                    rows.append(result(f'{backend.name}:{mode}:{model._meta.model_name}:{query}', ms, queries))
+    return rows
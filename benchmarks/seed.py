@@ -0,0 +1,106 @@
+"""
+Synthetic portfolio generator for benchmarks.
+
+Data is deterministic for a given ``seed`` so runs are comparable.
+"""
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from property_mgmt.availability import rebuild_timeline
+from property_mgmt.models import Property, Tenant, Lease
+from property_mgmt.search import build_search_document, get_search_backend
+
+PROPERTY_TYPES = ['residential', 'commercial', 'office', 'retail', 'parking', 'storage']
+STATUSES = ['available', 'rented', 'rented', 'rented', 'maintenance', 'sold']
+STREETS = ['Gran Via', 'Calle Mayor', 'Paseo de Gracia', 'Avenida Diagonal', 'Calle Serrano', 'Rambla Nova']
+FIRST_NAMES = ['Ana', 'Luis', 'Marta', 'Jorge', 'Lucia', 'Pablo', 'Elena', 'Carlos', 'Sara', 'Diego']
+LAST_NAMES = ['Garcia', 'Martinez', 'Lopez', 'Sanchez', 'Perez', 'Gomez', 'Ruiz', 'Diaz', 'Moreno', 'Alvarez']
+
+
+def _batched_create(model, objs, batch_size):
+    # bulk_create bypasses save(), so fill in what save() would maintain.
+    searchable = hasattr(model, 'SEARCH_FIELDS')
+    if searchable:
+        for obj in objs:
+            obj.search_document = build_search_document(obj)
+    for i in range(0, len(objs), batch_size):
+        model.objects.bulk_create(objs[i:i + batch_size], batch_size=batch_size)
+    if searchable:
+        get_search_backend().index_many(objs, batch_size=batch_size, replace=False)
+
+
+def seed_portfolio(properties=1000, tenants=None, leases=None, hub_id=None, seed=42, batch_size=2000):
+    """
+    Insert a hub worth of properties, tenants and leases.
+
+    ``tenants`` defaults to 80% of ``properties`` and ``leases`` to 1.5x
+    (so most properties carry a lease history). Returns the hub id.
+    """
+    rng = random.Random(seed)
+    hub_id = hub_id or uuid.uuid4()
+    tenants = int(properties * 0.8) if tenants is None else tenants
+    leases = int(properties * 1.5) if leases is None else leases
+
+    prop_objs = []
+    for i in range(properties):
+        ptype = rng.choice(PROPERTY_TYPES)
+        bedrooms = rng.randint(0, 5)
+        prop_objs.append(Property(
+            hub_id=hub_id,
+            name=f'{rng.choice(STREETS)} {rng.randint(1, 300)}, {i}',
+            address=f'{rng.choice(STREETS)} {rng.randint(1, 300)}, {rng.randint(1, 9)}º {rng.choice("ABCD")}',
+            property_type=ptype,
+            bedrooms=bedrooms,
+            bathrooms=rng.randint(1, 3),
+            area_sqm=None if rng.random() < 0.1 else Decimal(rng.randint(25, 400)),
+            monthly_rent=Decimal(rng.randint(300, 5000)),
+            status=rng.choice(STATUSES),
+            is_active=rng.random() > 0.05,
+            is_deleted=rng.random() < 0.03,
+        ))
+    _batched_create(Property, prop_objs, batch_size)
+
+    tenant_objs = []
+    for i in range(tenants):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        tenant_objs.append(Tenant(
+            hub_id=hub_id,
+            name=f'{first} {last} {i}',
+            email=f'{first.lower()}.{last.lower()}{i}@example.com',
+            phone=f'+346{rng.randint(10000000, 99999999)}',
+            id_number=f'{rng.randint(10000000, 99999999)}{rng.choice("ABCDEFGHJKLMNPQRSTVWXYZ")}',
+            is_active=rng.random() > 0.1,
+            is_deleted=rng.random() < 0.03,
+        ))
+    _batched_create(Tenant, tenant_objs, batch_size)
+
+    if prop_objs and tenant_objs:
+        # Lease k of a property sits in its own ~800 day window so a
+        # property's leases never overlap; k == 0 is the current one.
+        today = date.today()
+        lease_objs = []
+        for i in range(leases):
+            prop = prop_objs[i % len(prop_objs)]
+            k = i // len(prop_objs)
+            if k == 0:
+                start = today - timedelta(days=rng.randint(0, 400))
+                end = start + timedelta(days=rng.choice([365, 730])) if rng.random() > 0.15 else None
+            else:
+                start = today - timedelta(days=k * 800 + rng.randint(0, 60))
+                end = start + timedelta(days=365)
+            lease_objs.append(Lease(
+                hub_id=hub_id,
+                property=prop,
+                tenant=rng.choice(tenant_objs),
+                start_date=start,
+                end_date=end,
+                monthly_rent=prop.monthly_rent,
+                deposit=prop.monthly_rent * 2,
+                status='active' if end is None or end >= today else 'ended',
+            ))
+        _batched_create(Lease, lease_objs, batch_size)
+        rebuild_timeline(hub_id, chunk_size=batch_size)
+
+    return hub_id
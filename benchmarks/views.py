@@ -0,0 +1,106 @@
+"""
+End-to-end view benchmark.
+
+Drives the module's views through Django's test client against a seeded
+hub, so middleware, the count strategy, the search backend, the row cache
+and template rendering are all in the measurement. Covers the dashboard,
+list pages (first, deep and cursor), sorting, search, CSV export and bulk
+actions, and reports the query count and response size of each path.
+
+Meant to be run with ``--save-baseline`` once and ``--check`` after
+every change; see the command's help.
+"""
+from itertools import cycle
+
+from django.core.cache import cache
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from property_mgmt.models import Property
+
+from . import measure, result, scenario
+from .seed import seed_portfolio
+
+HTMX_LIST = {'HTTP_HX_REQUEST': 'true', 'HTTP_HX_TARGET': 'datatable-body'}
+
+
+def _client(hub_id):
+    client = Client()
+    session = client.session
+    session['local_user_id'] = str(hub_id)
+    session['hub_id'] = str(hub_id)
+    session['store_config_checked'] = True
+    session.save()
+    return client
+
+
+def _size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def _paths(hub_id, properties):
+    """``(name, method, viewname, data, headers, cold)`` for every measured request."""
+    last_page = max(1, properties // 25)
+    ids = ','.join(
+        str(pk) for pk in Property.objects.filter(hub_id=hub_id, is_deleted=False)
+        .order_by('name', 'id').values_list('pk', flat=True)[:100]
+    )
+    lists = [
+        ('properties', 'property_mgmt:properties_list', ['gran via', 'mayor 12']),
+        ('tenants', 'property_mgmt:tenants_list', ['garcia', 'example.com']),
+    ]
+    paths = [
+        ('dashboard:cold', 'get', 'property_mgmt:dashboard', {}, {}, True),
+        ('dashboard:warm', 'get', 'property_mgmt:dashboard', {}, {}, False),
+        ('page:properties', 'get', 'property_mgmt:properties_list', {}, {}, False),
+        ('leases:first', 'get', 'property_mgmt:leases', {}, HTMX_LIST, False),
+    ]
+    for name, viewname, queries in lists:
+        paths += [
+            (f'list:{name}:first', 'get', viewname, {'per_page': 25}, HTMX_LIST, False),
+            (f'list:{name}:deep', 'get', viewname, {'per_page': 25, 'page': last_page}, HTMX_LIST, False),
+            (f'list:{name}:cursor', 'get', viewname, {'per_page': 25, 'paging': 'cursor'}, HTMX_LIST, False),
+            (f'sort:{name}:created_desc', 'get', viewname, {'sort': 'created_at', 'dir': 'desc'}, HTMX_LIST, False),
+        ]
+        paths += [(f'search:{name}:{q}', 'get', viewname, {'q': q}, HTMX_LIST, False) for q in queries]
+    paths += [
+        ('sort:properties:monthly_rent_desc', 'get', 'property_mgmt:properties_list',
+         {'sort': 'monthly_rent', 'dir': 'desc'}, HTMX_LIST, False),
+        ('filter:properties:rented', 'get', 'property_mgmt:properties_list', {'status': 'rented'}, HTMX_LIST, False),
+        ('export:properties:csv', 'get', 'property_mgmt:properties_list', {'export': 'csv'}, {}, False),
+        ('bulk:properties:100_ids', 'bulk', 'property_mgmt:properties_bulk_action', {'ids': ids}, {}, False),
+        ('bulk:properties:all_matching', 'bulk', 'property_mgmt:properties_bulk_action',
+         {'select': 'all', 'q': 'gran via'}, {}, False),
+    ]
+    return paths
+
+
+@scenario('views')
+def run(properties=1000, repeat=5, **options):
+    hub_id = seed_portfolio(properties=properties)
+    client = _client(hub_id)
+    rows = []
+    with override_settings(ALLOWED_HOSTS=['*']):
+        for name, method, viewname, data, headers, cold in _paths(hub_id, properties):
+            url = reverse(viewname)
+            # Bulk actions alternate so every run has rows to change.
+            actions = cycle(['deactivate', 'activate'])
+            sizes = []
+
+            def run_once():
+                if cold:
+                    cache.clear()
+                if method == 'bulk':
+                    response = client.post(url, {**data, 'action': next(actions)}, **HTMX_LIST)
+                else:
+                    response = client.get(url, data, **headers)
+                assert response.status_code == 200, f'{name}: HTTP {response.status_code}'
+                sizes.append(_size(response))
+
+            run_once()
+            ms, queries = measure(run_once, repeat=repeat)
+            rows.append(result(name, ms, queries, bytes=sizes[-1]))
+    return rows
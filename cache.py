@@ -0,0 +1,15 @@
+"""
+Per-hub cache keys shared by the module's caches (dashboard metrics,
+analytics, list counts, hub settings).
+"""
+import uuid
+
+
+def hub_cache_key(hub_id, template):
+    """``template`` formatted with ``hub_id``, keyed on one form of the id."""
+    # Session hub ids are strings, model hub ids are UUIDs.
+    try:
+        hub_id = uuid.UUID(str(hub_id))
+    except ValueError:
+        pass
+    return template.format(hub_id=hub_id)
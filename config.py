@@ -0,0 +1,143 @@
+"""
+Per-hub module settings with a two-level read-through cache.
+
+``get_hub_settings(hub_id)`` returns the hub's ``HubSettings``, an
+immutable snapshot of its ``ModuleSettings`` row (or of the defaults, for
+hubs that never saved one). Lookups try, in order:
+
+1. a process-local LRU of ``PROPERTY_MGMT_SETTINGS_LRU_SIZE`` hubs
+   (default 1024) whose entries live ``PROPERTY_MGMT_SETTINGS_LOCAL_TTL``
+   seconds (default 10), so hot hubs cost no I/O at all;
+2. Django's cache, shared by the workers, for ``PROPERTY_MGMT_SETTINGS_TTL``
+   seconds (default 3600);
+3. one query, whose result is added to both.
+
+Saving a ``ModuleSettings`` row drops its cached snapshot right away and
+writes the new one to the shared cache once the transaction commits;
+deleting it drops the snapshot (``signals.py``). Other workers pick the
+change up when their local entry expires, so the local TTL bounds how
+long they serve the old values. Misses fill the shared cache with
+``cache.add``, so a reader that loaded the row just before a save can't
+overwrite the newer snapshot.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .cache import hub_cache_key
+from .models import ModuleSettings
+from .search import get_search_backend, usable_search_backends
+
+# Bump the version when HubSettings changes shape: old pickles won't load.
+CACHE_KEY = 'property_mgmt:settings:v1:{hub_id}'
+
+HubSettings = namedtuple('HubSettings', [
+    'hub_id', 'default_page_size', 'currency', 'billing_day', 'search_backend', 'export_max_rows', 'retention_days',
+])
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class LocalCache:
+    """Thread-safe LRU whose entries also expire after a TTL."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, max_size):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_cache = LocalCache()
+
+
+def _snapshot(obj):
+    return HubSettings(*(getattr(obj, name) for name in HubSettings._fields))
+
+
+def _remember(key, value):
+    local_cache.set(
+        key, value, _setting('PROPERTY_MGMT_SETTINGS_LOCAL_TTL', 10), _setting('PROPERTY_MGMT_SETTINGS_LRU_SIZE', 1024),
+    )
+
+
+def get_hub_settings(hub_id):
+    """
+    The hub's ``HubSettings``, from the nearest cache that has them.
+
+    Stale for up to ``PROPERTY_MGMT_SETTINGS_LOCAL_TTL`` seconds (default
+    10) after a save on another worker: this worker's local entry is only
+    replaced when it expires.
+    """
+    key = hub_cache_key(hub_id, CACHE_KEY)
+    value = local_cache.get(key)
+    if value is None:
+        value = cache.get(key)
+        if value is None:
+            obj = ModuleSettings.objects.filter(hub_id=hub_id).first() or ModuleSettings(hub_id=hub_id)
+            value = _snapshot(obj)
+            cache.add(key, value, _setting('PROPERTY_MGMT_SETTINGS_TTL', 3600))
+        _remember(key, value)
+    return value
+
+
+def store_hub_settings(obj):
+    """
+    Drop a saved ``ModuleSettings`` row's cached snapshot now and publish
+    the new one to both caches once the transaction commits.
+    """
+    key = hub_cache_key(obj.hub_id, CACHE_KEY)
+    value = _snapshot(obj)
+    invalidate_hub_settings(obj.hub_id)
+
+    def publish():
+        cache.set(key, value, _setting('PROPERTY_MGMT_SETTINGS_TTL', 3600))
+        _remember(key, value)
+    transaction.on_commit(publish)
+
+
+def invalidate_hub_settings(hub_id):
+    """Forget a hub's cached settings in both caches."""
+    key = hub_cache_key(hub_id, CACHE_KEY)
+    local_cache.delete(key)
+    cache.delete(key)
+
+
+def hub_search_backend(hub_id):
+    """The search backend the hub chose, if it can be used here, else the configured one."""
+    name = get_hub_settings(hub_id).search_backend
+    return get_search_backend(name if name in usable_search_backends() else None)
@@ -0,0 +1,194 @@
+"""
+Row counts for the datatable footers.
+
+``COUNT(*)`` over a large hub costs a full index scan on every list render.
+``count_rows`` picks a strategy from ``PROPERTY_MGMT_COUNT_STRATEGY``:
+
+- ``exact``: plain ``COUNT(*)`` every time
+- ``cached``: ``COUNT(*)`` cached per (hub, model, filter) for
+  ``PROPERTY_MGMT_COUNT_TTL`` seconds (default 300). Writes bump a per-hub,
+  per-model generation (see ``signals.py``), which orphans every cached
+  count for that table at once.
+- ``estimate``: the PostgreSQL planner's row estimate for the filtered
+  query. Estimates below ``PROPERTY_MGMT_EXACT_COUNT_THRESHOLD`` (default
+  10000) are replaced with a cached exact count, since the planner is least
+  accurate where users notice most. Other databases fall back to ``cached``.
+- ``auto`` (default): ``estimate`` on PostgreSQL, ``cached`` elsewhere.
+
+``CountingPaginator`` plugs this into Django's ``Paginator``; its
+``aget_page`` reads a page's rows and its total concurrently, on two
+connections (``parallel.aread``).
+"""
+import asyncio
+import hashlib
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .cache import hub_cache_key
+from .parallel import aread
+
+COUNT_KEY = 'property_mgmt:count:{hub_id}'
+STRATEGIES = ('auto', 'exact', 'cached', 'estimate')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_strategy(using='default'):
+    strategy = _setting('PROPERTY_MGMT_COUNT_STRATEGY', 'auto')
+    if strategy not in STRATEGIES:
+        strategy = 'auto'
+    if strategy == 'auto':
+        strategy = 'estimate' if connections[using].vendor == 'postgresql' else 'cached'
+    return strategy
+
+
+def _generation_key(hub_id, model):
+    return f'{hub_cache_key(hub_id, COUNT_KEY)}:{model._meta.label_lower}:gen'
+
+
+def _generation(hub_id, model):
+    key = _generation_key(hub_id, model)
+    generation = cache.get(key)
+    if generation is None:
+        # A fresh timestamp rather than 1, so an evicted generation can never
+        # resurrect counts cached under an earlier one.
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_counts(hub_id, model):
+    """Drop every cached count for ``model`` in a hub."""
+    cache.set(_generation_key(hub_id, model), time.time_ns(), None)
+
+
+def _filter_hash(qs):
+    sql, params = qs.order_by().query.sql_with_params()
+    return hashlib.md5(f'{sql}|{params!r}'.encode()).hexdigest()
+
+
+def exact_count(qs):
+    return qs.order_by().count()
+
+
+def cached_count(qs, hub_id):
+    key = f'{hub_cache_key(hub_id, COUNT_KEY)}:{qs.model._meta.label_lower}:{_generation(hub_id, qs.model)}:{_filter_hash(qs)}'
+    count = cache.get(key)
+    if count is None:
+        count = exact_count(qs)
+        cache.set(key, count, _setting('PROPERTY_MGMT_COUNT_TTL', 300))
+    return count
+
+
+def estimate_count(qs):
+    """Planner row estimate for ``qs``, or ``None`` off PostgreSQL."""
+    connection = connections[qs.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = qs.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_rows(qs, hub_id, strategy=None, allow_estimate=True):
+    """
+    Return ``(count, is_estimate)`` for ``qs`` using ``strategy`` (default:
+    the configured one). ``allow_estimate=False`` downgrades ``estimate``
+    to ``cached`` for callers that promise an exact total.
+    """
+    strategy = strategy or get_strategy(qs.db)
+    if strategy == 'exact':
+        return exact_count(qs), False
+    if strategy == 'estimate' and allow_estimate:
+        estimate = estimate_count(qs)
+        if estimate is not None and estimate >= _setting('PROPERTY_MGMT_EXACT_COUNT_THRESHOLD', 10000):
+            return estimate, True
+    return cached_count(qs, hub_id), False
+
+
+async def acount_rows(qs, hub_id, strategy=None, allow_estimate=True):
+    """Async ``count_rows``, on its own connection when reads run concurrently."""
+    return await aread(count_rows, qs, hub_id, strategy, allow_estimate)
+
+
+class CountingPaginator(Paginator):
+    """
+    ``Paginator`` whose total comes from ``count_rows``.
+
+    An estimated total is corrected as soon as a short page reveals where
+    the rows really end, or is counted when a page inside the estimate
+    turns out empty.
+    """
+
+    def __init__(self, object_list, per_page, hub_id=None, strategy=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.hub_id = hub_id
+        self.strategy = strategy
+        self.is_estimate = False
+
+    @cached_property
+    def count(self):
+        count, self.is_estimate = count_rows(self.object_list, self.hub_id, self.strategy)
+        return count
+
+    def _settle(self, page):
+        if not self.is_estimate or len(page.object_list) == self.per_page:
+            return page
+        bottom = (page.number - 1) * self.per_page
+        if page.object_list or page.number == 1:
+            count = bottom + len(page.object_list)
+        else:
+            # The estimate overshot by a page or more: the rows end somewhere
+            # before this page, so counting at most ``bottom`` rows finds it.
+            count = self.object_list[:bottom].count()
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        self.__dict__.pop('page_range', None)
+        self.is_estimate = False
+        if not page.object_list and page.number > 1:
+            # Past the real end: raises EmptyPage.
+            return super().page(page.number)
+        return page
+
+    def page(self, number):
+        return self._settle(super().page(number))
+
+    def get_page(self, number):
+        try:
+            return super().get_page(number)
+        except EmptyPage:
+            # The number was valid for the estimated total only.
+            return self.page(self.num_pages)
+
+    async def aget_page(self, number):
+        """
+        Async ``get_page``. The rows of page ``number`` are fetched while the
+        total is counted; a page past the end costs a second fetch.
+        """
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            number = 1
+        bottom = (number - 1) * self.per_page
+        (count, self.is_estimate), rows = await asyncio.gather(
+            acount_rows(self.object_list, self.hub_id, self.strategy),
+            aread(list, self.object_list[bottom:bottom + self.per_page]),
+        )
+        self.__dict__['count'] = count
+        if not rows and number > 1:
+            # Past the end: get_page falls back to the last page (the total is already known).
+            return await sync_to_async(self.get_page)(number)
+        return self._settle(self._get_page(rows, number, self))
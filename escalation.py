@@ -0,0 +1,271 @@
+"""
+Rent escalation.
+
+Leases with an ``EscalationRule`` whose ``next_review_date`` has come get
+a new rent:
+
+- ``fixed``: the rent grows by ``percent``
+- ``cpi``: the rent grows by the change of ``index_name`` over the review
+  interval, read for the month before the review, then kept between
+  ``floor_percent`` and ``cap_percent`` when set
+- ``step``: the rent becomes the next entry of ``steps``
+
+Due rules are read in one query and new rents are computed for all of
+them at once, in integer cents with half-up rounding (NumPy arrays when
+NumPy is installed, plain lists otherwise). ``preview_escalations``
+returns the resulting diff without writing anything.
+
+``apply_escalations`` writes the diff in one transaction. It inserts the
+``RentHistory`` rows first (with ``executemany``), and each chunk of leases then takes its new
+rent from its history row in one correlated ``UPDATE``. Properties whose
+current lease changed take the lease's new rent in the same way, and
+rules move to their next review date with one ``UPDATE`` per date. A
+rule that can't be applied (CPI value not published yet, step schedule
+used up) is skipped and stays due.
+"""
+import calendar
+import time
+import uuid
+from collections import defaultdict, namedtuple
+from decimal import Decimal
+from functools import lru_cache
+
+from django.db import connections, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from .billing import parse_period
+from .models import CPIIndex, EscalationRule, Lease, Property, RentHistory
+from .signals import bulk_updated
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+ESCALATION_CHUNK_SIZE = 5000
+
+# Percentages are handled as integer thousandths of a percent.
+PERCENT_SCALE = 100_000
+CENT = Decimal('0.01')
+
+EscalationChange = namedtuple('EscalationChange', [
+    'rule_id', 'lease_id', 'property_id', 'kind', 'effective_date', 'old_rent', 'new_rent', 'next_review_date',
+])
+EscalationResult = namedtuple('EscalationResult', ['hub_id', 'due', 'changed', 'skipped', 'seconds'])
+
+RULE_FIELDS = (
+    'id', 'lease_id', 'lease__property_id', 'lease__monthly_rent', 'kind', 'percent', 'index_name',
+    'floor_percent', 'cap_percent', 'steps', 'interval_months', 'next_review_date', 'reviews_applied',
+)
+
+
+@lru_cache(maxsize=4096)
+def add_months(day, months):
+    """``day`` moved by ``months``, clamped to the end of shorter months."""
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def due_rules(hub_id, as_of=None):
+    """Rules of a hub's active leases whose review date has come."""
+    return EscalationRule.objects.filter(
+        hub_id=hub_id, is_deleted=False, next_review_date__lte=as_of or timezone.localdate(),
+        lease__is_deleted=False, lease__status='active',
+    )
+
+
+def _cents(value):
+    return int((Decimal(value) * 100).to_integral_value())
+
+
+def _thousandths(percent):
+    return int((Decimal(percent) * 1000).to_integral_value())
+
+
+def cpi_periods(review_date, interval_months):
+    """The two index months a CPI review compares: the month before the review and one interval earlier."""
+    current = add_months(parse_period(review_date), -1)
+    return add_months(current, -interval_months), current
+
+
+def _load_indexes(names):
+    if not names:
+        return {}
+    return {
+        (name, period): _thousandths(value)
+        for name, period, value in CPIIndex.objects.filter(index_name__in=names).values_list('index_name', 'period', 'value')
+    }
+
+
+def _factors(rows, indexes):
+    """
+    Per-rule inputs for ``escalate_cents``: ``(num, den, floor, cap, step)``,
+    or ``None`` for a rule that can't be applied yet.
+    """
+    factors = []
+    for row in rows:
+        kind, percent, index_name, floor, cap, steps, interval, review_date, applied = row[4:]
+        if kind == 'fixed' and percent is not None:
+            factors.append((PERCENT_SCALE + _thousandths(percent), PERCENT_SCALE, None, None, None))
+        elif kind == 'cpi':
+            base, current = (indexes.get((index_name, p)) for p in cpi_periods(review_date, interval))
+            if not base or current is None:
+                factors.append(None)
+                continue
+            floor = None if floor is None else _thousandths(floor)
+            cap = None if cap is None else _thousandths(cap)
+            factors.append((current, base, floor, cap, None))
+        elif kind == 'step' and applied < len(steps or []):
+            factors.append((1, 1, None, None, _cents(steps[applied])))
+        else:
+            factors.append(None)
+    return factors
+
+
+def _scale(cents, num, den):
+    # Half-up rounding of cents * num / den; works on ints and int64 arrays alike.
+    return (2 * cents * num + den) // (2 * den)
+
+
+def escalate_cents(cents, num, den, floor, cap, step):
+    """
+    New rents in cents: ``cents * num / den``, kept within ``floor`` and
+    ``cap`` (thousandths of a percent) where set, or ``step`` where set.
+    """
+    if np is not None:
+        cents, num, den = (np.asarray(a, dtype=np.int64) for a in (cents, num, den))
+        new = _scale(cents, num, den)
+        for bounds, clamp in ((floor, np.maximum), (cap, np.minimum)):
+            limit = _scale(cents, PERCENT_SCALE + np.array([b or 0 for b in bounds], dtype=np.int64), PERCENT_SCALE)
+            new = np.where([b is not None for b in bounds], clamp(new, limit), new)
+        new = np.where([s is not None for s in step], np.array([s or 0 for s in step], dtype=np.int64), new)
+        return new.tolist()
+
+    result = []
+    for c, n, d, low, high, s in zip(cents, num, den, floor, cap, step):
+        if s is not None:
+            result.append(s)
+            continue
+        new = _scale(c, n, d)
+        if low is not None:
+            new = max(new, _scale(c, PERCENT_SCALE + low, PERCENT_SCALE))
+        if high is not None:
+            new = min(new, _scale(c, PERCENT_SCALE + high, PERCENT_SCALE))
+        result.append(new)
+    return result
+
+
+def preview_escalations(hub_id, as_of=None):
+    """``(changes, skipped)`` for the hub's due rules; nothing is written."""
+    rows = list(due_rules(hub_id, as_of).order_by('id').values_list(*RULE_FIELDS))
+    indexes = _load_indexes({row[6] for row in rows if row[4] == 'cpi'})
+    factors = _factors(rows, indexes)
+    ready = [(row, f) for row, f in zip(rows, factors) if f is not None]
+    skipped = [row[0] for row, f in zip(rows, factors) if f is None]
+    if not ready:
+        return [], skipped
+
+    columns = list(zip(*(f for _, f in ready)))
+    new_cents = escalate_cents([_cents(row[3]) for row, _ in ready], *columns)
+    changes = [
+        EscalationChange(
+            rule_id=row[0], lease_id=row[1], property_id=row[2], kind=row[4], effective_date=row[11],
+            old_rent=row[3], new_rent=(Decimal(cents) / 100).quantize(CENT),
+            next_review_date=add_months(row[11], row[10]),
+        )
+        for (row, _), cents in zip(ready, new_cents)
+    ]
+    return changes, skipped
+
+
+def _insert_history(changes, **constants):
+    """
+    Insert one ``RentHistory`` row per change with a plain ``executemany``.
+
+    ``bulk_create`` spent most of an escalation run building a model
+    instance and preparing every column of every row; here only the
+    per-lease columns are prepared per row. Other columns take their
+    default (``auto_now`` fields: ``now``) or a value from ``constants``.
+    """
+    opts = RentHistory._meta
+    conn = connections[RentHistory.objects.db]
+    now = constants.pop('now')
+    per_row = {'lease_id', 'rule_id', 'effective_date', 'old_rent', 'new_rent', 'reason'}
+    fields = opts.concrete_fields
+    fixed = {}
+    for field in fields:
+        if field.attname in per_row or (field.primary_key and field.has_default()):
+            continue
+        if field.attname in constants:
+            value = constants[field.attname]
+        elif getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            value = now
+        else:
+            value = field.get_default()
+        fixed[field.attname] = field.get_db_prep_save(value, conn)
+
+    qn = conn.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        qn(opts.db_table), ', '.join(qn(f.column) for f in fields), ', '.join(['%s'] * len(fields)),
+    )
+    rows = []
+    for change in changes:
+        values = {
+            'lease_id': change.lease_id, 'rule_id': change.rule_id, 'effective_date': change.effective_date,
+            'old_rent': change.old_rent, 'new_rent': change.new_rent, 'reason': change.kind,
+        }
+        rows.append([
+            fixed[f.attname] if f.attname in fixed
+            else f.get_db_prep_save(f.get_default() if f.primary_key else values[f.attname], conn)
+            for f in fields
+        ])
+    with conn.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def apply_escalations(hub_id, as_of=None, chunk_size=ESCALATION_CHUNK_SIZE):
+    """Apply the hub's due escalations in one transaction. Returns an ``EscalationResult``."""
+    started = time.perf_counter()
+    run_id = uuid.uuid4()
+    now = timezone.now()
+    new_rent = Subquery(RentHistory.objects.filter(run_id=run_id, lease_id=OuterRef('pk')).values('new_rent')[:1])
+    lease_rent = Subquery(Lease.objects.filter(pk=OuterRef('current_lease_id')).values('monthly_rent')[:1])
+
+    with transaction.atomic():
+        changes, skipped = preview_escalations(hub_id, as_of)
+        by_review_date = defaultdict(list)
+        for i in range(0, len(changes), chunk_size):
+            chunk = changes[i:i + chunk_size]
+            lease_ids = [c.lease_id for c in chunk]
+            _insert_history(chunk, hub_id=hub_id, run_id=run_id, now=now)
+            Lease.objects.filter(pk__in=lease_ids).update(monthly_rent=new_rent, updated_at=now)
+            Property.objects.filter(current_lease_id__in=lease_ids).update(monthly_rent=lease_rent, updated_at=now)
+            for c in chunk:
+                by_review_date[c.next_review_date].append(c.rule_id)
+        for review_date, rule_ids in by_review_date.items():
+            for i in range(0, len(rule_ids), chunk_size):
+                EscalationRule.objects.filter(pk__in=rule_ids[i:i + chunk_size]).update(
+                    next_review_date=review_date, reviews_applied=F('reviews_applied') + 1, updated_at=now,
+                )
+
+    if changes:
+        bulk_updated.send(sender=Lease, hub_id=hub_id, fields=['monthly_rent'])
+        bulk_updated.send(sender=Property, hub_id=hub_id, fields=['monthly_rent'])
+    return EscalationResult(
+        hub_id, len(changes) + len(skipped), len(changes), len(skipped), round(time.perf_counter() - started, 3),
+    )
+
+
+def due_hub_ids(as_of=None):
+    """Hubs with at least one due rule."""
+    return list(
+        EscalationRule.objects.filter(is_deleted=False, next_review_date__lte=as_of or timezone.localdate())
+        .order_by().values_list('hub_id', flat=True).distinct()
+    )
+
+
+def escalate_all_hubs(as_of=None, chunk_size=ESCALATION_CHUNK_SIZE):
+    """Apply due escalations for every hub with due rules."""
+    return [apply_escalations(hub_id, as_of, chunk_size) for hub_id in due_hub_ids(as_of)]
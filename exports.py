@@ -0,0 +1,85 @@
+"""
+Streaming CSV/Excel exports for the property management datatables.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` so the
+queryset is never materialized as model instances. CSV is written straight
+into a ``StreamingHttpResponse``; Excel uses an openpyxl write-only
+workbook (constant memory) spooled to a temporary file and streamed back.
+"""
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # pragma: no cover - optional dependency
+    Workbook = None
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class _Buffer:
+    """Collects ``csv.writer`` output so rows can be flushed in batches."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, value):
+        self.parts.append(value)
+
+    def flush(self):
+        data, self.parts = ''.join(self.parts), []
+        return data
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    return value
+
+
+def iter_rows(qs, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield export rows as tuples without building model instances."""
+    for row in qs.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield tuple(_cell(v) for v in row)
+
+
+def stream_csv(qs, fields, headers, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+
+    def generate():
+        writer.writerow(headers)
+        yield '\ufeff' + buffer.flush()  # BOM so Excel detects UTF-8
+        for i, row in enumerate(iter_rows(qs, fields, chunk_size), 1):
+            writer.writerow(row)
+            if i % chunk_size == 0:
+                yield buffer.flush()
+        yield buffer.flush()
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def stream_excel(qs, fields, headers, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Write rows to a write-only workbook and stream the file.
+
+    Returns ``None`` when openpyxl isn't installed so callers can fall back.
+    """
+    if Workbook is None:
+        return None
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(headers)
+    for row in iter_rows(qs, fields, chunk_size):
+        ws.append(row)
+    tmp = tempfile.TemporaryFile(suffix='.xlsx')
+    wb.save(tmp)
+    tmp.seek(0)
+    return FileResponse(tmp, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
@@ -1,7 +1,10 @@
 from django import forms
 from django.utils.translation import gettext_lazy as _
 
-from .models import Property, Tenant
+from .availability import filter_available
+from .leasing import validate_lease
+from .models import PROP_STATUS, ModuleSettings, Property, Tenant, Lease
+from .search import usable_search_backends
 
 class PropertyForm(forms.ModelForm):
     class Meta:
@@ -31,3 +34,95 @@ class TenantForm(forms.ModelForm):
             'is_active': forms.CheckboxInput(attrs={'class': 'toggle'}),
         }
 
+class LeaseForm(forms.ModelForm):
+    """Lease form scoped to a hub; rejects overlapping active leases."""
+
+    class Meta:
+        model = Lease
+        fields = ['property', 'tenant', 'start_date', 'end_date', 'monthly_rent', 'deposit', 'status']
+        widgets = {
+            'property': forms.Select(attrs={'class': 'select select-sm w-full'}),
+            'tenant': forms.Select(attrs={'class': 'select select-sm w-full'}),
+            'start_date': forms.DateInput(attrs={'class': 'input input-sm w-full', 'type': 'date'}),
+            'end_date': forms.DateInput(attrs={'class': 'input input-sm w-full', 'type': 'date'}),
+            'monthly_rent': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number'}),
+            'deposit': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number'}),
+            'status': forms.Select(attrs={'class': 'select select-sm w-full'}),
+        }
+
+    def __init__(self, *args, hub_id=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance.hub_id = hub_id
+        self.fields['property'].queryset = Property.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name')
+        self.fields['tenant'].queryset = Tenant.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name')
+
+    def clean(self):
+        cleaned = super().clean()
+        if self.errors:
+            return cleaned
+        lease = Lease(
+            pk=self.instance.pk,
+            property=cleaned['property'],
+            start_date=cleaned['start_date'],
+            end_date=cleaned.get('end_date'),
+            status=cleaned['status'],
+        )
+        lease._state.adding = self.instance._state.adding
+        validate_lease(lease)
+        return cleaned
+
+class PropertyFilterForm(forms.Form):
+    status = forms.ChoiceField(required=False, choices=[('', _('All statuses')), *PROP_STATUS], widget=forms.Select(attrs={'class': 'select select-sm'}))
+    available_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'class': 'input input-sm', 'type': 'date'}))
+    available_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'class': 'input input-sm', 'type': 'date'}))
+    min_bedrooms = forms.IntegerField(required=False, min_value=0, widget=forms.NumberInput(attrs={'class': 'input input-sm', 'placeholder': _('Min. bedrooms')}))
+    max_rent = forms.DecimalField(required=False, min_value=0, max_digits=10, decimal_places=2, widget=forms.NumberInput(attrs={'class': 'input input-sm', 'placeholder': _('Max. rent')}))
+
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get('available_from'), cleaned.get('available_to')
+        if start and end and end < start:
+            raise forms.ValidationError(_('The end date must be on or after the start date.'))
+        return cleaned
+
+    def apply(self, qs):
+        """
+        Narrow a property queryset. Invalid input leaves it unfiltered; the
+        availability fields only apply once a start date is given.
+        """
+        if not self.is_valid():
+            return qs
+        data = self.cleaned_data
+        if data['status']:
+            qs = qs.filter(status=data['status'])
+        if data['available_from']:
+            qs = filter_available(qs, data['available_from'], data['available_to'], data['min_bedrooms'], data['max_rent'])
+        return qs
+
+class ModuleSettingsForm(forms.ModelForm):
+    """Hub settings; only offers the search backends usable on this install."""
+
+    class Meta:
+        model = ModuleSettings
+        fields = ['default_page_size', 'currency', 'billing_day', 'search_backend', 'export_max_rows', 'retention_days']
+        widgets = {
+            'default_page_size': forms.Select(attrs={'class': 'select select-sm w-full'}),
+            'currency': forms.TextInput(attrs={'class': 'input input-sm w-full', 'maxlength': 3}),
+            'billing_day': forms.NumberInput(attrs={'class': 'input input-sm w-full', 'min': 1, 'max': 28}),
+            'search_backend': forms.Select(attrs={'class': 'select select-sm w-full'}),
+            'export_max_rows': forms.NumberInput(attrs={'class': 'input input-sm w-full', 'min': 1}),
+            'retention_days': forms.NumberInput(attrs={'class': 'input input-sm w-full', 'min': 1}),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        usable = usable_search_backends()
+        self.fields['search_backend'].choices = [
+            (name, label) for name, label in self.fields['search_backend'].choices if not name or name in usable
+        ]
+
+    def clean_currency(self):
+        currency = self.cleaned_data['currency'].strip().upper()
+        if len(currency) != 3 or not currency.isalpha():
+            raise forms.ValidationError(_('Enter a three-letter currency code.'))
+        return currency
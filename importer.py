@@ -0,0 +1,395 @@
+"""
+Bulk CSV/XLSX import for properties, tenants and leases.
+
+Rows are streamed from the file (``csv`` reader, or openpyxl in read-only
+mode) and processed in chunks of ``chunk_size``:
+
+1. each row is cleaned with the form-field rules of ``PropertyForm``,
+   ``TenantForm`` or ``LeaseForm`` by calling the class-level
+   ``base_fields`` directly, so no form instance is built per row;
+2. tenants are deduplicated by ``id_number``/email against an in-memory
+   hash index of the hub's tenants and of rows seen earlier in the file;
+3. the chunk is written with ``bulk_create``/``bulk_update`` in one
+   transaction, keeping ``search_document`` and the search index current.
+
+With ``dry_run`` nothing is written and the report says what would happen.
+Headers are matched case-insensitively, so files exported from the list
+views (``Monthly Rent``, ``Is Active``...) can be imported back.
+
+Memory stays bounded by the chunk size plus the hash indexes (one entry
+per tenant for tenant dedupe and lease lookups, one per property name for
+leases).
+"""
+import csv
+import io
+import time
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .forms import LeaseForm, PropertyForm, TenantForm
+from .leasing import find_overlaps
+from .models import Property, Tenant, Lease, sort_key_fields
+from .search import build_search_document, get_search_backend
+from .signals import bulk_updated
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # pragma: no cover - optional dependency
+    load_workbook = None
+
+IMPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 200
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on', 'si', 'sí', 'x'}
+
+
+# ----------------------------------------------------------------------
+# Readers
+# ----------------------------------------------------------------------
+
+def _header(value):
+    return str(value or '').strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def iter_csv_rows(fileobj):
+    """Yield dicts from a CSV file object (text or binary, UTF-8 with or without BOM)."""
+    if isinstance(fileobj.read(0), bytes):
+        fileobj = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(fileobj)
+    headers = [_header(h).lstrip('\ufeff') for h in next(reader, [])]
+    for values in reader:
+        if any(values):
+            yield dict(zip(headers, values))
+
+
+def iter_xlsx_rows(fileobj):
+    """Yield dicts from the first sheet of an XLSX workbook, streaming."""
+    if load_workbook is None:
+        raise ValueError('XLSX import requires openpyxl')
+    wb = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        headers = [_header(h) for h in next(rows, ())]
+        for values in rows:
+            if any(v not in (None, '') for v in values):
+                yield dict(zip(headers, values))
+    finally:
+        wb.close()
+
+
+def read_rows(fileobj, filename):
+    if str(filename).lower().endswith(('.xlsx', '.xlsm')):
+        return iter_xlsx_rows(fileobj)
+    return iter_csv_rows(fileobj)
+
+
+# ----------------------------------------------------------------------
+# Validation
+# ----------------------------------------------------------------------
+
+class RowValidator:
+    """
+    Cleans row dicts with a ModelForm's field rules.
+
+    Uses the form class's ``base_fields`` (built once per class), fills
+    blank cells with the model field default, reads booleans from the
+    usual spreadsheet spellings and accepts choice labels as well as values.
+    """
+
+    def __init__(self, form_class, exclude=()):
+        opts = form_class._meta.model._meta
+        self.fields = {n: f for n, f in form_class.base_fields.items() if n not in exclude}
+        self.defaults = {}
+        self.choices = {}
+        for name, field in self.fields.items():
+            model_field = opts.get_field(name)
+            if model_field.has_default():
+                self.defaults[name] = model_field.get_default()
+            if isinstance(field, forms.ChoiceField):
+                self.choices[name] = {
+                    str(label).lower(): value for value, label in model_field.choices or ()
+                } | {str(value).lower(): value for value, _ in model_field.choices or ()}
+
+    def clean(self, row):
+        data, errors = {}, []
+        for name, field in self.fields.items():
+            raw = row.get(name)
+            if isinstance(raw, str):
+                raw = raw.strip()
+            if raw in (None, '') and name in self.defaults:
+                data[name] = self.defaults[name]
+                continue
+            if isinstance(field, forms.BooleanField):
+                data[name] = raw is True or str(raw).lower() in TRUE_VALUES
+                continue
+            if name in self.choices and raw not in (None, ''):
+                raw = self.choices[name].get(str(raw).lower(), raw)
+            try:
+                data[name] = field.clean(raw)
+            except ValidationError as exc:
+                errors.append(f'{name}: {" ".join(exc.messages)}')
+        return data, errors
+
+
+# ----------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------
+
+class ImportReport:
+    """Counts, per-line errors (capped) and throughput of an import run."""
+
+    def __init__(self, kind, dry_run):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.rows = self.created = self.updated = self.duplicates = self.error_count = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    def add_error(self, line, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, messages))
+
+    @property
+    def rows_per_sec(self):
+        return int(self.rows / self.seconds) if self.seconds else self.rows
+
+    def summary(self):
+        prefix = '[dry run] ' if self.dry_run else ''
+        return (
+            f'{prefix}{self.kind}: {self.rows} rows, {self.created} created, {self.updated} updated, '
+            f'{self.duplicates} duplicates skipped, {self.error_count} errors '
+            f'in {self.seconds:.2f}s ({self.rows_per_sec} rows/s)'
+        )
+
+
+# ----------------------------------------------------------------------
+# Importers
+# ----------------------------------------------------------------------
+
+class BaseImporter:
+    kind = None
+    model = None
+    form_class = None
+    exclude = ()
+
+    def __init__(self, hub_id, dry_run=False, chunk_size=IMPORT_CHUNK_SIZE):
+        self.hub_id = hub_id
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size
+        self.validator = RowValidator(self.form_class, self.exclude)
+
+    def run(self, rows):
+        report = ImportReport(self.kind, self.dry_run)
+        started = time.perf_counter()
+        self.prepare()
+        creates, updates = [], []
+        for line, row in enumerate(rows, start=2):  # line 1 is the header
+            report.rows += 1
+            data, errors = self.validator.clean(row)
+            obj, is_update = None, False
+            if not errors:
+                try:
+                    obj, is_update = self.build(row, data)
+                except ValidationError as exc:
+                    errors = exc.messages
+            if errors:
+                report.add_error(line, errors)
+            elif obj is None:
+                report.duplicates += 1
+            else:
+                obj._import_line = line
+                (updates if is_update else creates).append(obj)
+            if len(creates) + len(updates) >= self.chunk_size:
+                self._flush(creates, updates, report)
+                creates, updates = [], []
+        self._flush(creates, updates, report)
+        if not self.dry_run and (report.created or report.updated):
+            bulk_updated.send(sender=self.model, hub_id=self.hub_id)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def prepare(self):
+        """Load any lookup indexes before the first row."""
+
+    def build(self, row, data):
+        """Return ``(obj, is_update)``; ``obj`` is ``None`` for a skipped duplicate."""
+        return self.model(hub_id=self.hub_id, **data), False
+
+    def check_chunk(self, creates, updates, report):
+        """Drop invalid objects from a chunk before writing; returns both lists."""
+        return creates, updates
+
+    def _flush(self, creates, updates, report):
+        with transaction.atomic():
+            # Checked in the transaction that writes the chunk, so locks taken
+            # by check_chunk hold until the rows are saved.
+            creates, updates = self.check_chunk(creates, updates, report)
+            report.created += len(creates)
+            report.updated += len(updates)
+            if not self.dry_run and (creates or updates):
+                self._write(creates, updates)
+
+    def _write(self, creates, updates):
+        searchable = hasattr(self.model, 'SEARCH_FIELDS')
+        now = timezone.now()
+        keyed = sort_key_fields(self.model)
+        for obj in updates:
+            obj.updated_at = now
+            # bulk_update doesn't run pre_save; bulk_create does.
+            for field in keyed:
+                field.pre_save(obj, False)
+        if searchable:
+            for obj in creates + updates:
+                obj.search_document = build_search_document(obj)
+        self.model.objects.bulk_create(creates, batch_size=self.chunk_size)
+        if updates:
+            fields = [*self.validator.fields, 'updated_at', *(f.name for f in keyed)]
+            fields += ['search_document'] if searchable else []
+            self.model.objects.bulk_update(updates, fields, batch_size=self.chunk_size)
+        if searchable:
+            backend = get_search_backend()
+            backend.index_many(creates, batch_size=self.chunk_size, replace=False)
+            backend.index_many(updates, batch_size=self.chunk_size)
+
+
+class PropertyImporter(BaseImporter):
+    kind = 'properties'
+    model = Property
+    form_class = PropertyForm
+
+
+class TenantIndex:
+    """Hash index of a hub's tenants by normalized id number, email and name."""
+
+    AMBIGUOUS = object()
+
+    def __init__(self):
+        self.keys = {}
+
+    @staticmethod
+    def _keys(id_number='', email='', name=''):
+        id_number = ''.join(str(id_number or '').split()).upper()
+        email = str(email or '').strip().lower()
+        name = ' '.join(str(name or '').split()).lower()
+        return [k for k in (('id', id_number), ('email', email), ('name', name)) if k[1]]
+
+    def add(self, pk, id_number='', email='', name=''):
+        for key in self._keys(id_number, email, name):
+            current = self.keys.get(key)
+            if key[0] == 'name' and current not in (None, pk):
+                self.keys[key] = self.AMBIGUOUS  # names are only used when unique
+            elif current is None:
+                self.keys[key] = pk
+
+    def match(self, id_number='', email=''):
+        """Tenant pk sharing the id number or email, else ``None``."""
+        for key in self._keys(id_number, email):
+            if key in self.keys:
+                return self.keys[key]
+        return None
+
+    def lookup(self, reference):
+        """Resolve a lease's tenant reference: id number, email or unique name."""
+        for key in self._keys(reference, reference, reference):
+            pk = self.keys.get(key)
+            if pk is not None and pk is not self.AMBIGUOUS:
+                return pk
+        return None
+
+    @classmethod
+    def for_hub(cls, hub_id):
+        index = cls()
+        rows = Tenant.objects.filter(hub_id=hub_id, is_deleted=False).values_list('id', 'id_number', 'email', 'name')
+        for pk, id_number, email, name in rows.iterator(chunk_size=IMPORT_CHUNK_SIZE):
+            index.add(pk, id_number, email, name)
+        return index
+
+
+class TenantImporter(BaseImporter):
+    """Creates new tenants and updates those matching by id number or email."""
+
+    kind = 'tenants'
+    model = Tenant
+    form_class = TenantForm
+
+    def prepare(self):
+        self.index = TenantIndex.for_hub(self.hub_id)
+        self.existing = set(v for v in self.index.keys.values() if v is not TenantIndex.AMBIGUOUS)
+        self.seen = set()
+
+    def build(self, row, data):
+        pk = self.index.match(data.get('id_number'), data.get('email'))
+        if pk in self.seen:
+            return None, False  # repeated in this file
+        if pk is not None and pk in self.existing:
+            self.seen.add(pk)
+            return Tenant(pk=pk, hub_id=self.hub_id, **data), True
+        obj = Tenant(hub_id=self.hub_id, **data)
+        self.index.add(obj.pk, obj.id_number, obj.email, obj.name)
+        self.seen.add(obj.pk)
+        return obj, False
+
+
+class LeaseImporter(BaseImporter):
+    """
+    Leases reference their property by name (or id) and their tenant by id
+    number, email or unique name. Each chunk is checked for overlaps with
+    ``find_overlaps`` against itself and the stored active leases; rows
+    that would overlap are reported and skipped. In a dry run, overlaps
+    between rows in different chunks are not detected.
+    """
+
+    kind = 'leases'
+    model = Lease
+    form_class = LeaseForm
+    exclude = ('property', 'tenant')
+
+    def prepare(self):
+        self.tenants = TenantIndex.for_hub(self.hub_id)
+        self.properties = {}
+        rows = Property.objects.filter(hub_id=self.hub_id, is_deleted=False).values_list('id', 'name')
+        for pk, name in rows.iterator(chunk_size=IMPORT_CHUNK_SIZE):
+            self.properties.setdefault(' '.join(name.split()).lower(), pk)
+            self.properties[str(pk)] = pk
+
+    def build(self, row, data):
+        errors = []
+        prop_ref = ' '.join(str(row.get('property') or '').split())
+        property_id = self.properties.get(prop_ref.lower()) or self.properties.get(prop_ref)
+        if property_id is None:
+            errors.append(f'property: "{prop_ref}" not found')
+        tenant_id = self.tenants.lookup(row.get('tenant'))
+        if tenant_id is None:
+            errors.append(f'tenant: "{row.get("tenant") or ""}" not found')
+        if data.get('end_date') and data['end_date'] < data['start_date']:
+            errors.append('end_date: End date cannot be before start date.')
+        if errors:
+            raise ValidationError(errors)
+        return Lease(hub_id=self.hub_id, property_id=property_id, tenant_id=tenant_id, **data), False
+
+    def check_chunk(self, creates, updates, report):
+        rejected = set()
+        batch = {id(obj) for obj in creates}
+        for first, second in find_overlaps(creates, lock=not self.dry_run):
+            obj = second if id(second) in batch else first
+            if id(obj) in batch and id(obj) not in rejected:
+                rejected.add(id(obj))
+                report.add_error(obj._import_line, [
+                    f'Overlaps an active lease on the same property from {first.start_date} '
+                    f'to {first.end_date or "open-ended"}.'
+                    if obj is second else
+                    f'Overlaps an active lease on the same property from {second.start_date}.'
+                ])
+        return [obj for obj in creates if id(obj) not in rejected], updates
+
+
+IMPORTERS = {cls.kind: cls for cls in (PropertyImporter, TenantImporter, LeaseImporter)}
+
+
+def import_file(kind, fileobj, filename, hub_id, dry_run=False, chunk_size=IMPORT_CHUNK_SIZE):
+    """Import ``fileobj`` as ``kind`` (properties, tenants or leases) and return the report."""
+    importer = IMPORTERS[kind](hub_id, dry_run=dry_run, chunk_size=chunk_size)
+    return importer.run(read_rows(fileobj, filename))
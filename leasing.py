@@ -0,0 +1,117 @@
+"""
+Lease rules: overlap detection for active leases on the same property.
+
+Date ranges are inclusive and an open ``end_date`` means "until further
+notice". A single lease is checked with one range query per property served
+by the ``(property, start_date, end_date)`` index; batches (imports) are
+checked in one pass with a sort-and-sweep over the batch merged with the
+existing active leases of the properties involved.
+
+``validate_lease`` (and ``find_overlaps`` with ``lock=True``) locks the
+property rows (``SELECT ... FOR UPDATE``), so concurrent writers of leases
+on one property take turns; call them in the transaction that saves the
+leases.
+"""
+from collections import namedtuple
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from .models import Lease, Property
+
+# Statuses that occupy the property for their date range.
+OCCUPYING_STATUSES = ('active',)
+
+OPEN_END = date.max
+
+Overlap = namedtuple('Overlap', ['first', 'second'])
+
+
+def overlapping_leases(property_id, start_date, end_date=None, exclude_pk=None):
+    """Active, non-deleted leases on ``property_id`` intersecting the range."""
+    qs = Lease.objects.filter(
+        property_id=property_id,
+        is_deleted=False,
+        status__in=OCCUPYING_STATUSES,
+        start_date__lte=end_date or OPEN_END,
+    ).filter(Q(end_date__isnull=True) | Q(end_date__gte=start_date))
+    if exclude_pk is not None:
+        qs = qs.exclude(pk=exclude_pk)
+    return qs
+
+
+def validate_lease(lease):
+    """
+    Raise ``ValidationError`` if ``lease`` has inconsistent dates or, when
+    it occupies its property, overlaps another active lease. Must run inside
+    the transaction that saves ``lease``: the property stays locked until it
+    commits, so a concurrent request can't slip in an overlapping lease.
+    """
+    if lease.end_date and lease.end_date < lease.start_date:
+        raise ValidationError(_('End date cannot be before start date.'))
+    if lease.status not in OCCUPYING_STATUSES:
+        return
+    list(Property.objects.select_for_update().filter(pk=lease.property_id).values_list('pk', flat=True))
+    clash = overlapping_leases(
+        lease.property_id, lease.start_date, lease.end_date,
+        exclude_pk=None if lease._state.adding else lease.pk,
+    ).only('id', 'start_date', 'end_date').first()
+    if clash is not None:
+        raise ValidationError(
+            _('This property already has an active lease from %(start)s to %(end)s.'),
+            params={'start': clash.start_date, 'end': clash.end_date or _('open-ended')},
+        )
+
+
+def _sweep(leases):
+    """
+    Yield ``Overlap`` pairs among ``leases`` (objects with ``property_id``,
+    ``start_date`` and ``end_date``) with a single sort-and-sweep.
+
+    For each property we keep the lease with the furthest end seen so far;
+    a lease starting on or before that end overlaps it. Every lease that
+    overlaps something is reported at least once.
+    """
+    ordered = sorted(leases, key=lambda l: (str(l.property_id), l.start_date))
+    current_property, reach = object(), None
+    for lease in ordered:
+        end = lease.end_date or OPEN_END
+        if lease.property_id != current_property:
+            current_property, reach = lease.property_id, lease
+            continue
+        if lease.start_date <= (reach.end_date or OPEN_END):
+            yield Overlap(reach, lease)
+        if end > (reach.end_date or OPEN_END):
+            reach = lease
+
+
+def find_overlaps(leases, include_existing=True, chunk_size=1000, lock=False):
+    """
+    Check a batch of unsaved/imported leases for overlaps in one pass.
+
+    Only leases in an occupying status take part. With ``include_existing``
+    the active leases already stored for the batch's properties are merged
+    in (fetched with one query per ``chunk_size`` properties), so conflicts
+    against the database are reported too; ``lock`` first locks those
+    properties until the transaction ends. Returns a list of ``Overlap``.
+    """
+    batch = [l for l in leases if (l.status or 'active') in OCCUPYING_STATUSES]
+    candidates = list(batch)
+    if include_existing and batch:
+        property_ids = sorted({l.property_id for l in batch}, key=str)
+        batch_pks = {l.pk for l in batch if l.pk is not None}
+        for i in range(0, len(property_ids), chunk_size):
+            if lock:
+                list(
+                    Property.objects.select_for_update().filter(pk__in=property_ids[i:i + chunk_size])
+                    .order_by('pk').values_list('pk', flat=True)
+                )
+            existing = Lease.objects.filter(
+                property_id__in=property_ids[i:i + chunk_size],
+                is_deleted=False,
+                status__in=OCCUPYING_STATUSES,
+            ).only('id', 'property_id', 'start_date', 'end_date', 'status')
+            candidates.extend(l for l in existing if l.pk not in batch_pks)
+    return list(_sweep(candidates))
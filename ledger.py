@@ -0,0 +1,282 @@
+"""
+Rent ledger and materialized balances.
+
+Every charge, payment or adjustment on a lease is a ``LedgerEntry``
+with a signed amount (debits positive, credits negative). Reading an
+account never sums its history; ``LeaseBalance`` and ``TenantBalance``
+keep the totals and are updated in the same transaction as each posting:
+
+- ``debits``, ``credits`` and ``balance`` move by the posted amount
+- ``arrears_since`` is the date of the oldest charge, in posting order,
+  that credits don't cover yet. Each debit entry stores the lease's
+  ``running_debits``, so that charge is the first one whose running
+  total exceeds the lease's credits: one seek on a partial index.
+
+``post_entry`` locks the tenant's and the lease's balance rows (in that
+order) before writing, so concurrent postings on one account take turns.
+"Tenants more than 60 days in arrears" is then a range read of the
+``(hub_id, arrears_since)`` index, see ``tenants_in_arrears``.
+
+``post_rent_charges`` posts generated ``RentCharge`` rows in chunks, dated
+on the hub's billing day (or the lease's first day, if later), and
+``rebuild_balances`` recomputes running totals and balances from the
+entries in chunks (``property_mgmt_rebuild_balances``), for after an
+import or a manual fix.
+"""
+import time
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connections, transaction
+from django.db.models import Case, Exists, F, Min, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .config import get_hub_settings
+from .models import Lease, LeaseBalance, LedgerEntry, RentCharge, TenantBalance
+
+LEDGER_CHUNK_SIZE = 2000
+DEFAULT_ARREARS_DAYS = 60
+ZERO = Decimal('0.00')
+
+PostingResult = namedtuple('PostingResult', ['hub_id', 'posted', 'seconds'])
+RebuildResult = namedtuple('RebuildResult', ['hub_id', 'leases', 'entries', 'fixed', 'seconds'])
+
+
+def _oldest_unpaid(lease_id, credits):
+    return (
+        LedgerEntry.objects.filter(lease_id=lease_id, amount__gt=0, is_deleted=False, running_debits__gt=credits)
+        .order_by('running_debits').values_list('posted_on', flat=True).first()
+    )
+
+
+def _refresh_tenants(tenant_ids):
+    """Recompute tenant balances from their (few) lease balances with one ``UPDATE``."""
+    leases = LeaseBalance.objects.filter(tenant_id=OuterRef('tenant_id')).order_by().values('tenant_id')
+    TenantBalance.objects.filter(tenant_id__in=tenant_ids).update(
+        balance=Coalesce(Subquery(leases.annotate(total=Sum('balance')).values('total')), Value(ZERO)),
+        arrears_since=Subquery(leases.annotate(oldest=Min('arrears_since')).values('oldest')),
+        updated_at=timezone.now(),
+    )
+
+
+def post_entry(lease, kind, amount, posted_on=None, reference='', charge=None):
+    """
+    Post a signed ``amount`` to a lease and update its balances in one
+    transaction. Returns the ``LedgerEntry``.
+    """
+    amount = Decimal(amount)
+    posted_on = posted_on or timezone.localdate()
+    with transaction.atomic():
+        TenantBalance.objects.select_for_update().get_or_create(
+            tenant_id=lease.tenant_id, defaults={'hub_id': lease.hub_id},
+        )
+        account, _ = LeaseBalance.objects.select_for_update().get_or_create(
+            lease_id=lease.pk, defaults={'hub_id': lease.hub_id, 'tenant_id': lease.tenant_id},
+        )
+        paid_up = account.balance <= 0
+        if amount > 0:
+            account.debits += amount
+        else:
+            account.credits -= amount
+        entry = LedgerEntry.objects.create(
+            hub_id=lease.hub_id, lease_id=lease.pk, tenant_id=lease.tenant_id, kind=kind, posted_on=posted_on,
+            amount=amount, running_debits=account.debits, charge=charge, reference=reference,
+        )
+        account.balance = account.debits - account.credits
+        if account.balance <= 0:
+            account.arrears_since = None
+        elif amount > 0:
+            # Earlier charges were all covered: this one is the oldest unpaid.
+            if paid_up:
+                account.arrears_since = posted_on
+        else:
+            account.arrears_since = _oldest_unpaid(lease.pk, account.credits)
+        account.save()
+        _refresh_tenants([lease.tenant_id])
+    return entry
+
+
+def post_charge(lease, amount, posted_on=None, reference=''):
+    return post_entry(lease, 'charge', amount, posted_on, reference)
+
+
+def post_payment(lease, amount, posted_on=None, reference=''):
+    """Record a payment of ``amount`` (a positive number) against a lease."""
+    return post_entry(lease, 'payment', -Decimal(amount), posted_on, reference)
+
+
+def arrears_cutoff(days=DEFAULT_ARREARS_DAYS, as_of=None):
+    return (as_of or timezone.localdate()) - timedelta(days=days)
+
+
+def tenants_in_arrears(hub_id, days=DEFAULT_ARREARS_DAYS, as_of=None):
+    """Balances of tenants with a charge unpaid for more than ``days`` days, oldest first."""
+    return TenantBalance.objects.filter(
+        hub_id=hub_id, arrears_since__lte=arrears_cutoff(days, as_of),
+    ).select_related('tenant').order_by('arrears_since')
+
+
+def leases_in_arrears(hub_id, days=DEFAULT_ARREARS_DAYS, as_of=None):
+    """Balances of leases with a charge unpaid for more than ``days`` days, oldest first."""
+    return LeaseBalance.objects.filter(
+        hub_id=hub_id, arrears_since__lte=arrears_cutoff(days, as_of),
+    ).select_related('lease', 'tenant').order_by('arrears_since')
+
+
+def _recompute_leases(lease_ids):
+    """Set the balances of ``lease_ids`` from their entries with three set-based ``UPDATE``s."""
+    entries = LedgerEntry.objects.filter(lease_id=OuterRef('lease_id'), is_deleted=False).order_by().values('lease_id')
+    accounts = LeaseBalance.objects.filter(lease_id__in=lease_ids)
+    accounts.update(
+        debits=Coalesce(Subquery(entries.filter(amount__gt=0).annotate(total=Sum('amount')).values('total')), Value(ZERO)),
+        credits=Coalesce(Subquery(entries.filter(amount__lt=0).annotate(total=-Sum('amount')).values('total')), Value(ZERO)),
+        updated_at=timezone.now(),
+    )
+    accounts.update(balance=F('debits') - F('credits'))
+    oldest = LedgerEntry.objects.filter(
+        lease_id=OuterRef('lease_id'), amount__gt=0, is_deleted=False, running_debits__gt=OuterRef('credits'),
+    ).order_by('running_debits').values('posted_on')[:1]
+    accounts.update(arrears_since=Case(When(balance__gt=0, then=Subquery(oldest)), default=None))
+
+
+def _ensure_accounts(leases):
+    """Balance rows for ``(lease_id, hub_id, tenant_id)`` tuples, locked for this transaction."""
+    TenantBalance.objects.bulk_create(
+        [TenantBalance(tenant_id=t, hub_id=h) for t, h in {(t, h) for _, h, t in leases}], ignore_conflicts=True,
+    )
+    LeaseBalance.objects.bulk_create(
+        [LeaseBalance(lease_id=l, hub_id=h, tenant_id=t) for l, h, t in leases], ignore_conflicts=True,
+    )
+    lease_ids = [l for l, _, _ in leases]
+    return dict(
+        LeaseBalance.objects.select_for_update().filter(lease_id__in=lease_ids).values_list('lease_id', 'debits')
+    )
+
+
+def _write_running_debits(pairs):
+    # Plain executemany, as in search._flush: one prepared UPDATE for every changed entry.
+    conn = connections[LedgerEntry.objects.db]
+    qn = conn.ops.quote_name
+    sql = 'UPDATE {} SET {} = %s WHERE {} = %s'.format(
+        qn(LedgerEntry._meta.db_table), qn('running_debits'), qn('id'),
+    )
+    field, pk = LedgerEntry._meta.get_field('running_debits'), LedgerEntry._meta.pk
+    with conn.cursor() as cursor:
+        cursor.executemany(sql, [
+            (field.get_db_prep_save(value, conn), pk.get_db_prep_save(entry_id, conn)) for entry_id, value in pairs
+        ])
+
+
+def _iter_chunks(qs, chunk_size, fields):
+    last_id = None
+    while True:
+        page = qs.order_by('id')
+        if last_id is not None:
+            page = page.filter(id__gt=last_id)
+        rows = list(page.values_list('id', *fields)[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def unposted_charges(hub_id=None):
+    qs = RentCharge.objects.filter(is_deleted=False, ledger_entry__isnull=True).exclude(status='void')
+    return qs.filter(hub_id=hub_id) if hub_id else qs
+
+
+def due_date(period, period_start, hub_id):
+    """When a charge for ``period`` falls due: the hub's billing day, or ``period_start`` if later."""
+    return max(period_start, period.replace(day=get_hub_settings(hub_id).billing_day))
+
+
+def post_rent_charges(hub_id=None, chunk_size=LEDGER_CHUNK_SIZE):
+    """
+    Post every ``RentCharge`` not yet in the ledger on its due date, oldest
+    period first so charges settle in billing order. Returns a
+    ``PostingResult``.
+    """
+    started = time.perf_counter()
+    posted = 0
+    fields = ('lease_id', 'lease__hub_id', 'lease__tenant_id', 'period_start', 'amount')
+    charges = unposted_charges(hub_id)
+    periods = list(charges.order_by('period').values_list('period', flat=True).distinct())
+    for period in periods:
+        for rows in _iter_chunks(charges.filter(period=period), chunk_size, fields):
+            with transaction.atomic():
+                debits = _ensure_accounts({(r[1], r[2], r[3]) for r in rows})
+                # A concurrent run may have posted some of these since they were read.
+                done = set(
+                    LedgerEntry.objects.filter(charge_id__in=[r[0] for r in rows]).values_list('charge_id', flat=True)
+                )
+                entries = []
+                for charge_id, lease_id, lease_hub, tenant_id, period_start, amount in rows:
+                    if charge_id in done:
+                        continue
+                    debits[lease_id] += amount
+                    entries.append(LedgerEntry(
+                        hub_id=lease_hub, lease_id=lease_id, tenant_id=tenant_id, kind='charge',
+                        posted_on=due_date(period, period_start, lease_hub),
+                        amount=amount, running_debits=debits[lease_id], charge_id=charge_id,
+                        reference=f'Rent {period:%Y-%m}',
+                    ))
+                LedgerEntry.objects.bulk_create(entries, batch_size=chunk_size)
+                lease_ids = {e.lease_id for e in entries}
+                _recompute_leases(lease_ids)
+                _refresh_tenants({e.tenant_id for e in entries})
+            posted += len(entries)
+    return PostingResult(hub_id, posted, round(time.perf_counter() - started, 3))
+
+
+def rebuild_balances(hub_id=None, chunk_size=LEDGER_CHUNK_SIZE):
+    """
+    Recompute running totals and balances of every lease with entries,
+    ``chunk_size`` leases per transaction. Returns a ``RebuildResult``.
+    """
+    started = time.perf_counter()
+    leases = Lease.all_objects.filter(Exists(LedgerEntry.all_objects.filter(lease_id=OuterRef('pk'))))
+    if hub_id:
+        leases = leases.filter(hub_id=hub_id)
+    count = entries = fixed = 0
+    for rows in _iter_chunks(leases, chunk_size, ('hub_id', 'tenant_id')):
+        lease_ids = [r[0] for r in rows]
+        with transaction.atomic():
+            _ensure_accounts(rows)
+            running = defaultdict(lambda: ZERO)
+            changed = []
+            history = (
+                LedgerEntry.objects.filter(lease_id__in=lease_ids, is_deleted=False)
+                .order_by('lease_id', 'created_at', 'id')
+                .values_list('id', 'lease_id', 'amount', 'running_debits')
+            )
+            for entry_id, lease_id, amount, stored in history.iterator(chunk_size=chunk_size):
+                entries += 1
+                if amount > 0:
+                    running[lease_id] += amount
+                if stored != running[lease_id]:
+                    changed.append((entry_id, running[lease_id]))
+            _write_running_debits(changed)
+            _recompute_leases(lease_ids)
+            _refresh_tenants({r[2] for r in rows})
+        count += len(rows)
+        fixed += len(changed)
+    return RebuildResult(hub_id, count, entries, fixed, round(time.perf_counter() - started, 3))
+
+
+@receiver(post_save, sender=Lease, dispatch_uid='property_mgmt_ledger_tenant')
+def move_balance_with_tenant(sender, instance, created, **kwargs):
+    # A lease handed to another tenant takes its open balance along.
+    if created:
+        return
+    previous = LeaseBalance.objects.filter(lease_id=instance.pk).exclude(tenant_id=instance.tenant_id)
+    old_tenant_id = previous.values_list('tenant_id', flat=True).first()
+    if old_tenant_id is None:
+        return
+    with transaction.atomic():
+        TenantBalance.objects.get_or_create(tenant_id=instance.tenant_id, defaults={'hub_id': instance.hub_id})
+        previous.update(tenant_id=instance.tenant_id)
+        _refresh_tenants([old_tenant_id, instance.tenant_id])
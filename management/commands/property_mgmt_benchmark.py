@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from property_mgmt.benchmarks import (
+    BASELINE_PATH, DEFAULT_TOLERANCE, SCENARIOS, baseline_key, compare, load_baseline, load_scenarios,
+    save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run property management performance benchmarks against a seeded hub'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', nargs='+', help='Scenario name(s), or "all"')
+        parser.add_argument('--properties', type=int, default=50000, help='Properties to seed per hub')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement')
+        parser.add_argument('--check', action='store_true', help='Fail if a result regresses against the baseline')
+        parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+        parser.add_argument('--baseline-file', default=str(BASELINE_PATH), help='Baseline JSON file')
+        parser.add_argument(
+            '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+            help='Allowed slowdown over the baseline, as a fraction (0.5 = 50%%)',
+        )
+
+    def handle(self, *args, **options):
+        load_scenarios()
+        names = sorted(SCENARIOS) if options['scenario'] == ['all'] else options['scenario']
+        unknown = [n for n in names if n not in SCENARIOS]
+        if unknown:
+            raise CommandError(f'Unknown scenario(s): {", ".join(unknown)}. Available: {", ".join(sorted(SCENARIOS))}')
+
+        baseline = load_baseline(options['baseline_file']) if options['check'] else {}
+        failures = []
+        for name in names:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name}'))
+            rows = SCENARIOS[name](properties=options['properties'], repeat=options['repeat'])
+            for row in rows:
+                extra = '  '.join(f'{k}={v}' for k, v in row.items() if k not in ('name', 'ms'))
+                self.stdout.write(f'{row["name"]:<48} {row["ms"]:>10.3f} ms  {extra}')
+
+            key = baseline_key(name, options['properties'])
+            if options['check']:
+                if key not in baseline:
+                    self.stdout.write(self.style.WARNING(f'No baseline for {key}'))
+                failures += compare(rows, baseline.get(key, {}), options['tolerance'])
+            if options['save_baseline']:
+                save_baseline(key, rows, options['baseline_file'])
+                self.stdout.write(self.style.SUCCESS(f'Saved baseline {key}'))
+
+        if failures:
+            raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(failures))
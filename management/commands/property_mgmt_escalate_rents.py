@@ -0,0 +1,44 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from property_mgmt.escalation import ESCALATION_CHUNK_SIZE, apply_escalations, due_hub_ids, preview_escalations
+
+
+class Command(BaseCommand):
+    help = 'Preview (default) or apply due rent escalations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', help='Only this hub id (defaults to every hub with due reviews)')
+        parser.add_argument('--date', help='Review date as YYYY-MM-DD (defaults to today)')
+        parser.add_argument('--apply', action='store_true', help='Write the new rents; without it only the diff is shown')
+        parser.add_argument('--show', type=int, default=50, help='Diff lines to print per hub in preview mode')
+        parser.add_argument('--chunk-size', type=int, default=ESCALATION_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError('--date must be YYYY-MM-DD')
+
+        hub_ids = [options['hub']] if options['hub'] else due_hub_ids(as_of)
+        if options['apply']:
+            for hub_id in hub_ids:
+                r = apply_escalations(hub_id, as_of, options['chunk_size'])
+                self.stdout.write(f'{r.hub_id}: {r.changed} rents changed, {r.skipped} skipped in {r.seconds}s')
+            return
+
+        for hub_id in hub_ids:
+            changes, skipped = preview_escalations(hub_id, as_of)
+            old = sum(c.old_rent for c in changes)
+            new = sum(c.new_rent for c in changes)
+            for c in changes[:options['show']]:
+                pct = (c.new_rent / c.old_rent - 1) * 100 if c.old_rent else 0
+                self.stdout.write(f'{c.lease_id}  {c.kind:<5}  {c.old_rent:>10} -> {c.new_rent:>10}  ({pct:+.2f}%)')
+            if len(changes) > options['show']:
+                self.stdout.write(f'... {len(changes) - options["show"]} more')
+            self.stdout.write(
+                f'{hub_id}: {len(changes)} leases, monthly rent {old} -> {new}, '
+                f'{len(skipped)} skipped (preview only, pass --apply to write)'
+            )
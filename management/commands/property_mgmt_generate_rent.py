@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from property_mgmt.billing import BILLING_CHUNK_SIZE, generate_all_hubs, generate_rent_charges, parse_period
+from property_mgmt.ledger import post_rent_charges
+
+
+class Command(BaseCommand):
+    help = 'Generate monthly rent charges for active leases (safe to rerun for the same period)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', help='Billing month as YYYY-MM (defaults to the current month)')
+        parser.add_argument('--hub', help='Only bill this hub id (defaults to every hub)')
+        parser.add_argument('--processes', type=int, default=1, help='Worker processes when billing every hub')
+        parser.add_argument('--chunk-size', type=int, default=BILLING_CHUNK_SIZE)
+        parser.add_argument('--post-ledger', action='store_true', help='Post the new charges to the rent ledger')
+
+    def handle(self, *args, **options):
+        try:
+            period = parse_period(options['period'] or timezone.localdate())
+        except ValueError:
+            raise CommandError('--period must be YYYY-MM')
+
+        if options['hub']:
+            results = [generate_rent_charges(period, options['hub'], options['chunk_size'])]
+        else:
+            results = generate_all_hubs(period, options['processes'], options['chunk_size'])
+
+        for r in results:
+            rate = int(r.leases / r.seconds) if r.seconds else r.leases
+            self.stdout.write(
+                f'{r.hub_id}: {r.leases} leases, {r.created} charges created, '
+                f'{r.skipped} already billed in {r.seconds}s ({rate} leases/s)'
+            )
+        self.stdout.write(f'{period:%Y-%m}: {sum(r.created for r in results)} charges created')
+
+        if options['post_ledger']:
+            posted = post_rent_charges(options['hub'], options['chunk_size'])
+            self.stdout.write(f'{posted.posted} charges posted to the ledger in {posted.seconds}s')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from property_mgmt.importer import IMPORT_CHUNK_SIZE, IMPORTERS, import_file
+
+
+class Command(BaseCommand):
+    help = 'Bulk import properties, tenants or leases for a hub from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path', help='CSV or XLSX file; the first row holds the column names')
+        parser.add_argument('--hub', required=True, help='Hub id to import into')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without writing')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument('--show-errors', type=int, default=20, help='How many row errors to print')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                report = import_file(
+                    options['kind'], fileobj, options['path'], options['hub'],
+                    dry_run=options['dry_run'], chunk_size=options['chunk_size'],
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(exc)
+
+        for line, messages in report.errors[:options['show_errors']]:
+            self.stdout.write(f'line {line}: {"; ".join(messages)}')
+        if report.error_count > options['show_errors']:
+            self.stdout.write(f'... {report.error_count - options["show_errors"]} more errors')
+        self.stdout.write(report.summary())
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from property_mgmt.retention import (
+    RETENTION_CHUNK_SIZE, hubs_with_deleted_rows, preview_purge, purge_all, purge_expired,
+)
+
+
+class Command(BaseCommand):
+    help = 'Archive and remove soft-deleted rows older than the retention window (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', help='Only this hub id (defaults to every hub)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be purged')
+        parser.add_argument('--chunk-size', type=int, default=RETENTION_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        hub = options['hub']
+        if options['dry_run']:
+            results = [preview_purge(h) for h in ([hub] if hub else hubs_with_deleted_rows())]
+        elif hub:
+            results = [purge_expired(hub, chunk_size=options['chunk_size'])]
+        else:
+            results = purge_all(chunk_size=options['chunk_size'])
+
+        verb = 'to purge' if options['dry_run'] else 'purged'
+        for r in results:
+            self.stdout.write(
+                f'{r.hub_id}: {r.leases} leases, {r.tenants} tenants, {r.properties} properties {verb} in {r.seconds}s'
+            )
+        self.stdout.write(f'{sum(r.leases + r.tenants + r.properties for r in results)} rows {verb}')
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from property_mgmt.ledger import LEDGER_CHUNK_SIZE, post_rent_charges, rebuild_balances
+
+
+class Command(BaseCommand):
+    help = 'Recompute ledger running totals and lease/tenant balances from the ledger entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', help='Only rebuild this hub id (defaults to every hub)')
+        parser.add_argument('--post-charges', action='store_true', help='Post unposted rent charges first')
+        parser.add_argument('--chunk-size', type=int, default=LEDGER_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['post_charges']:
+            posted = post_rent_charges(options['hub'], options['chunk_size'])
+            self.stdout.write(f'{posted.posted} rent charges posted in {posted.seconds}s')
+
+        r = rebuild_balances(options['hub'], options['chunk_size'])
+        self.stdout.write(
+            f'{r.leases} leases, {r.entries} entries, {r.fixed} running totals fixed in {r.seconds}s'
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from property_mgmt.availability import REBUILD_CHUNK_SIZE, rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the occupancy timeline used by the availability search from active leases'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', help='Only rebuild this hub id')
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        total = rebuild_timeline(options['hub'], chunk_size=options['chunk_size'])
+        self.stdout.write(f'occupancy spans: {total} rows rebuilt')
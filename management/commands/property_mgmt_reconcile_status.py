@@ -0,0 +1,28 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from property_mgmt.occupancy import RECONCILE_CHUNK_SIZE, reconcile_statuses
+
+
+class Command(BaseCommand):
+    help = 'Derive property status and current lease from lease dates (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', help='Only reconcile this hub id (defaults to every hub)')
+        parser.add_argument('--date', help='Reference date as YYYY-MM-DD (defaults to today)')
+        parser.add_argument('--chunk-size', type=int, default=RECONCILE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError:
+            raise CommandError('--date must be YYYY-MM-DD')
+
+        results = reconcile_statuses(options['hub'], as_of, options['chunk_size'])
+        for r in results:
+            self.stdout.write(
+                f'{r.hub_id}: {r.properties} properties, {r.updated} updated, '
+                f'{r.expired_leases} leases ended in {r.seconds}s'
+            )
+        self.stdout.write(f'{sum(r.updated for r in results)} properties updated')
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from property_mgmt.models import Property, Tenant
+from property_mgmt.search import build_search_document, get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild search documents and the search token index for properties and tenants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', help='Only reindex this hub id')
+        parser.add_argument('--backend', help='Search backend to index for (defaults to the configured one)')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['backend'])
+        batch_size = options['batch_size']
+        for model in (Property, Tenant):
+            qs = model.all_objects.all()
+            if options['hub']:
+                qs = qs.filter(hub_id=options['hub'])
+            total, batch = 0, []
+            for obj in qs.iterator(chunk_size=batch_size):
+                obj.search_document = build_search_document(obj)
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    model.all_objects.bulk_update(batch, ['search_document'])
+                    backend.index_many(batch, batch_size=batch_size)
+                    total += len(batch)
+                    batch = []
+            model.all_objects.bulk_update(batch, ['search_document'])
+            backend.index_many(batch, batch_size=batch_size)
+            total += len(batch)
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {total} rows reindexed ({backend.name})')
@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from property_mgmt.renewals import RENEWAL_CHUNK_SIZE, get_notice_days, schedule_all_hubs, schedule_renewals
+
+
+class Command(BaseCommand):
+    help = 'Raise renewal tasks for active leases ending soon (incremental, safe to rerun)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', help='Only this hub id (defaults to every hub)')
+        parser.add_argument('--days', type=int, help='Notice period in days (defaults to PROPERTY_MGMT_RENEWAL_NOTICE_DAYS)')
+        parser.add_argument('--date', help='Run as of this day, YYYY-MM-DD (defaults to today)')
+        parser.add_argument('--chunk-size', type=int, default=RENEWAL_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError:
+            raise CommandError('--date must be YYYY-MM-DD')
+        days = options['days'] if options['days'] is not None else get_notice_days()
+
+        if options['hub']:
+            results = [schedule_renewals(options['hub'], as_of, days, options['chunk_size'])]
+        else:
+            results = schedule_all_hubs(as_of, days, options['chunk_size'])
+
+        for r in results:
+            self.stdout.write(f'{r.hub_id}: {r.candidates} candidates, {r.created} tasks created in {r.seconds}s')
+        self.stdout.write(f'{sum(r.created for r in results)} renewal tasks created')
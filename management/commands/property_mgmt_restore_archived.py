@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from property_mgmt.retention import RETENTION_MODELS, restore_archived
+
+
+class Command(BaseCommand):
+    help = 'Restore purged properties, tenants and leases from the archive as live rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', required=True, help='Hub id to restore rows of')
+        parser.add_argument('--model', choices=[m._meta.model_name for m in RETENTION_MODELS])
+        parser.add_argument('--id', action='append', dest='ids', help='Only this row id (repeatable)')
+
+    def handle(self, *args, **options):
+        r = restore_archived(options['hub'], options['model'], options['ids'])
+        self.stdout.write(
+            f'{r.leases} leases, {r.tenants} tenants, {r.properties} properties restored, '
+            f'{r.skipped} leases skipped in {r.seconds}s'
+        )
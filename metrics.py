@@ -0,0 +1,115 @@
+"""
+Per-hub dashboard metrics with a cache in front.
+
+Each table is read with a single aggregate query using conditional
+``Count``/``Sum``, and the result is stored in Django's cache for
+``PROPERTY_MGMT_DASHBOARD_TTL`` seconds (default 300). Writes to
+``Property``, ``Tenant`` or ``Lease`` invalidate the hub's entry (see
+``signals.py``), so steady-state dashboard hits don't touch the database.
+
+``aget_dashboard_metrics`` is the async (ASGI) variant: the three
+aggregates run concurrently, each on its own connection (``parallel.aread``).
+"""
+import asyncio
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .cache import hub_cache_key
+from .models import Property, Tenant, Lease
+from .parallel import aread
+
+CACHE_KEY = 'property_mgmt:dashboard:{hub_id}'
+EXPIRING_DAYS = 30
+
+ZERO = Value(Decimal('0'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def _ttl():
+    return getattr(settings, 'PROPERTY_MGMT_DASHBOARD_TTL', 300)
+
+
+def _sum(field, **filters):
+    return Coalesce(Sum(field, filter=Q(**filters) if filters else None), ZERO)
+
+
+def _aggregates(hub_id, today):
+    """The dashboard's independent aggregate queries, as ``(queryset, aggregates)`` pairs."""
+    current = Q(status='active', start_date__lte=today) & (Q(end_date__isnull=True) | Q(end_date__gte=today))
+    return [
+        (Property.objects.filter(hub_id=hub_id, is_deleted=False), {
+            'total_properties': Count('id'),
+            'active_properties': Count('id', filter=Q(is_active=True)),
+            'rented_properties': Count('id', filter=Q(status='rented')),
+            'available_properties': Count('id', filter=Q(status='available')),
+            'maintenance_properties': Count('id', filter=Q(status='maintenance')),
+            'sold_properties': Count('id', filter=Q(status='sold')),
+            'potential_rent': _sum('monthly_rent', status__in=['available', 'rented', 'maintenance']),
+        }),
+        (Tenant.objects.filter(hub_id=hub_id, is_deleted=False), {
+            'total_tenants': Count('id'),
+            'active_tenants': Count('id', filter=Q(is_active=True)),
+        }),
+        (Lease.objects.filter(hub_id=hub_id, is_deleted=False), {
+            'active_leases': Count('id', filter=current),
+            'rent_roll': Coalesce(Sum('monthly_rent', filter=current), ZERO),
+            'expiring_leases': Count('id', filter=current & Q(end_date__lte=today + timedelta(days=EXPIRING_DAYS))),
+        }),
+    ]
+
+
+def _derive(metrics):
+    lettable = metrics['total_properties'] - metrics['sold_properties']
+    metrics['occupancy_rate'] = (
+        round(metrics['rented_properties'] * 100 / lettable, 1) if lettable else 0
+    )
+    metrics['vacancies'] = metrics['available_properties']
+    return metrics
+
+
+def compute_dashboard_metrics(hub_id):
+    """Compute dashboard KPIs for a hub, bypassing the cache."""
+    metrics = {}
+    for qs, aggregates in _aggregates(hub_id, timezone.localdate()):
+        metrics.update(qs.aggregate(**aggregates))
+    return _derive(metrics)
+
+
+async def acompute_dashboard_metrics(hub_id):
+    """Async ``compute_dashboard_metrics``; the aggregates run concurrently."""
+    results = await asyncio.gather(*(
+        aread(qs.aggregate, **aggregates) for qs, aggregates in _aggregates(hub_id, timezone.localdate())
+    ))
+    metrics = {}
+    for result in results:
+        metrics.update(result)
+    return _derive(metrics)
+
+
+def get_dashboard_metrics(hub_id):
+    """Cached dashboard KPIs for a hub."""
+    key = hub_cache_key(hub_id, CACHE_KEY)
+    metrics = cache.get(key)
+    if metrics is None:
+        metrics = compute_dashboard_metrics(hub_id)
+        cache.set(key, metrics, _ttl())
+    return metrics
+
+
+async def aget_dashboard_metrics(hub_id):
+    """Async ``get_dashboard_metrics``."""
+    key = hub_cache_key(hub_id, CACHE_KEY)
+    metrics = await cache.aget(key)
+    if metrics is None:
+        metrics = await acompute_dashboard_metrics(hub_id)
+        await cache.aset(key, metrics, _ttl())
+    return metrics
+
+
+def invalidate_dashboard_metrics(hub_id):
+    cache.delete(hub_cache_key(hub_id, CACHE_KEY))
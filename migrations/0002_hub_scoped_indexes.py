@@ -0,0 +1,101 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['property', 'start_date', 'end_date'], name='pm_lease_prop_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['tenant', 'start_date'], name='pm_lease_tenant_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'status', 'end_date'], name='pm_lease_hub_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'start_date'], name='pm_lease_hub_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'end_date'], name='pm_lease_hub_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name', 'id'], name='pm_prop_hub_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'status', 'id'], name='pm_prop_hub_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'is_active', 'id'], name='pm_prop_hub_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'monthly_rent', 'id'], name='pm_prop_hub_rent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'area_sqm', 'id'], name='pm_prop_hub_area_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'bathrooms', 'id'], name='pm_prop_hub_baths_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at', 'id'], name='pm_prop_hub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name', 'id'], name='pm_ten_hub_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'is_active', 'id'], name='pm_ten_hub_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'email', 'id'], name='pm_ten_hub_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'phone', 'id'], name='pm_ten_hub_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'id_number', 'id'], name='pm_ten_hub_idnum_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at', 'id'], name='pm_ten_hub_created_idx'),
+        ),
+        FullIndexFallbacks(added={
+            'lease': [
+                'pm_lease_prop_dates_idx', 'pm_lease_tenant_start_idx', 'pm_lease_hub_status_idx',
+                'pm_lease_hub_start_idx', 'pm_lease_hub_end_idx',
+            ],
+            'property': [
+                'pm_prop_hub_name_idx', 'pm_prop_hub_status_idx', 'pm_prop_hub_active_idx', 'pm_prop_hub_rent_idx',
+                'pm_prop_hub_area_idx', 'pm_prop_hub_baths_idx', 'pm_prop_hub_created_idx',
+            ],
+            'tenant': [
+                'pm_ten_hub_name_idx', 'pm_ten_hub_active_idx', 'pm_ten_hub_email_idx', 'pm_ten_hub_phone_idx',
+                'pm_ten_hub_idnum_idx', 'pm_ten_hub_created_idx',
+            ],
+        }),
+    ]
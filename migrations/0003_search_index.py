@@ -0,0 +1,112 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:37
+
+import re
+import unicodedata
+
+from django.db import DatabaseError, migrations, models, transaction
+
+# Frozen copies of the search.py helpers as of this migration, so later
+# changes to tokenisation don't change what it does.
+TOKEN_MAX_LENGTH = 64
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+
+SEARCH_FIELDS = {
+    'property': (('name', 'address', 'property_type', 'status'), ()),
+    'tenant': (('name', 'email', 'phone', 'id_number'), ('phone', 'id_number')),
+}
+
+TRIGRAM_INDEXES = {
+    'pm_prop_search_trgm': 'property_mgmt_property',
+    'pm_ten_search_trgm': 'property_mgmt_tenant',
+}
+
+
+def populate_search(apps, schema_editor):
+    is_postgres = schema_editor.connection.vendor == 'postgresql'
+    SearchToken = apps.get_model('property_mgmt', 'SearchToken')
+    for model_name, (fields, identifiers) in SEARCH_FIELDS.items():
+        model = apps.get_model('property_mgmt', model_name)
+        batch, tokens = [], []
+        rows = model._base_manager.only('hub_id', *fields).iterator(chunk_size=2000)
+        for obj in rows:
+            obj.search_document = normalize(' '.join(str(getattr(obj, f) or '') for f in fields))
+            batch.append(obj)
+            if not is_postgres:
+                words = set(WORD_RE.findall(obj.search_document))
+                words.update(c for c in (''.join(WORD_RE.findall(normalize(getattr(obj, f)))) for f in identifiers) if c)
+                tokens.extend(
+                    SearchToken(hub_id=obj.hub_id, model_name=model_name, object_id=obj.pk, token=w[:TOKEN_MAX_LENGTH])
+                    for w in words
+                )
+            if len(batch) >= 2000:
+                model._base_manager.bulk_update(batch, ['search_document'])
+                SearchToken.objects.bulk_create(tokens, batch_size=2000)
+                batch, tokens = [], []
+        model._base_manager.bulk_update(batch, ['search_document'])
+        SearchToken.objects.bulk_create(tokens, batch_size=2000)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic():
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError:
+        # No privilege to create the extension: get_search_backend falls
+        # back to the basic backend, which needs no index.
+        return
+    for name, table in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (search_document gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0002_hub_scoped_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='tenant',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hub_id', models.UUIDField(blank=True, null=True)),
+                ('model_name', models.CharField(max_length=20)),
+                ('object_id', models.UUIDField(db_index=True)),
+                ('token', models.CharField(max_length=64)),
+            ],
+            options={
+                'db_table': 'property_mgmt_search_token',
+                'indexes': [models.Index(fields=['hub_id', 'model_name', 'token', 'object_id'], name='pm_search_token_idx')],
+            },
+        ),
+        migrations.RunPython(populate_search, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
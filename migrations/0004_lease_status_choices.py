@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lease',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('active', 'Active'), ('ended', 'Ended'), ('terminated', 'Terminated')], default='active', max_length=20, verbose_name='Status'),
+        ),
+    ]
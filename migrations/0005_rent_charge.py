@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:04
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0004_lease_status_choices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RentCharge',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('period', models.DateField(help_text='First day of the billed month', verbose_name='Period')),
+                ('period_start', models.DateField(verbose_name='From')),
+                ('period_end', models.DateField(verbose_name='To')),
+                ('days', models.PositiveSmallIntegerField(verbose_name='Billed Days')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Amount')),
+                ('status', models.CharField(choices=[('open', 'Open'), ('paid', 'Paid'), ('void', 'Void')], default='open', max_length=20, verbose_name='Status')),
+                ('lease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='charges', to='property_mgmt.lease')),
+            ],
+            options={
+                'db_table': 'property_mgmt_rent_charge',
+                'abstract': False,
+                'indexes': [models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'period'], name='pm_charge_hub_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('lease', 'period'), name='pm_charge_lease_period_uniq')],
+            },
+        ),
+        FullIndexFallbacks(added={'rentcharge': ['pm_charge_hub_period_idx']}),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:27
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0005_rent_charge'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkActionLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('model_name', models.CharField(max_length=50, verbose_name='Model')),
+                ('action', models.CharField(max_length=20, verbose_name='Action')),
+                ('selection', models.CharField(choices=[('ids', 'Selected rows'), ('filter', 'All matching rows')], max_length=10, verbose_name='Selection')),
+                ('criteria', models.JSONField(blank=True, default=dict, verbose_name='Criteria')),
+                ('affected', models.PositiveIntegerField(default=0, verbose_name='Affected Rows')),
+            ],
+            options={
+                'db_table': 'property_mgmt_bulk_action_log',
+                'abstract': False,
+                'indexes': [models.Index(fields=['hub_id', 'created_at'], name='pm_bulk_log_hub_created_idx')],
+            },
+        ),
+    ]
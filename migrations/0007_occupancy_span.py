@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:36
+
+from datetime import date
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_spans(apps, schema_editor):
+    Lease = apps.get_model('property_mgmt', 'Lease')
+    OccupancySpan = apps.get_model('property_mgmt', 'OccupancySpan')
+    rows = (
+        Lease._base_manager.filter(is_deleted=False, status='active')
+        .values_list('id', 'hub_id', 'property_id', 'start_date', 'end_date')
+        .iterator(chunk_size=2000)
+    )
+    batch = []
+    for lease_id, hub_id, property_id, start_date, end_date in rows:
+        batch.append(OccupancySpan(
+            lease_id=lease_id, hub_id=hub_id, property_id=property_id,
+            start_date=start_date, end_date=end_date or date.max,
+        ))
+        if len(batch) >= 2000:
+            OccupancySpan.objects.bulk_create(batch)
+            batch = []
+    OccupancySpan.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0006_bulk_action_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OccupancySpan',
+            fields=[
+                ('lease', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='occupancy_span', serialize=False, to='property_mgmt.lease')),
+                ('hub_id', models.UUIDField(blank=True, null=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy_spans', to='property_mgmt.property')),
+            ],
+            options={
+                'db_table': 'property_mgmt_occupancy_span',
+                'indexes': [models.Index(fields=['property', 'start_date', 'end_date'], name='pm_span_prop_dates_idx'), models.Index(fields=['hub_id', 'start_date', 'end_date'], name='pm_span_hub_dates_idx')],
+            },
+        ),
+        migrations.RunPython(populate_spans, migrations.RunPython.noop),
+    ]
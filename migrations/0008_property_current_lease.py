@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0007_occupancy_span'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='current_lease',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Active lease covering today, kept in sync from leases', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='property_mgmt.lease', verbose_name='Current Lease'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:15
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0008_property_current_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenewalWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hub_id', models.UUIDField(unique=True)),
+                ('scanned_through', models.DateField()),
+                ('last_run_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'property_mgmt_renewal_watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='RenewalTask',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('due_date', models.DateField(help_text='Lease end date the task was raised for', verbose_name='Due Date')),
+                ('status', models.CharField(choices=[('open', 'Open'), ('renewed', 'Renewed'), ('dismissed', 'Dismissed')], default='open', max_length=20, verbose_name='Status')),
+                ('lease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renewal_tasks', to='property_mgmt.lease')),
+            ],
+            options={
+                'db_table': 'property_mgmt_renewal_task',
+                'abstract': False,
+                'indexes': [models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'status', 'due_date'], name='pm_renewal_hub_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('lease', 'due_date'), name='pm_renewal_lease_due_uniq')],
+            },
+        ),
+        FullIndexFallbacks(added={'renewaltask': ['pm_renewal_hub_status_idx']}),
+    ]
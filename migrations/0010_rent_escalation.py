@@ -0,0 +1,94 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:17
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0009_renewals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CPIIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index_name', models.CharField(max_length=30)),
+                ('period', models.DateField(help_text='First day of the month')),
+                ('value', models.DecimalField(decimal_places=3, max_digits=10)),
+            ],
+            options={
+                'db_table': 'property_mgmt_cpi_index',
+                'constraints': [models.UniqueConstraint(fields=('index_name', 'period'), name='pm_cpi_name_period_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EscalationRule',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('kind', models.CharField(choices=[('fixed', 'Fixed Percentage'), ('cpi', 'CPI Index'), ('step', 'Step Schedule')], max_length=10, verbose_name='Kind')),
+                ('percent', models.DecimalField(blank=True, decimal_places=3, max_digits=6, null=True, verbose_name='Increase %')),
+                ('index_name', models.CharField(blank=True, max_length=30, verbose_name='CPI Series')),
+                ('floor_percent', models.DecimalField(blank=True, decimal_places=3, max_digits=6, null=True, verbose_name='Floor %')),
+                ('cap_percent', models.DecimalField(blank=True, decimal_places=3, max_digits=6, null=True, verbose_name='Cap %')),
+                ('steps', models.JSONField(blank=True, default=list, help_text='Rent for each successive review', verbose_name='Step Rents')),
+                ('interval_months', models.PositiveSmallIntegerField(default=12, verbose_name='Review Every (Months)')),
+                ('next_review_date', models.DateField(verbose_name='Next Review')),
+                ('reviews_applied', models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Reviews Applied')),
+                ('lease', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='escalation_rule', to='property_mgmt.lease')),
+            ],
+            options={
+                'db_table': 'property_mgmt_escalation_rule',
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RentHistory',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('effective_date', models.DateField(verbose_name='Effective Date')),
+                ('old_rent', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Old Rent')),
+                ('new_rent', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='New Rent')),
+                ('reason', models.CharField(choices=[('fixed', 'Fixed Percentage'), ('cpi', 'CPI Index'), ('step', 'Step Schedule')], max_length=10, verbose_name='Reason')),
+                ('run_id', models.UUIDField(verbose_name='Run')),
+                ('lease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rent_history', to='property_mgmt.lease')),
+                ('rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='property_mgmt.escalationrule')),
+            ],
+            options={
+                'db_table': 'property_mgmt_rent_history',
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='escalationrule',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'next_review_date'], name='pm_escal_hub_review_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='renthistory',
+            index=models.Index(fields=['run_id', 'lease'], name='pm_rent_hist_run_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='renthistory',
+            constraint=models.UniqueConstraint(fields=('lease', 'effective_date'), name='pm_rent_hist_lease_date_uniq'),
+        ),
+        FullIndexFallbacks(added={'escalationrule': ['pm_escal_hub_review_idx']}),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:30
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0010_rent_escalation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantBalance',
+            fields=[
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='property_mgmt.tenant')),
+                ('hub_id', models.UUIDField(blank=True, null=True)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('arrears_since', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'property_mgmt_tenant_balance',
+                'indexes': [models.Index(condition=models.Q(('arrears_since__isnull', False)), fields=['hub_id', 'arrears_since'], name='pm_tenant_bal_arrears_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaseBalance',
+            fields=[
+                ('lease', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='property_mgmt.lease')),
+                ('hub_id', models.UUIDField(blank=True, null=True)),
+                ('debits', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credits', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('arrears_since', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lease_balances', to='property_mgmt.tenant')),
+            ],
+            options={
+                'db_table': 'property_mgmt_lease_balance',
+                'indexes': [models.Index(condition=models.Q(('arrears_since__isnull', False)), fields=['hub_id', 'arrears_since'], name='pm_lease_bal_arrears_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('kind', models.CharField(choices=[('charge', 'Charge'), ('payment', 'Payment'), ('adjustment', 'Adjustment')], max_length=20, verbose_name='Kind')),
+                ('posted_on', models.DateField(verbose_name='Date')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Amount')),
+                ('running_debits', models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14)),
+                ('reference', models.CharField(blank=True, max_length=100, verbose_name='Reference')),
+                ('charge', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entry', to='property_mgmt.rentcharge')),
+                ('lease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='property_mgmt.lease')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='property_mgmt.tenant')),
+            ],
+            options={
+                'db_table': 'property_mgmt_ledger_entry',
+                'abstract': False,
+                'indexes': [models.Index(fields=['lease', 'created_at'], name='pm_ledger_lease_created_idx'), models.Index(condition=models.Q(('amount__gt', 0), ('is_deleted', False)), fields=['lease', 'running_debits'], name='pm_ledger_lease_debits_idx'), models.Index(fields=['tenant', 'posted_on'], name='pm_ledger_tenant_posted_idx')],
+            },
+        ),
+        FullIndexFallbacks(added={'ledgerentry': ['pm_ledger_lease_debits_idx']}),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:54
+
+import django.core.validators
+import property_mgmt.models
+from django.db import migrations, models
+
+from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0011_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hub_id', models.UUIDField(blank=True, null=True)),
+                ('model_name', models.CharField(max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField()),
+                ('data', models.JSONField(encoder=property_mgmt.models.ArchiveEncoder)),
+            ],
+            options={
+                'db_table': 'property_mgmt_archived_row',
+            },
+        ),
+        migrations.CreateModel(
+            name='ModuleSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hub_id', models.UUIDField(unique=True)),
+                ('retention_days', models.PositiveIntegerField(default=90, help_text='Deleted properties, tenants and leases are archived and removed after this many days', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Keep Deleted Rows (Days)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'property_mgmt_settings',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='lease',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['hub_id', 'deleted_at'], name='pm_lease_hub_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['hub_id', 'deleted_at'], name='pm_prop_hub_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['hub_id', 'deleted_at'], name='pm_ten_hub_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedrow',
+            index=models.Index(fields=['hub_id', 'model_name', 'archived_at'], name='pm_archive_hub_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivedrow',
+            constraint=models.UniqueConstraint(fields=('model_name', 'object_id'), name='pm_archive_object_uniq'),
+        ),
+        FullIndexFallbacks(added={
+            'lease': ['pm_lease_hub_deleted_idx'],
+            'property': ['pm_prop_hub_deleted_idx'],
+            'tenant': ['pm_ten_hub_deleted_idx'],
+        }),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:58
+
+import django.core.validators
+import property_mgmt.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0012_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modulesettings',
+            name='billing_day',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Day of the month rent falls due', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(28)], verbose_name='Billing Day'),
+        ),
+        migrations.AddField(
+            model_name='modulesettings',
+            name='currency',
+            field=models.CharField(default='EUR', help_text='ISO 4217 code', max_length=3, verbose_name='Currency'),
+        ),
+        migrations.AddField(
+            model_name='modulesettings',
+            name='default_page_size',
+            field=models.PositiveSmallIntegerField(choices=[(10, '10'), (25, '25'), (50, '50'), (100, '100')], default=10, verbose_name='Rows per Page'),
+        ),
+        migrations.AddField(
+            model_name='modulesettings',
+            name='export_max_rows',
+            field=models.PositiveIntegerField(blank=True, help_text='Leave empty for no limit', null=True, validators=[django.core.validators.MinValueValidator(1)], verbose_name='Export Row Limit'),
+        ),
+        migrations.AddField(
+            model_name='modulesettings',
+            name='search_backend',
+            field=models.CharField(blank=True, choices=[('', 'Default'), ('basic', 'Substring (unindexed)'), ('tokens', 'Word prefix'), ('postgres', 'PostgreSQL trigram')], default='', max_length=10, verbose_name='Search'),
+        ),
+        migrations.AlterField(
+            model_name='modulesettings',
+            name='retention_days',
+            field=models.PositiveIntegerField(default=property_mgmt.models.default_retention_days, help_text='Deleted properties, tenants and leases are archived and removed after this many days', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Keep Deleted Rows (Days)'),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:03
+
+import unicodedata
+from decimal import Decimal
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+import property_mgmt.models
+from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks
+
+
+# Frozen copy of pagination.sort_key as of this migration.
+def sort_key(text):
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split()).casefold()[:255]
+
+
+def populate_name_keys(apps, schema_editor):
+    for model_name in ('property', 'tenant'):
+        model = apps.get_model('property_mgmt', model_name)
+        batch = []
+        for obj in model._base_manager.only('name').iterator(chunk_size=2000):
+            obj.name_key = sort_key(obj.name)
+            batch.append(obj)
+            if len(batch) >= 2000:
+                model._base_manager.bulk_update(batch, ['name_key'])
+                batch = []
+        model._base_manager.bulk_update(batch, ['name_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property_mgmt', '0013_hub_settings'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='property',
+            name='pm_prop_hub_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='property',
+            name='pm_prop_hub_area_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tenant',
+            name='pm_ten_hub_name_idx',
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='area_is_null',
+            field=models.GeneratedField(db_persist=True, expression=models.Q(('area_sqm__isnull', True)), output_field=models.BooleanField()),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='area_key',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Coalesce('area_sqm', models.Value(Decimal('0'))), output_field=models.DecimalField(decimal_places=2, max_digits=8)),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='name_key',
+            field=property_mgmt.models.SortKeyField(default='', editable=False, max_length=255, source='name'),
+        ),
+        migrations.AddField(
+            model_name='tenant',
+            name='name_key',
+            field=property_mgmt.models.SortKeyField(default='', editable=False, max_length=255, source='name'),
+        ),
+        migrations.RunPython(populate_name_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name_key', 'id'], name='pm_prop_hub_namekey_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'area_is_null', 'area_key', 'id'], name='pm_prop_hub_areakey_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'area_is_null', '-area_key', '-id'], name='pm_prop_hub_areakey_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name_key', 'id'], name='pm_ten_hub_namekey_idx'),
+        ),
+        FullIndexFallbacks(
+            added={
+                'property': ['pm_prop_hub_namekey_idx', 'pm_prop_hub_areakey_idx', 'pm_prop_hub_areakey_desc_idx'],
+                'tenant': ['pm_ten_hub_namekey_idx'],
+            },
+            removed={
+                'property': [
+                    models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name', 'id'], name='pm_prop_hub_name_idx'),
+                    models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'area_sqm', 'id'], name='pm_prop_hub_area_idx'),
+                ],
+                'tenant': [
+                    models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name', 'id'], name='pm_ten_hub_name_idx'),
+                ],
+            },
+        ),
+    ]
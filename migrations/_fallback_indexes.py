@@ -0,0 +1,65 @@
+"""
+Full-index fallbacks for partial indexes on ``is_deleted``.
+
+Backends without partial (conditional) indexes, such as MySQL, silently
+skip indexes with a ``condition``. On those backends every partial index
+whose condition tests ``is_deleted`` gets a full twin, named ``*_fidx``,
+with ``is_deleted`` promoted into the key after the first column.
+
+A migration that adds or removes such an index ends with a
+``FullIndexFallbacks`` operation for it. Migrations depend on what this
+module does, so change it only in ways that keep old migrations valid.
+The migration loader skips modules starting with ``_``.
+"""
+from django.db import migrations, models
+
+
+def needs_fallback(index):
+    condition = index.condition
+    return condition is not None and any(
+        isinstance(child, tuple) and child[0] == 'is_deleted' for child in condition.children
+    )
+
+
+def full_index(index):
+    fields = [index.fields[0], 'is_deleted', *index.fields[1:]]
+    return models.Index(fields=fields, name=index.name.replace('_idx', '_fidx'))
+
+
+class FullIndexFallbacks(migrations.RunPython):
+    """
+    Create the fallbacks of the partial indexes ``added`` (``{model_name:
+    [index name]}``, looked up on the migration's model state) and drop those
+    of ``removed`` (``{model_name: [Index]}``, the dropped partial indexes).
+    Does nothing on backends with partial indexes.
+    """
+
+    def __init__(self, added=None, removed=None):
+        self.added = added or {}
+        self.removed = removed or {}
+        super().__init__(self._forwards, self._backwards, elidable=False)
+
+    def _indexes(self, apps):
+        by_model = {}
+        for model_name, names in self.added.items():
+            model = apps.get_model('property_mgmt', model_name)
+            by_model[model_name] = [i for i in model._meta.indexes if i.name in names]
+        return by_model
+
+    def _apply(self, apps, schema_editor, create, drop):
+        if schema_editor.connection.features.supports_partial_indexes:
+            return
+        for model_name, indexes in drop.items():
+            model = apps.get_model('property_mgmt', model_name)
+            for index in indexes:
+                schema_editor.remove_index(model, full_index(index))
+        for model_name, indexes in create.items():
+            model = apps.get_model('property_mgmt', model_name)
+            for index in indexes:
+                schema_editor.add_index(model, full_index(index))
+
+    def _forwards(self, apps, schema_editor):
+        self._apply(apps, schema_editor, self._indexes(apps), self.removed)
+
+    def _backwards(self, apps, schema_editor):
+        self._apply(apps, schema_editor, self.removed, self._indexes(apps))
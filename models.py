@@ -1,8 +1,19 @@
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models.base import HubBaseModel
 
+from .pagination import sort_key
+from .search import build_search_document
+
 PROP_STATUS = [
     ('available', _('Available')),
     ('rented', _('Rented')),
@@ -10,7 +21,116 @@ PROP_STATUS = [
     ('sold', _('Sold')),
 ]
 
-class Property(HubBaseModel):
+LEASE_STATUS = [
+    ('draft', _('Draft')),
+    ('active', _('Active')),
+    ('ended', _('Ended')),
+    ('terminated', _('Terminated')),
+]
+
+BULK_SELECTION = [
+    ('ids', _('Selected rows')),
+    ('filter', _('All matching rows')),
+]
+
+CHARGE_STATUS = [
+    ('open', _('Open')),
+    ('paid', _('Paid')),
+    ('void', _('Void')),
+]
+
+ESCALATION_KIND = [
+    ('fixed', _('Fixed Percentage')),
+    ('cpi', _('CPI Index')),
+    ('step', _('Step Schedule')),
+]
+
+LEDGER_KIND = [
+    ('charge', _('Charge')),
+    ('payment', _('Payment')),
+    ('adjustment', _('Adjustment')),
+]
+
+RENEWAL_STATUS = [
+    ('open', _('Open')),
+    ('renewed', _('Renewed')),
+    ('dismissed', _('Dismissed')),
+]
+
+# Days a soft-deleted row is kept before ``retention.py`` archives it.
+DEFAULT_RETENTION_DAYS = 90
+
+PAGE_SIZES = [(10, '10'), (25, '25'), (50, '50'), (100, '100')]
+
+SEARCH_BACKEND_CHOICES = [
+    ('', _('Default')),
+    ('basic', _('Substring (unindexed)')),
+    ('tokens', _('Word prefix')),
+    ('postgres', _('PostgreSQL trigram')),
+]
+
+
+def default_retention_days():
+    return getattr(settings, 'PROPERTY_MGMT_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+
+
+class SortKeyField(models.CharField):
+    """``sort_key`` of the ``source`` field, set whenever the row is written."""
+
+    def __init__(self, source, **kwargs):
+        self.source = source
+        kwargs.setdefault('max_length', 255)
+        kwargs.setdefault('default', '')
+        kwargs.setdefault('editable', False)
+        super().__init__(**kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = sort_key(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+def sort_key_fields(model):
+    return [f for f in model._meta.concrete_fields if isinstance(f, SortKeyField)]
+
+
+class SortKeyMixin:
+    """Adds sort keys to ``update_fields`` saves that change their source."""
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            keys = {f.name for f in sort_key_fields(type(self)) if f.source in update_fields}
+            if keys:
+                kwargs['update_fields'] = {*update_fields, *keys}
+        super().save(*args, **kwargs)
+
+
+class SearchableMixin:
+    """Keeps ``search_document`` in sync with ``SEARCH_FIELDS`` on save."""
+
+    SEARCH_FIELDS = ()
+    SEARCH_IDENTIFIER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.SEARCH_FIELDS):
+            self.search_document = build_search_document(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_document'}
+        super().save(*args, **kwargs)
+
+
+class Property(SortKeyMixin, SearchableMixin, HubBaseModel):
+    SEARCH_FIELDS = ('name', 'address', 'property_type', 'status')
+    # Sort keys led by a null flag, so NULL areas sort last either way.
+    SORT_NULL_FLAGS = {'area_key': 'area_is_null'}
+
     name = models.CharField(max_length=255, verbose_name=_('Name'))
     address = models.TextField(verbose_name=_('Address'))
     property_type = models.CharField(max_length=30, default='residential', verbose_name=_('Property Type'))
@@ -20,23 +140,67 @@ class Property(HubBaseModel):
     monthly_rent = models.DecimalField(max_digits=10, decimal_places=2, default='0', verbose_name=_('Monthly Rent'))
     status = models.CharField(max_length=20, default='available', choices=PROP_STATUS, verbose_name=_('Status'))
     is_active = models.BooleanField(default=True, verbose_name=_('Is Active'))
+    current_lease = models.ForeignKey(
+        'Lease', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+',
+        verbose_name=_('Current Lease'), help_text=_('Active lease covering today, kept in sync from leases'),
+    )
+    search_document = models.TextField(blank=True, default='', editable=False)
+    name_key = SortKeyField('name')
+    area_is_null = models.GeneratedField(
+        expression=Q(area_sqm__isnull=True), output_field=models.BooleanField(), db_persist=True,
+    )
+    area_key = models.GeneratedField(
+        expression=Coalesce('area_sqm', Value(Decimal('0'))),
+        output_field=models.DecimalField(max_digits=8, decimal_places=2), db_persist=True,
+    )
 
     class Meta(HubBaseModel.Meta):
         db_table = 'property_mgmt_property'
+        indexes = [
+            models.Index(fields=['hub_id', 'name_key', 'id'], condition=Q(is_deleted=False), name='pm_prop_hub_namekey_idx'),
+            models.Index(fields=['hub_id', 'status', 'id'], condition=Q(is_deleted=False), name='pm_prop_hub_status_idx'),
+            models.Index(fields=['hub_id', 'is_active', 'id'], condition=Q(is_deleted=False), name='pm_prop_hub_active_idx'),
+            models.Index(fields=['hub_id', 'monthly_rent', 'id'], condition=Q(is_deleted=False), name='pm_prop_hub_rent_idx'),
+            models.Index(
+                fields=['hub_id', 'area_is_null', 'area_key', 'id'], condition=Q(is_deleted=False),
+                name='pm_prop_hub_areakey_idx',
+            ),
+            models.Index(
+                fields=['hub_id', 'area_is_null', '-area_key', '-id'], condition=Q(is_deleted=False),
+                name='pm_prop_hub_areakey_desc_idx',
+            ),
+            models.Index(fields=['hub_id', 'bathrooms', 'id'], condition=Q(is_deleted=False), name='pm_prop_hub_baths_idx'),
+            models.Index(fields=['hub_id', 'created_at', 'id'], condition=Q(is_deleted=False), name='pm_prop_hub_created_idx'),
+            models.Index(fields=['hub_id', 'deleted_at'], condition=Q(is_deleted=True), name='pm_prop_hub_deleted_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class Tenant(HubBaseModel):
+class Tenant(SortKeyMixin, SearchableMixin, HubBaseModel):
+    SEARCH_FIELDS = ('name', 'email', 'phone', 'id_number')
+    SEARCH_IDENTIFIER_FIELDS = ('phone', 'id_number')
+
     name = models.CharField(max_length=255, verbose_name=_('Name'))
     email = models.EmailField(blank=True, verbose_name=_('Email'))
     phone = models.CharField(max_length=50, blank=True, verbose_name=_('Phone'))
     id_number = models.CharField(max_length=30, blank=True, verbose_name=_('Id Number'))
     is_active = models.BooleanField(default=True, verbose_name=_('Is Active'))
+    search_document = models.TextField(blank=True, default='', editable=False)
+    name_key = SortKeyField('name')
 
     class Meta(HubBaseModel.Meta):
         db_table = 'property_mgmt_tenant'
+        indexes = [
+            models.Index(fields=['hub_id', 'name_key', 'id'], condition=Q(is_deleted=False), name='pm_ten_hub_namekey_idx'),
+            models.Index(fields=['hub_id', 'is_active', 'id'], condition=Q(is_deleted=False), name='pm_ten_hub_active_idx'),
+            models.Index(fields=['hub_id', 'email', 'id'], condition=Q(is_deleted=False), name='pm_ten_hub_email_idx'),
+            models.Index(fields=['hub_id', 'phone', 'id'], condition=Q(is_deleted=False), name='pm_ten_hub_phone_idx'),
+            models.Index(fields=['hub_id', 'id_number', 'id'], condition=Q(is_deleted=False), name='pm_ten_hub_idnum_idx'),
+            models.Index(fields=['hub_id', 'created_at', 'id'], condition=Q(is_deleted=False), name='pm_ten_hub_created_idx'),
+            models.Index(fields=['hub_id', 'deleted_at'], condition=Q(is_deleted=True), name='pm_ten_hub_deleted_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -49,11 +213,355 @@ class Lease(HubBaseModel):
     end_date = models.DateField(null=True, blank=True, verbose_name=_('End Date'))
     monthly_rent = models.DecimalField(max_digits=10, decimal_places=2, verbose_name=_('Monthly Rent'))
     deposit = models.DecimalField(max_digits=10, decimal_places=2, default='0', verbose_name=_('Deposit'))
-    status = models.CharField(max_length=20, default='active', verbose_name=_('Status'))
+    status = models.CharField(max_length=20, default='active', choices=LEASE_STATUS, verbose_name=_('Status'))
 
     class Meta(HubBaseModel.Meta):
         db_table = 'property_mgmt_lease'
+        indexes = [
+            models.Index(fields=['property', 'start_date', 'end_date'], condition=Q(is_deleted=False), name='pm_lease_prop_dates_idx'),
+            models.Index(fields=['tenant', 'start_date'], condition=Q(is_deleted=False), name='pm_lease_tenant_start_idx'),
+            models.Index(fields=['hub_id', 'status', 'end_date'], condition=Q(is_deleted=False), name='pm_lease_hub_status_idx'),
+            models.Index(fields=['hub_id', 'start_date'], condition=Q(is_deleted=False), name='pm_lease_hub_start_idx'),
+            models.Index(fields=['hub_id', 'end_date'], condition=Q(is_deleted=False), name='pm_lease_hub_end_idx'),
+            models.Index(fields=['hub_id', 'deleted_at'], condition=Q(is_deleted=True), name='pm_lease_hub_deleted_idx'),
+        ]
 
     def __str__(self):
         return str(self.id)
 
+
+
+class RentCharge(HubBaseModel):
+    """Rent billed for a lease in a monthly period, prorated for partial months."""
+    lease = models.ForeignKey('Lease', on_delete=models.CASCADE, related_name='charges')
+    period = models.DateField(verbose_name=_('Period'), help_text=_('First day of the billed month'))
+    period_start = models.DateField(verbose_name=_('From'))
+    period_end = models.DateField(verbose_name=_('To'))
+    days = models.PositiveSmallIntegerField(verbose_name=_('Billed Days'))
+    amount = models.DecimalField(max_digits=10, decimal_places=2, verbose_name=_('Amount'))
+    status = models.CharField(max_length=20, default='open', choices=CHARGE_STATUS, verbose_name=_('Status'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'property_mgmt_rent_charge'
+        constraints = [
+            models.UniqueConstraint(fields=['lease', 'period'], name='pm_charge_lease_period_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['hub_id', 'period'], condition=Q(is_deleted=False), name='pm_charge_hub_period_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.lease_id} {self.period:%Y-%m}'
+
+
+class LedgerEntry(HubBaseModel):
+    """
+    One posting to a lease's account, written through ``ledger.py``.
+    ``amount`` is signed: positive debits (charges), negative credits
+    (payments). ``running_debits`` is the lease's total debits up to and
+    including this entry, which lets arrears be dated with one index seek.
+    """
+    lease = models.ForeignKey('Lease', on_delete=models.CASCADE, related_name='ledger_entries')
+    tenant = models.ForeignKey('Tenant', on_delete=models.CASCADE, related_name='ledger_entries')
+    kind = models.CharField(max_length=20, choices=LEDGER_KIND, verbose_name=_('Kind'))
+    posted_on = models.DateField(verbose_name=_('Date'))
+    amount = models.DecimalField(max_digits=12, decimal_places=2, verbose_name=_('Amount'))
+    running_debits = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
+    charge = models.OneToOneField(
+        'RentCharge', on_delete=models.SET_NULL, null=True, blank=True, related_name='ledger_entry',
+    )
+    reference = models.CharField(max_length=100, blank=True, verbose_name=_('Reference'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'property_mgmt_ledger_entry'
+        indexes = [
+            models.Index(fields=['lease', 'created_at'], name='pm_ledger_lease_created_idx'),
+            models.Index(
+                fields=['lease', 'running_debits'], condition=Q(amount__gt=0, is_deleted=False),
+                name='pm_ledger_lease_debits_idx',
+            ),
+            models.Index(fields=['tenant', 'posted_on'], name='pm_ledger_tenant_posted_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.lease_id} {self.posted_on} {self.amount}'
+
+
+class EscalationRule(HubBaseModel):
+    """
+    How a lease's rent is reviewed, applied by ``escalation.py`` whenever
+    ``next_review_date`` is due: a fixed percentage, the change in a CPI
+    series (optionally floored and capped), or the next rent of a step
+    schedule.
+    """
+    lease = models.OneToOneField('Lease', on_delete=models.CASCADE, related_name='escalation_rule')
+    kind = models.CharField(max_length=10, choices=ESCALATION_KIND, verbose_name=_('Kind'))
+    percent = models.DecimalField(max_digits=6, decimal_places=3, null=True, blank=True, verbose_name=_('Increase %'))
+    index_name = models.CharField(max_length=30, blank=True, verbose_name=_('CPI Series'))
+    floor_percent = models.DecimalField(max_digits=6, decimal_places=3, null=True, blank=True, verbose_name=_('Floor %'))
+    cap_percent = models.DecimalField(max_digits=6, decimal_places=3, null=True, blank=True, verbose_name=_('Cap %'))
+    steps = models.JSONField(default=list, blank=True, verbose_name=_('Step Rents'), help_text=_('Rent for each successive review'))
+    interval_months = models.PositiveSmallIntegerField(default=12, verbose_name=_('Review Every (Months)'))
+    next_review_date = models.DateField(verbose_name=_('Next Review'))
+    reviews_applied = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_('Reviews Applied'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'property_mgmt_escalation_rule'
+        indexes = [
+            models.Index(fields=['hub_id', 'next_review_date'], condition=Q(is_deleted=False), name='pm_escal_hub_review_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.lease_id} {self.kind}'
+
+
+class RentHistory(HubBaseModel):
+    """One rent change of a lease; ``run_id`` groups the rows of one escalation run."""
+    lease = models.ForeignKey('Lease', on_delete=models.CASCADE, related_name='rent_history')
+    rule = models.ForeignKey('EscalationRule', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    effective_date = models.DateField(verbose_name=_('Effective Date'))
+    old_rent = models.DecimalField(max_digits=10, decimal_places=2, verbose_name=_('Old Rent'))
+    new_rent = models.DecimalField(max_digits=10, decimal_places=2, verbose_name=_('New Rent'))
+    reason = models.CharField(max_length=10, choices=ESCALATION_KIND, verbose_name=_('Reason'))
+    run_id = models.UUIDField(verbose_name=_('Run'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'property_mgmt_rent_history'
+        constraints = [
+            models.UniqueConstraint(fields=['lease', 'effective_date'], name='pm_rent_hist_lease_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['run_id', 'lease'], name='pm_rent_hist_run_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.lease_id} {self.effective_date}: {self.old_rent} -> {self.new_rent}'
+
+
+class RenewalTask(HubBaseModel):
+    """A lease coming up for renewal, created by the renewal scheduler (``renewals.py``)."""
+    lease = models.ForeignKey('Lease', on_delete=models.CASCADE, related_name='renewal_tasks')
+    due_date = models.DateField(verbose_name=_('Due Date'), help_text=_('Lease end date the task was raised for'))
+    status = models.CharField(max_length=20, default='open', choices=RENEWAL_STATUS, verbose_name=_('Status'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'property_mgmt_renewal_task'
+        constraints = [
+            models.UniqueConstraint(fields=['lease', 'due_date'], name='pm_renewal_lease_due_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['hub_id', 'status', 'due_date'], condition=Q(is_deleted=False), name='pm_renewal_hub_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.lease_id} {self.due_date}'
+
+
+class BulkActionLog(HubBaseModel):
+    """One audit row per bulk action on a datatable."""
+    model_name = models.CharField(max_length=50, verbose_name=_('Model'))
+    action = models.CharField(max_length=20, verbose_name=_('Action'))
+    selection = models.CharField(max_length=10, choices=BULK_SELECTION, verbose_name=_('Selection'))
+    criteria = models.JSONField(default=dict, blank=True, verbose_name=_('Criteria'))
+    affected = models.PositiveIntegerField(default=0, verbose_name=_('Affected Rows'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'property_mgmt_bulk_action_log'
+        indexes = [
+            models.Index(fields=['hub_id', 'created_at'], name='pm_bulk_log_hub_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.action} {self.model_name} ({self.affected})'
+
+
+class OccupancySpan(models.Model):
+    """
+    Date range an active lease occupies its property, kept in sync with
+    ``Lease`` by ``availability.py``. Open-ended leases end on ``date.max``
+    so range checks never need an ``IS NULL`` branch.
+    """
+    lease = models.OneToOneField('Lease', on_delete=models.CASCADE, primary_key=True, related_name='occupancy_span')
+    hub_id = models.UUIDField(null=True, blank=True)
+    property = models.ForeignKey('Property', on_delete=models.CASCADE, related_name='occupancy_spans')
+    start_date = models.DateField()
+    end_date = models.DateField()
+
+    class Meta:
+        db_table = 'property_mgmt_occupancy_span'
+        indexes = [
+            models.Index(fields=['property', 'start_date', 'end_date'], name='pm_span_prop_dates_idx'),
+            models.Index(fields=['hub_id', 'start_date', 'end_date'], name='pm_span_hub_dates_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.property_id} {self.start_date}..{self.end_date}'
+
+
+class RenewalWatermark(models.Model):
+    """
+    How far the renewal scheduler has scanned a hub: leases ending up to
+    ``scanned_through`` have tasks, as of ``last_run_at``.
+    """
+    hub_id = models.UUIDField(unique=True)
+    scanned_through = models.DateField()
+    last_run_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'property_mgmt_renewal_watermark'
+
+    def __str__(self):
+        return f'{self.hub_id} {self.scanned_through}'
+
+
+class LeaseBalance(models.Model):
+    """
+    Materialized account of a lease, maintained by ``ledger.py`` on every
+    posting. ``arrears_since`` is the date of the oldest charge not yet
+    covered by credits, or ``None`` when the lease is paid up.
+    """
+    lease = models.OneToOneField('Lease', on_delete=models.CASCADE, primary_key=True, related_name='balance')
+    hub_id = models.UUIDField(null=True, blank=True)
+    tenant = models.ForeignKey('Tenant', on_delete=models.CASCADE, related_name='lease_balances')
+    debits = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credits = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    arrears_since = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'property_mgmt_lease_balance'
+        indexes = [
+            models.Index(
+                fields=['hub_id', 'arrears_since'], condition=Q(arrears_since__isnull=False),
+                name='pm_lease_bal_arrears_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.lease_id}: {self.balance}'
+
+
+class TenantBalance(models.Model):
+    """A tenant's balance over all their leases; ``arrears_since`` is the oldest of theirs."""
+    tenant = models.OneToOneField('Tenant', on_delete=models.CASCADE, primary_key=True, related_name='balance')
+    hub_id = models.UUIDField(null=True, blank=True)
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    arrears_since = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'property_mgmt_tenant_balance'
+        indexes = [
+            models.Index(
+                fields=['hub_id', 'arrears_since'], condition=Q(arrears_since__isnull=False),
+                name='pm_tenant_bal_arrears_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.tenant_id}: {self.balance}'
+
+
+class CPIIndex(models.Model):
+    """Monthly value of a consumer price index series, used by CPI escalation rules."""
+    index_name = models.CharField(max_length=30)
+    period = models.DateField(help_text=_('First day of the month'))
+    value = models.DecimalField(max_digits=10, decimal_places=3)
+
+    class Meta:
+        db_table = 'property_mgmt_cpi_index'
+        constraints = [
+            models.UniqueConstraint(fields=['index_name', 'period'], name='pm_cpi_name_period_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.index_name} {self.period:%Y-%m}: {self.value}'
+
+
+class SearchToken(models.Model):
+    """Word token side index used by the ``tokens`` search backend."""
+    hub_id = models.UUIDField(null=True, blank=True)
+    model_name = models.CharField(max_length=20)
+    object_id = models.UUIDField(db_index=True)
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        db_table = 'property_mgmt_search_token'
+        indexes = [
+            models.Index(fields=['hub_id', 'model_name', 'token', 'object_id'], name='pm_search_token_idx'),
+        ]
+
+    def __str__(self):
+        return self.token
+
+
+class ModuleSettings(models.Model):
+    """
+    Per-hub configuration of the module, edited on its settings page. Read
+    it through ``config.get_hub_settings``, which caches it: a save shows
+    at once on the worker that made it, and on the other workers only once
+    their local copy expires (``PROPERTY_MGMT_SETTINGS_LOCAL_TTL`` seconds,
+    default 10).
+    """
+    hub_id = models.UUIDField(unique=True)
+    default_page_size = models.PositiveSmallIntegerField(
+        default=10, choices=PAGE_SIZES, verbose_name=_('Rows per Page'),
+    )
+    currency = models.CharField(max_length=3, default='EUR', verbose_name=_('Currency'), help_text=_('ISO 4217 code'))
+    billing_day = models.PositiveSmallIntegerField(
+        default=1, validators=[MinValueValidator(1), MaxValueValidator(28)], verbose_name=_('Billing Day'),
+        help_text=_('Day of the month rent falls due'),
+    )
+    search_backend = models.CharField(
+        max_length=10, blank=True, default='', choices=SEARCH_BACKEND_CHOICES, verbose_name=_('Search'),
+    )
+    export_max_rows = models.PositiveIntegerField(
+        null=True, blank=True, validators=[MinValueValidator(1)], verbose_name=_('Export Row Limit'),
+        help_text=_('Leave empty for no limit'),
+    )
+    retention_days = models.PositiveIntegerField(
+        default=default_retention_days, validators=[MinValueValidator(1)], verbose_name=_('Keep Deleted Rows (Days)'),
+        help_text=_('Deleted properties, tenants and leases are archived and removed after this many days'),
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'property_mgmt_settings'
+
+    def __str__(self):
+        return str(self.hub_id)
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """``DjangoJSONEncoder`` keeping microseconds, so restored timestamps sort as before."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ArchivedRow(models.Model):
+    """
+    A soft-deleted property, tenant or lease purged by ``retention.py``,
+    kept as its column values so ``restore_archived`` can put it back.
+    """
+    hub_id = models.UUIDField(null=True, blank=True)
+    model_name = models.CharField(max_length=20)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField()
+    data = models.JSONField(encoder=ArchiveEncoder)
+
+    class Meta:
+        db_table = 'property_mgmt_archived_row'
+        constraints = [
+            models.UniqueConstraint(fields=['model_name', 'object_id'], name='pm_archive_object_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['hub_id', 'model_name', 'archived_at'], name='pm_archive_hub_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.model_name} {self.object_id}'
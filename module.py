@@ -19,6 +19,7 @@ NAVIGATION = [
 {'label': _('Properties'), 'icon': 'home-outline', 'id': 'properties'},
 {'label': _('Tenants'), 'icon': 'people-outline', 'id': 'tenants'},
 {'label': _('Leases'), 'icon': 'document-text-outline', 'id': 'leases'},
+{'label': _('Analytics'), 'icon': 'stats-chart-outline', 'id': 'analytics'},
 {'label': _('Settings'), 'icon': 'settings-outline', 'id': 'settings'},
 ]
 
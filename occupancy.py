@@ -0,0 +1,151 @@
+"""
+Property status derived from leases.
+
+A property is ``rented`` while an active lease covers today and
+``available`` otherwise; ``Property.current_lease`` points at that lease.
+``maintenance`` and ``sold`` are set by hand and never overwritten, though
+``current_lease`` is still maintained for them.
+
+Two paths keep this true:
+
+- lease writes refresh the affected properties right away (``signals.py``)
+- ``reconcile_statuses`` runs nightly (``property_mgmt_reconcile_status``)
+  for changes caused by the calendar alone: leases that started or expired
+  overnight. It also marks active leases past their end date as ``ended``.
+  Properties are read in keyset chunks and only changed rows are written.
+"""
+import time
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .counts import invalidate_counts
+from .leasing import OCCUPYING_STATUSES
+from .models import Lease, OccupancySpan, Property
+from .search import build_search_document, get_search_backend
+from .signals import bulk_updated
+
+RECONCILE_CHUNK_SIZE = 2000
+
+# Statuses a user sets by hand; everything else is derived.
+MANUAL_STATUSES = ('maintenance', 'sold')
+
+ReconcileResult = namedtuple('ReconcileResult', ['hub_id', 'properties', 'updated', 'expired_leases', 'seconds'])
+
+
+def derive_status(current_status, current_lease_id):
+    if current_status in MANUAL_STATUSES:
+        return current_status
+    return 'rented' if current_lease_id else 'available'
+
+
+def _covering_span(as_of):
+    return OccupancySpan.objects.filter(property_id=OuterRef('pk'), start_date__lte=as_of, end_date__gte=as_of)
+
+
+def current_leases(property_ids, as_of=None):
+    """``{property_id: lease_id}`` for the properties with a lease covering ``as_of``."""
+    as_of = as_of or timezone.localdate()
+    return dict(
+        OccupancySpan.objects.filter(property_id__in=property_ids, start_date__lte=as_of, end_date__gte=as_of)
+        .values_list('property_id', 'lease_id')
+    )
+
+
+def refresh_property(property_id, as_of=None):
+    """Bring one property's status and ``current_lease`` up to date. Returns whether it changed."""
+    prop = Property.all_objects.filter(pk=property_id).first()
+    if prop is None:
+        return False
+    lease_id = current_leases([property_id], as_of).get(property_id)
+    status = derive_status(prop.status, lease_id)
+    if status == prop.status and lease_id == prop.current_lease_id:
+        return False
+    prop.status = status
+    prop.current_lease_id = lease_id
+    prop.save(update_fields=['status', 'current_lease', 'updated_at'])
+    return True
+
+
+def expire_leases(hub_id=None, as_of=None):
+    """Mark active leases that ended before ``as_of`` as ``ended``. Returns the count."""
+    as_of = as_of or timezone.localdate()
+    qs = Lease.objects.filter(status__in=OCCUPYING_STATUSES, end_date__lt=as_of)
+    if hub_id is not None:
+        qs = qs.filter(hub_id=hub_id)
+    lease_ids = list(qs.values_list('pk', flat=True))
+    if not lease_ids:
+        return 0
+    with transaction.atomic():
+        Lease.objects.filter(pk__in=lease_ids).update(status='ended', updated_at=timezone.now())
+        OccupancySpan.objects.filter(lease_id__in=lease_ids).delete()
+    return len(lease_ids)
+
+
+def _iter_chunks(qs, chunk_size):
+    last_pk = None
+    while True:
+        page = qs.order_by('pk') if last_pk is None else qs.filter(pk__gt=last_pk).order_by('pk')
+        rows = list(page[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1].pk
+
+
+def reconcile_hub(hub_id, as_of=None, chunk_size=RECONCILE_CHUNK_SIZE):
+    """Reconcile one hub's leases and property statuses with the calendar."""
+    as_of = as_of or timezone.localdate()
+    started = time.perf_counter()
+    expired = expire_leases(hub_id, as_of)
+    backend = get_search_backend()
+    now = timezone.now()
+    seen = updated = 0
+    qs = Property.objects.filter(hub_id=hub_id).only('hub_id', 'status', 'current_lease', *Property.SEARCH_FIELDS)
+    for props in _iter_chunks(qs, chunk_size):
+        seen += len(props)
+        leases = current_leases([p.pk for p in props], as_of)
+        by_status, moved, restatused = defaultdict(list), [], []
+        for prop in props:
+            lease_id = leases.get(prop.pk)
+            status = derive_status(prop.status, lease_id)
+            if status != prop.status:
+                prop.status = status
+                prop.search_document = build_search_document(prop)
+                by_status[status].append(prop.pk)
+                restatused.append(prop)
+            elif lease_id == prop.current_lease_id:
+                continue
+            moved.append(prop.pk)
+        if not moved:
+            continue
+        # Set-based writes: one UPDATE per target status and one correlated
+        # UPDATE for the lease pointer. Only the search document differs per
+        # row, so it is the only column left to bulk_update's CASE.
+        with transaction.atomic():
+            for status, ids in by_status.items():
+                Property.objects.filter(pk__in=ids).update(status=status)
+            Property.objects.filter(pk__in=moved).update(
+                current_lease=Subquery(_covering_span(as_of).values('lease_id')[:1]), updated_at=now,
+            )
+            Property.objects.bulk_update(restatused, ['search_document'], batch_size=chunk_size)
+            backend.index_many(restatused, batch_size=chunk_size)
+        updated += len(moved)
+    if updated or expired:
+        bulk_updated.send(sender=Property, hub_id=hub_id)
+    if expired:
+        # Not bulk_updated: its Lease receiver would rebuild the timeline and
+        # reconcile the hub again, though expire_leases already dropped the spans.
+        invalidate_counts(hub_id, Lease)
+    return ReconcileResult(hub_id, seen, updated, expired, round(time.perf_counter() - started, 3))
+
+
+def reconcile_statuses(hub_id=None, as_of=None, chunk_size=RECONCILE_CHUNK_SIZE):
+    """Reconcile one hub, or every hub with properties when ``hub_id`` is ``None``."""
+    if hub_id is not None:
+        hub_ids = [hub_id]
+    else:
+        hub_ids = list(Property.objects.order_by().values_list('hub_id', flat=True).distinct())
+    return [reconcile_hub(h, as_of, chunk_size) for h in hub_ids]
@@ -0,0 +1,210 @@
+"""
+Keyset (cursor) pagination for the property management datatables.
+
+Offset pagination runs ``COUNT(*)`` plus an ``OFFSET`` scan on every page,
+which degrades linearly on deep pages of large hubs. ``KeysetPaginator``
+instead seeks on the ``(sort field, id)`` tuple of the last row seen and
+hands back opaque, signed cursors for the next/previous page. The total
+count is only computed when explicitly requested.
+
+Every list sort is ``(sort column, id)``, so rows with equal sort values
+keep one order across pages. Columns whose plain values sort badly are
+sorted on a key column instead: names on ``name_key``, their ``sort_key``,
+which ignores case, accents and spacing. A nullable number sorts on a
+non-null generated key led by a generated null flag
+(``Property.SORT_NULL_FLAGS``). The flag stays ascending whichever way the
+key sorts, so NULLs come last in both directions. The keys have
+``(hub_id, [flag,] key, id)`` indexes, so pages are index range scans.
+Nullable columns without a key are ordered NULLS LAST ascending and NULLS
+FIRST descending.
+"""
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+from .search import normalize
+
+CURSOR_SALT = 'property_mgmt.cursor'
+
+SORT_KEY_LENGTH = 255
+
+
+def sort_key(text):
+    """Case-folded, accent-stripped form of ``text`` that names are sorted on."""
+    return normalize(text).casefold()[:SORT_KEY_LENGTH]
+
+
+def sort_model_field(model, sort_field):
+    """The field values of ``sort_field`` are parsed and compared with."""
+    field = model._meta.get_field(sort_field)
+    return field.output_field if field.generated else field
+
+
+def sort_columns(model, sort_field, descending=False):
+    """``[(column, descending), ...]`` sorted on for ``sort_field``."""
+    flag = getattr(model, 'SORT_NULL_FLAGS', {}).get(sort_field)
+    return ([(flag, False)] if flag else []) + [(sort_field, descending), ('id', descending)]
+
+
+def sort_ordering(model, sort_field, descending=False, reverse=False):
+    """``order_by()`` arguments for the sort, or its exact reverse."""
+    nullable = sort_model_field(model, sort_field).null
+    ordering = []
+    for column, desc in sort_columns(model, sort_field, descending):
+        desc = desc != reverse
+        col = F(column)
+        if nullable and column == sort_field:
+            col = col.desc(nulls_first=True) if desc else col.asc(nulls_last=True)
+        else:
+            col = col.desc() if desc else col.asc()
+        ordering.append(col)
+    return ordering
+
+
+def encode_cursor(sort_field, sort_dir, direction, values):
+    """Serialize a page boundary into an opaque URL-safe token."""
+    payload = {
+        's': sort_field,
+        'd': sort_dir,
+        'p': direction,
+        'v': [None if v is None else str(v) for v in values],
+    }
+    return signing.dumps(payload, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token, sort_field, sort_dir):
+    """
+    Return ``(direction, raw_values)`` for a token, or ``None`` if the token
+    is missing, tampered with, or was issued for a different sort order.
+    """
+    if not token:
+        return None
+    try:
+        payload = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    if payload.get('s') != sort_field or payload.get('d') != sort_dir:
+        return None
+    if payload.get('p') not in ('next', 'prev'):
+        return None
+    return payload['p'], payload.get('v') or []
+
+
+def _after_q(column, value, descending, nullable):
+    # NULLs order after every value (NULLS LAST ascending, NULLS FIRST descending).
+    if value is None:
+        return Q(**{f'{column}__isnull': False}) if descending and nullable else None
+    q = Q(**{f'{column}__{"lt" if descending else "gt"}': value})
+    return q | Q(**{f'{column}__isnull': True}) if nullable and not descending else q
+
+
+def _seek_q(columns, values, nullable):
+    """
+    Rows strictly after ``values`` in the order of ``columns``, a list of
+    ``(column, descending)``; ``nullable`` names the columns that hold NULLs.
+    """
+    q = None
+    for (column, descending), value in reversed(list(zip(columns, values))):
+        after = _after_q(column, value, descending, column in nullable)
+        if q is not None:
+            same = Q(**{f'{column}__isnull': True}) if value is None else Q(**{column: value})
+            q = same & q if after is None else after | (same & q)
+        else:
+            q = after
+    return q
+
+
+class CursorPage:
+    """A page of results plus the tokens needed to move around it."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+class KeysetPaginator:
+    """
+    Paginate ``queryset`` by seeking on its ``sort_columns``.
+
+    ``count`` is evaluated lazily and only when accessed, so templates that
+    don't ask for the total never pay for ``COUNT(*)``. ``counter(queryset)``
+    replaces the plain ``COUNT(*)``, e.g. with a cached count.
+    """
+
+    def __init__(self, queryset, sort_field, sort_dir='asc', per_page=10, counter=None):
+        self.queryset = queryset
+        self.sort_field = sort_field
+        self.sort_dir = 'desc' if sort_dir == 'desc' else 'asc'
+        self.per_page = per_page
+        self.columns = sort_columns(queryset.model, sort_field, self.sort_dir == 'desc')
+        self.fields = [sort_model_field(queryset.model, column) for column, _ in self.columns]
+        self.nullable = {column for (column, _), field in zip(self.columns, self.fields) if field.null}
+        self.counter = counter
+        self._count = None
+
+    @property
+    def count(self):
+        if self._count is None:
+            if self.counter is not None:
+                self._count = self.counter(self.queryset)
+            else:
+                self._count = self.queryset.order_by().count()
+        return self._count
+
+    def _key(self, obj):
+        return [getattr(obj, column) for column, _ in self.columns]
+
+    def _parse(self, raw_values):
+        if len(raw_values) != len(self.fields):
+            raise ValueError('Malformed cursor')
+        return [None if value is None else field.to_python(value) for field, value in zip(self.fields, raw_values)]
+
+    def get_page(self, cursor=None):
+        descending = self.sort_dir == 'desc'
+        decoded = decode_cursor(cursor, self.sort_field, self.sort_dir)
+        direction, boundary = 'next', None
+        if decoded is not None:
+            try:
+                boundary = self._parse(decoded[1])
+                direction = decoded[0]
+            except (ValueError, TypeError, ValidationError):
+                boundary = None
+
+        backwards = boundary is not None and direction == 'prev'
+        qs = self.queryset.order_by(*sort_ordering(self.queryset.model, self.sort_field, descending, backwards))
+        if boundary is not None:
+            columns = [(column, desc != backwards) for column, desc in self.columns]
+            qs = qs.filter(_seek_q(columns, boundary, self.nullable))
+
+        rows = list(qs[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, boundary is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(self.sort_field, self.sort_dir, 'next', self._key(rows[-1]))
+        if rows and has_previous:
+            previous_cursor = encode_cursor(self.sort_field, self.sort_dir, 'prev', self._key(rows[0]))
+        return CursorPage(rows, self, has_next, has_previous, next_cursor, previous_cursor)
@@ -0,0 +1,52 @@
+"""
+Concurrent database reads for the async views.
+
+Django's async ORM methods (``acount``, ``aaggregate``, ...) and the
+default ``sync_to_async`` are thread-sensitive: all of a request's calls
+run one after another on one thread and one connection, so
+``asyncio.gather`` over them overlaps nothing. ``aread(func, *args)``
+instead runs the sync ``func`` with ``thread_sensitive=False``, on a pool
+thread with its own connection, so gathered reads really run at the
+same time.
+
+Like Django around a request, each read closes its thread's connections
+that are unusable or past ``CONN_MAX_AGE`` before and after it runs.
+Reads on their own connection only see committed rows, so they suit
+autocommit requests (async views never run under ``ATOMIC_REQUESTS``).
+
+``PROPERTY_MGMT_CONCURRENT_READS`` turns this off (``False``) or forces it
+on (``True``). By default (``None``) it is on unless a database is an
+in-memory SQLite one, which other connections can't see (test runs).
+Reads that don't run concurrently go through plain ``sync_to_async``.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from .profiling import count_queries
+
+
+def concurrent_reads():
+    """Whether ``aread`` runs reads on their own threads and connections."""
+    enabled = getattr(settings, 'PROPERTY_MGMT_CONCURRENT_READS', None)
+    if enabled is not None:
+        return enabled
+    return not any(
+        connections[alias].vendor == 'sqlite' and connections[alias].is_in_memory_db() for alias in connections
+    )
+
+
+def _read(func, args, kwargs):
+    close_old_connections()
+    try:
+        with count_queries():
+            return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def aread(func, *args, **kwargs):
+    """Run the sync read ``func(*args, **kwargs)`` so it can overlap other reads."""
+    if not concurrent_reads():
+        return await sync_to_async(func)(*args, **kwargs)
+    return await sync_to_async(_read, thread_sensitive=False)(func, args, kwargs)
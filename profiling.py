@@ -0,0 +1,274 @@
+"""
+Opt-in per-view profiling.
+
+With ``PROPERTY_MGMT_PROFILING = True``, every view decorated with
+``@profiled`` records, per request: SQL query count, time spent in the
+database, template render time, total time and response size. Samples are
+folded into in-process histograms keyed by view name (one set per worker
+process; nothing is persisted) and served as JSON by ``views.profiling_view``.
+
+The request's sample lives in a context variable, which ``sync_to_async``
+carries into the thread an async view's queries and rendering run on.
+Queries are counted through ``execute_wrapper``, including those of
+concurrent reads (``parallel.aread``) on other threads. Render time covers the
+module's ``timed_render`` calls, a ``TemplateResponse`` rendered at the
+end of the view, and, for views whose return value ``htmx_view`` renders,
+the time after the view body returned (marked by ``@before_render``).
+Renders outside a profiled view are never wrapped.
+
+A request crossing any of ``PROPERTY_MGMT_PROFILING_THRESHOLDS`` is logged
+as a warning on the ``property_mgmt.profiling`` logger.
+
+With profiling off the decorator costs one settings lookup per request.
+"""
+import contextvars
+import inspect
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the total-time histogram buckets; the last is open-ended.
+TIME_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+DEFAULT_THRESHOLDS = {
+    'total_ms': 500,
+    'queries': 50,
+    'db_ms': 250,
+    'render_ms': 250,
+    'bytes': 1_000_000,
+}
+
+METRICS = ('total_ms', 'queries', 'db_ms', 'render_ms', 'bytes')
+
+_sample = contextvars.ContextVar('property_mgmt_profiling_sample', default=None)
+_lock = threading.Lock()
+_stats = {}
+
+
+def is_enabled():
+    return getattr(settings, 'PROPERTY_MGMT_PROFILING', False)
+
+
+def get_thresholds():
+    return {**DEFAULT_THRESHOLDS, **getattr(settings, 'PROPERTY_MGMT_PROFILING_THRESHOLDS', {})}
+
+
+class _Sample:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.body_returned = None
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed on a thread's connections for the whole request, so it
+        # may see queries of other requests sharing that thread.
+        if _sample.get() is not self:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.db_seconds += elapsed
+                self.queries += 1
+
+    def attach(self):
+        for alias in connections:
+            connections[alias].execute_wrappers.append(self)
+
+    def detach(self):
+        for alias in connections:
+            connections[alias].execute_wrappers.remove(self)
+
+    def view_returned(self):
+        if self.body_returned is not None:
+            self.render_seconds += time.perf_counter() - self.body_returned
+            self.body_returned = None
+
+    def render(self, response):
+        """Render a lazy response (``TemplateResponse``), timing it."""
+        if hasattr(response, 'render') and not response.is_rendered:
+            started = time.perf_counter()
+            response.render()
+            self.render_seconds += time.perf_counter() - started
+
+
+def count_queries():
+    """Context manager counting this thread's queries into the current profile, if any."""
+    stack = ExitStack()
+    sample = _sample.get()
+    if sample is not None:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(sample))
+    return stack
+
+
+def timed_render(request, template_name, context=None, **kwargs):
+    """``django.shortcuts.render``, timed into the current profile."""
+    sample = _sample.get()
+    if sample is None:
+        return render(request, template_name, context, **kwargs)
+    started = time.perf_counter()
+    try:
+        return render(request, template_name, context, **kwargs)
+    finally:
+        sample.render_seconds += time.perf_counter() - started
+
+
+def before_render(view_func):
+    """
+    Mark the end of a view body whose return value an outer decorator
+    (``htmx_view``) renders; the rest of the profiled call counts as render.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        result = view_func(request, *args, **kwargs)
+        sample = _sample.get()
+        if sample is not None:
+            sample.body_returned = time.perf_counter()
+        return result
+    return wrapper
+
+
+def _response_size(response):
+    if getattr(response, 'streaming', False):
+        return None
+    return len(response.content)
+
+
+def record(view_name, values):
+    """Fold one request's ``values`` (keyed by ``METRICS``) into the view's histogram."""
+    with _lock:
+        entry = _stats.get(view_name)
+        if entry is None:
+            entry = _stats[view_name] = {
+                'count': 0,
+                'buckets': [0] * (len(TIME_BUCKETS_MS) + 1),
+                'sum': dict.fromkeys(METRICS, 0),
+                'max': dict.fromkeys(METRICS, 0),
+                'samples': dict.fromkeys(METRICS, 0),
+            }
+        entry['count'] += 1
+        entry['buckets'][bisect_left(TIME_BUCKETS_MS, values['total_ms'])] += 1
+        for metric in METRICS:
+            value = values[metric]
+            if value is None:
+                continue
+            entry['sum'][metric] += value
+            entry['samples'][metric] += 1
+            entry['max'][metric] = max(entry['max'][metric], value)
+
+
+def get_profiles():
+    """Per-view histograms with averages and maxima, ordered by total time spent."""
+    labels = [f'<={bound}ms' for bound in TIME_BUCKETS_MS] + [f'>{TIME_BUCKETS_MS[-1]}ms']
+    with _lock:
+        views = []
+        for name, entry in _stats.items():
+            views.append({
+                'view': name,
+                'count': entry['count'],
+                'histogram': dict(zip(labels, entry['buckets'])),
+                'avg': {
+                    metric: round(entry['sum'][metric] / entry['samples'][metric], 2)
+                    for metric in METRICS if entry['samples'][metric]
+                },
+                'max': {metric: round(value, 2) for metric, value in entry['max'].items()},
+                'total_ms': round(entry['sum']['total_ms'], 2),
+            })
+    views.sort(key=lambda v: v['total_ms'], reverse=True)
+    return {'enabled': is_enabled(), 'thresholds': get_thresholds(), 'views': views}
+
+
+def reset_profiles():
+    with _lock:
+        _stats.clear()
+
+
+def _check_thresholds(view_name, values):
+    crossed = [
+        metric for metric, limit in get_thresholds().items()
+        if limit is not None and values.get(metric) is not None and values[metric] > limit
+    ]
+    if crossed:
+        logger.warning(
+            'Slow view %s (%s): %s ms total, %s queries, %s ms db, %s ms render, %s bytes',
+            view_name, ', '.join(crossed), *(
+                None if values[metric] is None else round(values[metric], 1) for metric in METRICS
+            ),
+        )
+
+
+def _finish(view_name, sample, started, response):
+    values = {
+        'total_ms': (time.perf_counter() - started) * 1000,
+        'queries': sample.queries,
+        'db_ms': sample.db_seconds * 1000,
+        'render_ms': sample.render_seconds * 1000,
+        'bytes': _response_size(response),
+    }
+    record(view_name, values)
+    _check_thresholds(view_name, values)
+
+
+def profiled(view_func):
+    """Record query, render and size metrics for ``view_func`` when profiling is on."""
+    view_name = view_func.__name__
+    if inspect.iscoroutinefunction(view_func):
+        return _profiled_async(view_func, view_name)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not is_enabled() or _sample.get() is not None:
+            return view_func(request, *args, **kwargs)
+        sample = _Sample()
+        token = _sample.set(sample)
+        started = time.perf_counter()
+        try:
+            with count_queries():
+                response = view_func(request, *args, **kwargs)
+                sample.view_returned()
+                sample.render(response)
+        finally:
+            _sample.reset(token)
+        _finish(view_name, sample, started, response)
+        return response
+    return wrapper
+
+
+def _profiled_async(view_func, view_name):
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if not is_enabled() or _sample.get() is not None:
+            return await view_func(request, *args, **kwargs)
+        sample = _Sample()
+        token = _sample.set(sample)
+        started = time.perf_counter()
+        try:
+            # Async ORM calls and sync_to_async run on one thread per
+            # request; count the queries on that thread's connections.
+            await sync_to_async(sample.attach)()
+            try:
+                response = await view_func(request, *args, **kwargs)
+                sample.view_returned()
+                await sync_to_async(sample.render)(response)
+            finally:
+                await sync_to_async(sample.detach)()
+        finally:
+            _sample.reset(token)
+        _finish(view_name, sample, started, response)
+        return response
+    return wrapper
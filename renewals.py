@@ -0,0 +1,176 @@
+"""
+Lease renewal scheduler.
+
+Every run raises a ``RenewalTask`` for each active lease ending within
+``PROPERTY_MGMT_RENEWAL_NOTICE_DAYS`` (default 60), hub by hub. A
+per-hub ``RenewalWatermark`` keeps runs incremental; each run reads two
+bounded ranges of the ``(hub_id, status, end_date)`` lease index:
+
+- leases ending after the watermark, up to the new horizon
+- leases ending between today and the watermark that were written since
+  the last run (new leases, or end dates moved into the window)
+
+Tasks are written with ``bulk_create`` in chunks, and the unique
+``(lease, due_date)`` constraint makes overlapping runs harmless. Each
+chunk is announced with ``renewal_tasks_created`` for whatever sends the
+notifications.
+
+``property_mgmt_renewals`` runs it from cron. Alternatively, set
+``PROPERTY_MGMT_RENEWAL_INTERVAL`` (seconds) to run it in a background
+thread of each web process, started by its first request.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections, transaction
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Lease, Property, RenewalTask, RenewalWatermark
+from .signals import renewal_tasks_created
+
+logger = logging.getLogger(__name__)
+
+RENEWAL_CHUNK_SIZE = 1000
+DEFAULT_NOTICE_DAYS = 60
+
+RenewalResult = namedtuple('RenewalResult', ['hub_id', 'candidates', 'created', 'seconds'])
+
+
+def get_notice_days():
+    return getattr(settings, 'PROPERTY_MGMT_RENEWAL_NOTICE_DAYS', DEFAULT_NOTICE_DAYS)
+
+
+def renewal_candidates(hub_id, as_of, horizon, watermark=None):
+    """
+    Active leases of a hub that may need a task: all those ending in
+    ``[as_of, horizon]`` without a watermark, otherwise only those beyond it
+    or written since its last run.
+    """
+    qs = Lease.objects.filter(hub_id=hub_id, is_deleted=False, status='active')
+    if watermark is None:
+        return qs.filter(end_date__gte=as_of, end_date__lte=horizon)
+    scanned = max(watermark.scanned_through, as_of - timedelta(days=1))
+    return qs.filter(
+        Q(end_date__gt=scanned, end_date__lte=horizon)
+        | Q(end_date__gte=as_of, end_date__lte=min(scanned, horizon), updated_at__gt=watermark.last_run_at)
+    )
+
+
+def _iter_chunks(qs, chunk_size):
+    last_id = None
+    while True:
+        page = qs.order_by('id')
+        if last_id is not None:
+            page = page.filter(id__gt=last_id)
+        rows = list(page.values_list('id', 'end_date')[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def schedule_renewals(hub_id, as_of=None, notice_days=None, chunk_size=RENEWAL_CHUNK_SIZE):
+    """Raise renewal tasks for one hub and advance its watermark."""
+    as_of = as_of or timezone.localdate()
+    notice_days = get_notice_days() if notice_days is None else notice_days
+    horizon = as_of + timedelta(days=notice_days)
+    started = time.perf_counter()
+    run_at = timezone.now()
+    candidates = created = 0
+    with transaction.atomic():
+        # Locks the hub's watermark so concurrent runners take turns.
+        watermark = RenewalWatermark.objects.select_for_update().filter(hub_id=hub_id).first()
+        for rows in _iter_chunks(renewal_candidates(hub_id, as_of, horizon, watermark), chunk_size):
+            candidates += len(rows)
+            existing = set(
+                RenewalTask.objects.filter(lease_id__in=[r[0] for r in rows]).values_list('lease_id', 'due_date')
+            )
+            tasks = [
+                RenewalTask(hub_id=hub_id, lease_id=lease_id, due_date=end_date)
+                for lease_id, end_date in rows if (lease_id, end_date) not in existing
+            ]
+            RenewalTask.objects.bulk_create(tasks, batch_size=chunk_size, ignore_conflicts=True)
+            if tasks:
+                # Tasks a concurrent run raised first were ignored: don't announce them twice.
+                inserted = set(RenewalTask.objects.filter(id__in=[t.id for t in tasks]).values_list('id', flat=True))
+                tasks = [t for t in tasks if t.id in inserted]
+            created += len(tasks)
+            if tasks:
+                transaction.on_commit(
+                    lambda tasks=tasks: renewal_tasks_created.send(sender=RenewalTask, hub_id=hub_id, tasks=tasks)
+                )
+        scanned_through = max(horizon, watermark.scanned_through) if watermark else horizon
+        RenewalWatermark.objects.update_or_create(
+            hub_id=hub_id, defaults={'scanned_through': scanned_through, 'last_run_at': run_at},
+        )
+    return RenewalResult(hub_id, candidates, created, round(time.perf_counter() - started, 3))
+
+
+def schedule_all_hubs(as_of=None, notice_days=None, chunk_size=RENEWAL_CHUNK_SIZE):
+    """Run ``schedule_renewals`` for every hub with properties."""
+    hub_ids = Property.objects.exclude(hub_id=None).order_by().values_list('hub_id', flat=True).distinct()
+    return [schedule_renewals(hub_id, as_of, notice_days, chunk_size) for hub_id in list(hub_ids)]
+
+
+class RenewalScheduler:
+    """Runs ``schedule_all_hubs`` every ``interval`` seconds in a daemon thread."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='property-mgmt-renewals', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self):
+        try:
+            return schedule_all_hubs()
+        except Exception:
+            logger.exception('Renewal scheduler run failed')
+            return []
+        finally:
+            # The thread's own connections; don't hold them between runs.
+            connections.close_all()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+
+_scheduler = None
+
+
+def start_scheduler():
+    """Start the in-process scheduler if ``PROPERTY_MGMT_RENEWAL_INTERVAL`` is set. Returns it, or ``None``."""
+    global _scheduler
+    interval = getattr(settings, 'PROPERTY_MGMT_RENEWAL_INTERVAL', None)
+    if not interval:
+        return None
+    if _scheduler is None:
+        _scheduler = RenewalScheduler(interval)
+        _scheduler.start()
+    return _scheduler
+
+
+@receiver(request_started, dispatch_uid='property_mgmt_renewal_scheduler')
+def start_scheduler_on_request(**kwargs):
+    # Web processes only: management commands never send request_started.
+    request_started.disconnect(dispatch_uid='property_mgmt_renewal_scheduler')
+    start_scheduler()
@@ -0,0 +1,253 @@
+"""
+Retention of soft-deleted rows.
+
+Deleting a property, tenant or lease only sets ``is_deleted``. Once a row
+has been deleted for longer than its hub's retention window
+(``ModuleSettings.retention_days``, else ``PROPERTY_MGMT_RETENTION_DAYS``,
+else ``DEFAULT_RETENTION_DAYS``), ``purge_expired`` copies its column
+values into ``ArchivedRow`` and removes it from its table.
+
+Rows are purged leases first, then tenants, then properties, in primary-key
+chunks of ``RETENTION_CHUNK_SIZE``, one transaction per chunk. A row is
+only purged when nothing that must outlive it still points at it
+(``RETENTION_BLOCKERS``): a lease keeps its charges, ledger entries and
+rent history, and a tenant or property is kept while any lease row, live
+or deleted, refers to it. The rows ``RETENTION_DEPENDENTS`` lists only
+make sense alongside their parent and are deleted with it. Parents go
+with one raw ``DELETE`` per chunk, since ``QuerySet.delete()`` would fetch
+every row to send ``post_delete``.
+
+``restore_archived`` puts archived rows back as live rows, restoring the
+archived property and tenant of a restored lease with it.
+"""
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .config import get_hub_settings
+from .models import (
+    ArchivedRow, EscalationRule, Lease, LeaseBalance, LedgerEntry, OccupancySpan, Property, RenewalTask, RentCharge,
+    RentHistory, SearchToken, Tenant, TenantBalance, sort_key_fields,
+)
+from .occupancy import derive_status
+from .search import build_search_document, get_search_backend
+from .signals import bulk_updated
+
+RETENTION_CHUNK_SIZE = 500
+
+# Purge order: a lease goes before the tenant and property it points at.
+RETENTION_MODELS = (Lease, Tenant, Property)
+
+# (model, field) pairs whose rows keep the row they point at from purging.
+RETENTION_BLOCKERS = {
+    Lease: ((RentCharge, 'lease'), (LedgerEntry, 'lease'), (RentHistory, 'lease')),
+    Tenant: ((Lease, 'tenant'), (LedgerEntry, 'tenant')),
+    Property: ((Lease, 'property'),),
+}
+
+# (model, field) pairs whose rows are deleted with the row they point at.
+RETENTION_DEPENDENTS = {
+    Lease: ((OccupancySpan, 'lease'), (LeaseBalance, 'lease'), (RenewalTask, 'lease'), (EscalationRule, 'lease')),
+    Tenant: ((TenantBalance, 'tenant'), (LeaseBalance, 'tenant')),
+    Property: ((OccupancySpan, 'property'),),
+}
+
+# Derived columns, rebuilt on restore rather than archived. Generated
+# columns are left out too.
+ARCHIVE_EXCLUDE = {'search_document', 'current_lease_id', 'name_key'}
+
+PurgeResult = namedtuple('PurgeResult', ['hub_id', 'leases', 'tenants', 'properties', 'seconds'])
+RestoreResult = namedtuple('RestoreResult', ['leases', 'tenants', 'properties', 'skipped', 'seconds'])
+
+
+def retention_days(hub_id):
+    """The hub's retention window in days."""
+    return get_hub_settings(hub_id).retention_days
+
+
+def expired_rows(model, hub_id, cutoff):
+    """Deleted ``model`` rows of the hub deleted before ``cutoff`` that nothing blocks."""
+    qs = model._base_manager.filter(hub_id=hub_id, is_deleted=True).filter(
+        Q(deleted_at__lt=cutoff) | Q(deleted_at__isnull=True, updated_at__lt=cutoff)
+    )
+    for related, field in RETENTION_BLOCKERS[model]:
+        qs = qs.filter(~Exists(related._base_manager.filter(**{field: OuterRef('pk')})))
+    return qs
+
+
+def _archive_fields(model):
+    return [f for f in model._meta.concrete_fields if f.attname not in ARCHIVE_EXCLUDE and not f.generated]
+
+
+def _delete_rows(model, ids):
+    conn = connections[model._base_manager.db]
+    qn = conn.ops.quote_name
+    pk = model._meta.pk
+    sql = 'DELETE FROM {} WHERE {} IN ({})'.format(
+        qn(model._meta.db_table), qn(pk.column), ', '.join(['%s'] * len(ids)),
+    )
+    with conn.cursor() as cursor:
+        cursor.execute(sql, [pk.get_db_prep_save(i, conn) for i in ids])
+
+
+def _purge_chunk(model, rows, now):
+    model_name = model._meta.model_name
+    ids = [row['id'] for row in rows]
+    ArchivedRow.objects.bulk_create([
+        ArchivedRow(
+            hub_id=row['hub_id'], model_name=model_name, object_id=row['id'],
+            deleted_at=row['deleted_at'], archived_at=now, data=row,
+        )
+        for row in rows
+    ])
+    for related, field in RETENTION_DEPENDENTS[model]:
+        related._base_manager.filter(**{f'{field}__in': ids}).delete()
+    if model is Lease:
+        Property._base_manager.filter(current_lease_id__in=ids).update(current_lease=None, updated_at=now)
+    else:
+        SearchToken.objects.filter(model_name=model_name, object_id__in=ids).delete()
+    _delete_rows(model, ids)
+
+
+def _cutoff(hub_id, as_of=None):
+    return (as_of or timezone.now()) - timedelta(days=retention_days(hub_id))
+
+
+def preview_purge(hub_id, as_of=None):
+    """
+    Count the rows ``purge_expired`` would take now, as a ``PurgeResult``.
+    Tenants and properties freed only by purging their leases aren't counted.
+    """
+    started = time.perf_counter()
+    cutoff = _cutoff(hub_id, as_of)
+    counts = [expired_rows(model, hub_id, cutoff).count() for model in RETENTION_MODELS]
+    return PurgeResult(hub_id, *counts, round(time.perf_counter() - started, 3))
+
+
+def purge_expired(hub_id, as_of=None, chunk_size=RETENTION_CHUNK_SIZE):
+    """Archive and remove the hub's expired soft-deleted rows. Returns a ``PurgeResult``."""
+    started = time.perf_counter()
+    now = timezone.now()
+    cutoff = _cutoff(hub_id, as_of)
+    purged = {}
+    for model in RETENTION_MODELS:
+        fields = [f.attname for f in _archive_fields(model)]
+        qs = expired_rows(model, hub_id, cutoff).order_by('pk').values(*fields)
+        purged[model] = 0
+        # Purged rows leave the queryset, so the next chunk is always its head.
+        while True:
+            with transaction.atomic():
+                rows = list(qs[:chunk_size])
+                if rows:
+                    _purge_chunk(model, rows, now)
+            if not rows:
+                break
+            purged[model] += len(rows)
+    if purged[Lease]:
+        bulk_updated.send(sender=Property, hub_id=hub_id, fields=['current_lease'])
+    return PurgeResult(
+        hub_id, purged[Lease], purged[Tenant], purged[Property], round(time.perf_counter() - started, 3),
+    )
+
+
+def hubs_with_deleted_rows():
+    hub_ids = set()
+    for model in RETENTION_MODELS:
+        hub_ids.update(model._base_manager.filter(is_deleted=True).values_list('hub_id', flat=True).distinct())
+    return sorted(hub_ids, key=str)
+
+
+def purge_all(as_of=None, chunk_size=RETENTION_CHUNK_SIZE):
+    """``purge_expired`` for every hub with soft-deleted rows. Returns a list of ``PurgeResult``."""
+    return [purge_expired(hub_id, as_of, chunk_size) for hub_id in hubs_with_deleted_rows()]
+
+
+def _insert_rows(model, objs):
+    # Raw executemany, as in escalation._insert_history: bulk_create would
+    # overwrite the archived created_at through auto_now_add.
+    conn = connections[model._base_manager.db]
+    qn = conn.ops.quote_name
+    fields = [f for f in model._meta.concrete_fields if not f.generated]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        qn(model._meta.db_table), ', '.join(qn(f.column) for f in fields), ', '.join(['%s'] * len(fields)),
+    )
+    with conn.cursor() as cursor:
+        cursor.executemany(sql, [
+            [f.get_db_prep_save(getattr(obj, f.attname), conn) for f in fields] for obj in objs
+        ])
+
+
+def _from_archive(model, archived, now):
+    obj = model(**{
+        f.attname: f.to_python(archived.data[f.attname])
+        for f in _archive_fields(model) if f.attname in archived.data
+    })
+    obj.is_deleted, obj.deleted_at, obj.updated_at = False, None, now
+    if model is Property:
+        # Its leases were purged first; restored leases set it again.
+        obj.status = derive_status(obj.status, None)
+    if hasattr(obj, 'SEARCH_FIELDS'):
+        obj.search_document = build_search_document(obj)
+    for field in sort_key_fields(model):
+        field.pre_save(obj, True)
+    return obj
+
+
+def restore_archived(hub_id, model_name=None, object_ids=None):
+    """
+    Put the hub's archived rows back as live rows: all of them, those of
+    ``model_name`` or those in ``object_ids``. A lease brings back its
+    archived property and tenant; one whose parents are gone is skipped.
+    Returns a ``RestoreResult``.
+    """
+    started = time.perf_counter()
+    now = timezone.now()
+    archive = ArchivedRow.objects.filter(hub_id=hub_id)
+    selected = archive
+    if model_name:
+        selected = selected.filter(model_name=model_name)
+    if object_ids:
+        selected = selected.filter(object_id__in=object_ids)
+
+    with transaction.atomic():
+        rows = {row.object_id: row for row in selected.select_for_update()}
+        parent_ids = {
+            row.data[field] for row in rows.values() if row.model_name == 'lease'
+            for field in ('property_id', 'tenant_id')
+        }
+        rows.update({row.object_id: row for row in archive.filter(object_id__in=parent_ids).select_for_update()})
+
+        restored, skipped = {}, 0
+        for model in reversed(RETENTION_MODELS):
+            objs = [
+                _from_archive(model, row, now) for row in rows.values() if row.model_name == model._meta.model_name
+            ]
+            if model is Lease:
+                present_properties = set(Property._base_manager.filter(
+                    pk__in=[o.property_id for o in objs]).values_list('pk', flat=True))
+                present_tenants = set(Tenant._base_manager.filter(
+                    pk__in=[o.tenant_id for o in objs]).values_list('pk', flat=True))
+                kept = [o for o in objs if o.property_id in present_properties and o.tenant_id in present_tenants]
+                skipped += len(objs) - len(kept)
+                objs = kept
+            _insert_rows(model, objs)
+            ArchivedRow.objects.filter(
+                model_name=model._meta.model_name, object_id__in=[o.pk for o in objs],
+            ).delete()
+            restored[model] = objs
+
+    for model in (Property, Tenant):
+        if restored[model]:
+            get_search_backend().index_many(restored[model], replace=False)
+            bulk_updated.send(sender=model, hub_id=hub_id)
+    if restored[Lease]:
+        # Rebuilds the occupancy timeline and re-derives property status.
+        bulk_updated.send(sender=Lease, hub_id=hub_id)
+    return RestoreResult(
+        len(restored[Lease]), len(restored[Tenant]), len(restored[Property]), skipped,
+        round(time.perf_counter() - started, 3),
+    )
@@ -0,0 +1,223 @@
+"""
+Pluggable search backends for the property and tenant datatables.
+
+Every searchable model keeps a normalized ``search_document`` column
+(lower-cased, accent-stripped concatenation of its ``SEARCH_FIELDS``),
+maintained on ``save()``. Backends then decide how to query it:
+
+- ``postgres``: substring ``LIKE`` on ``search_document`` served by a GIN
+  trigram index, ranked by trigram word similarity.
+- ``tokens``: a side table of word tokens per row, queried with indexed
+  prefix range scans and ranked by the number of exact token hits. Used on
+  backends without trigram support (SQLite, MySQL).
+- ``basic``: the original OR'd ``icontains`` filters, kept for comparison.
+
+The active backend comes from ``settings.PROPERTY_MGMT_SEARCH_BACKEND``
+(``'auto'`` by default, which picks ``postgres`` on PostgreSQL and
+``tokens`` everywhere else). ``postgres`` needs the ``pg_trgm`` extension
+for its ranking; where the migration couldn't create it, ``basic`` is
+used instead (the token side table isn't filled on PostgreSQL).
+"""
+import re
+import unicodedata
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+TOKEN_MAX_LENGTH = 64
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Lower-case, strip accents and collapse whitespace."""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+
+def build_search_document(obj):
+    """Normalized concatenation of ``obj.SEARCH_FIELDS``."""
+    return normalize(' '.join(str(getattr(obj, f) or '') for f in obj.SEARCH_FIELDS))
+
+
+def query_words(query):
+    return WORD_RE.findall(normalize(query))
+
+
+def tokenize(obj):
+    """
+    Distinct word tokens for ``obj`` plus compacted identifier values.
+
+    Reuses ``obj.search_document`` when set (it is maintained on save).
+    """
+    tokens = set(WORD_RE.findall(getattr(obj, 'search_document', '') or build_search_document(obj)))
+    for field in getattr(obj, 'SEARCH_IDENTIFIER_FIELDS', ()):
+        compact = ''.join(WORD_RE.findall(normalize(getattr(obj, field))))
+        if compact:
+            tokens.add(compact)
+    return {t[:TOKEN_MAX_LENGTH] for t in tokens}
+
+
+class BasicSearchBackend:
+    """OR'd ``icontains`` over the raw columns. Unindexed; full scan."""
+
+    name = 'basic'
+
+    def filter(self, qs, query, hub_id=None):
+        fields = qs.model.SEARCH_FIELDS
+        return qs.filter(reduce(or_, (Q(**{f'{f}__icontains': query}) for f in fields)))
+
+    def order_by_rank(self, qs):
+        return qs
+
+    def index(self, obj):
+        pass
+
+    def index_many(self, objs, batch_size=2000, replace=True):
+        pass
+
+    def unindex(self, obj):
+        pass
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    """Trigram-indexed substring search on ``search_document``."""
+
+    name = 'postgres'
+
+    def filter(self, qs, query, hub_id=None):
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        words = query_words(query)
+        if not words:
+            return qs
+        qs = qs.filter(reduce(and_, (Q(search_document__contains=w) for w in words)))
+        return qs.annotate(search_rank=TrigramWordSimilarity(normalize(query), 'search_document'))
+
+    def order_by_rank(self, qs):
+        return qs.order_by(F('search_rank').desc(), 'name', 'id')
+
+
+class TokenSearchBackend(BasicSearchBackend):
+    """Word-prefix search over the ``SearchToken`` side index."""
+
+    name = 'tokens'
+
+    def _tokens(self, qs, hub_id):
+        from .models import SearchToken
+        return SearchToken.objects.filter(hub_id=hub_id, model_name=qs.model._meta.model_name)
+
+    def filter(self, qs, query, hub_id=None):
+        words = [w[:TOKEN_MAX_LENGTH] for w in query_words(query)]
+        if not words:
+            return qs
+        tokens = self._tokens(qs, hub_id)
+        for word in words:
+            # A range rather than startswith so the btree index is usable
+            # on every backend (SQLite ignores indexes for LIKE ... ESCAPE).
+            matching = tokens.filter(token__gte=word, token__lt=word + '\uffff')
+            qs = qs.filter(pk__in=matching.values('object_id'))
+        hits = (
+            tokens.filter(object_id=OuterRef('pk'), token__in=words)
+            .values('object_id').annotate(n=Count('id')).values('n')
+        )
+        return qs.annotate(search_rank=Coalesce(Subquery(hits, output_field=IntegerField()), Value(0)))
+
+    def order_by_rank(self, qs):
+        return qs.order_by(F('search_rank').desc(), 'name', 'id')
+
+    def index(self, obj):
+        from .models import SearchToken
+        model_name = obj._meta.model_name
+        SearchToken.objects.filter(model_name=model_name, object_id=obj.pk).delete()
+        SearchToken.objects.bulk_create([
+            SearchToken(hub_id=obj.hub_id, model_name=model_name, object_id=obj.pk, token=token)
+            for token in tokenize(obj)
+        ])
+
+    def index_many(self, objs, batch_size=2000, replace=True):
+        """
+        Rebuild tokens for an iterable of rows of a single model.
+
+        Pass ``replace=False`` for rows that were just created and have no
+        tokens yet, which skips the delete.
+        """
+        from .models import SearchToken
+        prep = SearchToken._meta.get_field('object_id').get_db_prep_value
+        conn = connections[SearchToken.objects.db]
+        batch, ids = [], []
+        for obj in objs:
+            ids.append(obj.pk)
+            row = (prep(obj.hub_id, conn), obj._meta.model_name, prep(obj.pk, conn))
+            batch.extend((*row, token) for token in tokenize(obj))
+            if len(ids) >= batch_size:
+                self._flush(conn, ids, batch, replace)
+                batch, ids = [], []
+        if ids:
+            self._flush(conn, ids, batch, replace)
+
+    def _flush(self, conn, ids, batch, replace=True):
+        from .models import SearchToken
+        # A plain executemany: the token table is write-heavy and building
+        # a model instance per token dominated bulk indexing time.
+        opts = SearchToken._meta
+        qn = conn.ops.quote_name
+        columns = [qn(opts.get_field(name).column) for name in ('hub_id', 'model_name', 'object_id', 'token')]
+        sql = 'INSERT INTO {} ({}) VALUES (%s, %s, %s, %s)'.format(qn(opts.db_table), ', '.join(columns))
+        # One transaction per batch: in autocommit mode SQLite would commit
+        # (and sync to disk) after every token row.
+        with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+            if replace:
+                SearchToken.objects.using(conn.alias).filter(object_id__in=ids).delete()
+            cursor.executemany(sql, batch)
+
+    def unindex(self, obj):
+        from .models import SearchToken
+        SearchToken.objects.filter(model_name=obj._meta.model_name, object_id=obj.pk).delete()
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (BasicSearchBackend, PostgresSearchBackend, TokenSearchBackend)
+}
+
+
+_trigram_extension = {}
+
+
+def has_trigram_extension():
+    """Whether the database is PostgreSQL with ``pg_trgm`` installed (checked once per process)."""
+    if connection.vendor != 'postgresql':
+        return False
+    if connection.alias not in _trigram_extension:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_extension[connection.alias] = cursor.fetchone() is not None
+    return _trigram_extension[connection.alias]
+
+
+def get_search_backend(name=None):
+    """Return the configured search backend instance."""
+    name = name or getattr(settings, 'PROPERTY_MGMT_SEARCH_BACKEND', 'auto')
+    if name not in BACKENDS:
+        name = 'postgres' if connection.vendor == 'postgresql' else 'tokens'
+    if name == 'postgres' and not has_trigram_extension():
+        # TrigramWordSimilarity needs pg_trgm's word_similarity().
+        name = 'basic'
+    return BACKENDS[name]()
+
+
+def usable_search_backends():
+    """
+    Backends a hub can search with: unindexed ``basic``, the configured
+    backend, whose index is maintained, and ``postgres`` where ``pg_trgm``
+    is installed, which reads the always-maintained ``search_document``.
+    """
+    names = {'basic', get_search_backend().name}
+    if has_trigram_extension():
+        names.add('postgres')
+    return names
@@ -0,0 +1,103 @@
+"""
+Signal receivers for the property management module.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .availability import rebuild_timeline, sync_lease
+from .config import invalidate_hub_settings, store_hub_settings
+from .counts import invalidate_counts
+from .metrics import invalidate_dashboard_metrics
+from .models import ModuleSettings, Property, Tenant, Lease
+from .search import get_search_backend
+
+# Sent by code paths that write through ``QuerySet.update()`` or
+# ``bulk_create``/``bulk_update``, which bypass the model signals.
+# Arguments: ``sender`` (the model class), ``hub_id`` and optionally
+# ``fields``, the columns written (all of them if omitted).
+bulk_updated = Signal()
+
+# Sent by the renewal scheduler once a batch of renewal tasks is committed.
+# Arguments: ``sender`` (``RenewalTask``), ``hub_id`` and ``tasks``.
+renewal_tasks_created = Signal()
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=Tenant)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(sender.SEARCH_FIELDS):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Tenant)
+def remove_from_search_index(sender, instance, **kwargs):
+    get_search_backend().unindex(instance)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=Tenant)
+@receiver(post_save, sender=Lease)
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_delete, sender=Lease)
+def invalidate_dashboard_on_write(sender, instance, **kwargs):
+    invalidate_dashboard_metrics(instance.hub_id)
+
+
+@receiver(bulk_updated)
+def invalidate_dashboard_on_bulk_write(sender, hub_id, **kwargs):
+    invalidate_dashboard_metrics(hub_id)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=Tenant)
+@receiver(post_save, sender=Lease)
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_delete, sender=Lease)
+def invalidate_counts_on_write(sender, instance, **kwargs):
+    invalidate_counts(instance.hub_id, sender)
+
+
+@receiver(bulk_updated)
+def invalidate_counts_on_bulk_write(sender, hub_id, **kwargs):
+    invalidate_counts(hub_id, sender)
+
+
+@receiver(post_save, sender=Lease)
+def sync_occupancy_span(sender, instance, **kwargs):
+    # occupancy.py sends bulk_updated, so it can't be imported at module level.
+    from .occupancy import refresh_property
+    for property_id in sync_lease(instance):
+        refresh_property(property_id)
+
+
+@receiver(post_delete, sender=Lease)
+def refresh_property_on_lease_delete(sender, instance, **kwargs):
+    from .occupancy import refresh_property
+    refresh_property(instance.property_id)
+
+
+# Lease columns the occupancy timeline and property status depend on.
+OCCUPANCY_FIELDS = {'property', 'start_date', 'end_date', 'status', 'is_deleted'}
+
+
+@receiver(bulk_updated, sender=Lease)
+def rebuild_occupancy_on_bulk_write(sender, hub_id, fields=None, **kwargs):
+    if fields is not None and not OCCUPANCY_FIELDS & set(fields):
+        return
+    from .occupancy import reconcile_hub
+    rebuild_timeline(hub_id)
+    reconcile_hub(hub_id)
+
+
+@receiver(post_save, sender=ModuleSettings)
+def publish_hub_settings(sender, instance, **kwargs):
+    store_hub_settings(instance)
+
+
+@receiver(post_delete, sender=ModuleSettings)
+def forget_hub_settings(sender, instance, **kwargs):
+    invalidate_hub_settings(instance.hub_id)
@@ -0,0 +1,63 @@
+"""
+Template helpers for the datatable partials.
+
+Row markup is the bulk of a list render, so anything that doesn't depend
+on the row is computed once per render: ``{% capture %}`` stores rendered
+markup (e.g. an icon SVG) in a variable, ``{% row_url %}`` reverses a URL
+once with a placeholder pk that ``|for_row`` swaps per row, and
+``|row_ids`` builds the page's select-all id list in one pass.
+"""
+import json
+
+from django import template
+from django.conf import settings
+from django.urls import reverse
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+ROW_PK = '00000000-0000-0000-0000-000000000000'
+
+
+class CaptureNode(template.Node):
+    def __init__(self, nodelist, name):
+        self.nodelist = nodelist
+        self.name = name
+
+    def render(self, context):
+        context[self.name] = mark_safe(self.nodelist.render(context).strip())
+        return ''
+
+
+@register.tag
+def capture(parser, token):
+    """``{% capture name %}...{% endcapture %}`` renders the block once into ``name``."""
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError("'capture' takes one argument: the variable name")
+    nodelist = parser.parse(('endcapture',))
+    parser.delete_first_token()
+    return CaptureNode(nodelist, bits[1])
+
+
+@register.simple_tag
+def row_url(viewname):
+    """URL for ``viewname`` with a placeholder pk, to be filled by ``|for_row``."""
+    return reverse(viewname, args=[ROW_PK])
+
+
+@register.filter
+def for_row(url, pk):
+    return url.replace(ROW_PK, str(pk))
+
+
+@register.filter
+def row_ids(rows):
+    """JSON array of the rows' ids."""
+    return json.dumps([str(row.pk) for row in rows])
+
+
+@register.simple_tag
+def row_cache_ttl():
+    """Lifetime of cached row fragments, ``PROPERTY_MGMT_ROW_CACHE_TTL`` (default 3600)."""
+    return getattr(settings, 'PROPERTY_MGMT_ROW_CACHE_TTL', 3600)
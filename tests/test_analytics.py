@@ -0,0 +1,92 @@
+"""Tests for vectorized portfolio analytics."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+pytest.importorskip('numpy')
+
+from property_mgmt.analytics import compute_portfolio_analytics, get_portfolio_analytics
+from property_mgmt.models import Lease, Property
+
+AS_OF = date(2025, 6, 30)
+
+
+@pytest.fixture
+def portfolio(db, hub_id, tenant):
+    flat = Property.objects.create(
+        hub_id=hub_id, name='Flat', address='x', property_type='residential', bedrooms=2,
+        area_sqm=Decimal('50'), monthly_rent=Decimal('1000'),
+    )
+    shop = Property.objects.create(
+        hub_id=hub_id, name='Shop', address='x', property_type='commercial', bedrooms=0,
+        area_sqm=Decimal('100'), monthly_rent=Decimal('3000'),
+    )
+    Property.objects.create(
+        hub_id=hub_id, name='Sold', address='x', property_type='residential', bedrooms=2,
+        monthly_rent=Decimal('500'), status='sold',
+    )
+    # Flat leased for the whole window, shop only for its last 10 days.
+    Lease.objects.create(
+        hub_id=hub_id, property=flat, tenant=tenant, start_date=date(2024, 1, 1),
+        monthly_rent=Decimal('1000'),
+    )
+    Lease.objects.create(
+        hub_id=hub_id, property=shop, tenant=tenant, start_date=AS_OF - timedelta(days=9),
+        monthly_rent=Decimal('3000'),
+    )
+    return flat, shop
+
+
+@pytest.mark.django_db
+class TestPortfolioAnalytics:
+    """KPIs computed from column arrays."""
+
+    def test_occupancy_excludes_sold(self, hub_id, portfolio):
+        data = compute_portfolio_analytics(hub_id, as_of=AS_OF)
+        assert (data['properties'], data['lettable'], data['occupied']) == (3, 2, 2)
+        assert data['occupancy_rate'] == 100.0
+
+    def test_vacancy_days(self, hub_id, portfolio):
+        data = compute_portfolio_analytics(hub_id, as_of=AS_OF, window_days=30)
+        assert data['vacancy_days'] == 20
+        assert data['avg_vacancy_days'] == 10.0
+
+    def test_rent_per_sqm(self, hub_id, portfolio):
+        data = compute_portfolio_analytics(hub_id, as_of=AS_OF)
+        assert data['avg_rent_sqm'] == 25.0
+        assert data['median_rent_sqm'] == 25.0
+
+    def test_rent_yield(self, hub_id, portfolio):
+        data = compute_portfolio_analytics(hub_id, as_of=AS_OF, window_days=30)
+        # 30 days of 1000 + 10 days of 3000 over 30 days of 4000.
+        assert data['rent_yield'] == round((30 * 1000 + 10 * 3000) * 100 / (30 * 4000), 1)
+
+    def test_breakdowns(self, hub_id, portfolio):
+        data = compute_portfolio_analytics(hub_id, as_of=AS_OF)
+        by_type = {row['label']: row for row in data['by_type']}
+        assert by_type['residential']['count'] == 2
+        assert by_type['residential']['avg_rent_sqm'] == 20.0
+        assert by_type['commercial']['occupancy_rate'] == 100.0
+        assert [row['label'] for row in data['by_bedrooms']] == [0, 2]
+
+    def test_empty_hub(self, db):
+        data = compute_portfolio_analytics(None, as_of=AS_OF)
+        assert data['properties'] == 0
+        assert data['by_type'] == []
+
+    def test_cached(self, hub_id, portfolio, django_assert_num_queries):
+        get_portfolio_analytics(hub_id)
+        with django_assert_num_queries(0):
+            get_portfolio_analytics(str(hub_id))
+
+
+@pytest.mark.django_db
+class TestAnalyticsView:
+    """Analytics page."""
+
+    def test_renders(self, auth_client, portfolio):
+        response = auth_client.get(reverse('property_mgmt:analytics'))
+        assert response.status_code == 200
+        assert response.context['analytics']['lettable'] == 2
@@ -0,0 +1,190 @@
+"""Tests for the async (ASGI) dashboard and list views."""
+import asyncio
+import importlib
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.urls import clear_url_caches, resolve
+
+import property_mgmt.urls
+from property_mgmt.counts import CountingPaginator
+from property_mgmt.metrics import acompute_dashboard_metrics, compute_dashboard_metrics
+from property_mgmt.models import Property
+from property_mgmt.parallel import aread, concurrent_reads
+from property_mgmt.profiling import _sample, _Sample, get_profiles, reset_profiles
+
+
+def _reload_urls(settings):
+    importlib.reload(property_mgmt.urls)
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_urls(settings):
+    """Route the dashboard and lists to their async variants."""
+    settings.PROPERTY_MGMT_ASYNC_VIEWS = True
+    _reload_urls(settings)
+    yield
+    settings.PROPERTY_MGMT_ASYNC_VIEWS = False
+    _reload_urls(settings)
+
+
+@pytest.fixture
+def aclient(async_client, auth_client, async_urls):
+    """Async client sharing the authenticated session."""
+    async_client.cookies = auth_client.cookies
+    return async_client
+
+
+@pytest.fixture
+def properties(hub_id):
+    return Property.objects.bulk_create([
+        Property(hub_id=hub_id, name=f'Flat {i:02}', address='x', monthly_rent=Decimal('900')) for i in range(25)
+    ])
+
+
+def _get(client, url, **kwargs):
+    return async_to_sync(client.get)(url, **kwargs)
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    """Async dashboard and list views."""
+
+    def test_routes_switch(self, async_urls):
+        """Test the setting routes the pages to the async views."""
+        assert resolve('/m/property_mgmt/').func.__name__ == 'dashboard_async'
+        assert resolve('/m/property_mgmt/tenants/').func.__name__ == 'tenants_list_async'
+
+    def test_dashboard(self, aclient, properties):
+        """Test the async dashboard renders the same metrics as the sync one."""
+        response = _get(aclient, '/m/property_mgmt/')
+        assert response.status_code == 200
+        assert response.context['total_properties'] == 25
+
+    def test_requires_auth(self, async_client, async_urls):
+        """Test anonymous requests are redirected to the login page."""
+        response = _get(async_client, '/m/property_mgmt/properties/')
+        assert response.status_code == 302
+
+    def test_list_page(self, aclient, properties):
+        """Test an offset page comes with its rows and the total."""
+        response = _get(aclient, '/m/property_mgmt/properties/?page=2&per_page=10')
+        page = response.context['page_obj']
+        assert (page.number, len(page.object_list), page.paginator.count) == (2, 10, 25)
+        assert [p.name for p in page.object_list][0] == 'Flat 10'
+
+    def test_page_past_end(self, aclient, properties):
+        """Test a page past the end falls back to the last page."""
+        page = _get(aclient, '/m/property_mgmt/properties/?page=9').context['page_obj']
+        assert (page.number, len(page.object_list)) == (3, 5)
+
+    def test_cursor_paging(self, aclient, properties):
+        """Test cursor paging is served too."""
+        response = _get(aclient, '/m/property_mgmt/properties/?paging=cursor&per_page=10')
+        assert response.context['paging'] == 'cursor'
+        assert len(response.context['page_obj']) == 10
+
+    def test_datatable_partial(self, aclient, properties):
+        """Test htmx datatable requests get the rows partial."""
+        response = _get(
+            aclient, '/m/property_mgmt/tenants/', headers={'HX-Request': 'true', 'HX-Target': 'datatable-body'},
+        )
+        assert response.status_code == 200
+        assert 'tenants' in response.context
+
+    @pytest.mark.filterwarnings('ignore:StreamingHttpResponse must consume synchronous iterators')
+    def test_export(self, aclient, properties):
+        """Test exports are delegated to the sync streaming path."""
+        response = _get(aclient, '/m/property_mgmt/properties/?export=csv')
+        assert response['Content-Type'].startswith('text/csv')
+        assert b''.join(async_to_sync(_drain)(response)).count(b'Flat') == 25
+
+    @pytest.mark.filterwarnings('ignore:StreamingHttpResponse must consume synchronous iterators')
+    def test_export_profiled_once(self, aclient, properties, settings):
+        """Test a delegated export is recorded under the async view only."""
+        settings.PROPERTY_MGMT_PROFILING = True
+        reset_profiles()
+        _get(aclient, '/m/property_mgmt/properties/?export=csv')
+        assert {v['view']: v['count'] for v in get_profiles()['views']} == {'properties_list_async': 1}
+
+    def test_profiled(self, aclient, settings):
+        """Test async views record the same metrics as sync ones, once."""
+        settings.PROPERTY_MGMT_PROFILING = True
+        reset_profiles()
+        _get(aclient, '/m/property_mgmt/')
+        profiles = {v['view']: v for v in get_profiles()['views']}
+        profile = profiles['dashboard_async']
+        assert profile['count'] == 1
+        assert set(profile['avg']) == {'total_ms', 'queries', 'db_ms', 'render_ms', 'bytes'}
+        assert profile['avg']['queries'] >= 1 and profile['avg']['render_ms'] > 0
+
+
+async def _drain(response):
+    return [chunk async for chunk in response]
+
+
+@pytest.mark.django_db
+class TestAsyncHelpers:
+    """Async metrics and pagination helpers."""
+
+    def test_metrics_match(self, hub_id, properties):
+        """Test the async metrics equal the sync ones."""
+        assert async_to_sync(acompute_dashboard_metrics)(hub_id) == compute_dashboard_metrics(hub_id)
+
+    def test_aget_page(self, hub_id, properties):
+        """Test aget_page matches get_page."""
+        qs = Property.objects.filter(hub_id=hub_id).order_by('name', 'id')
+        page = async_to_sync(CountingPaginator(qs, 10, hub_id=hub_id, strategy='exact').aget_page)('x')
+        assert (page.number, page.paginator.count) == (1, 25)
+        assert list(page.object_list) == list(CountingPaginator(qs, 10).get_page(1).object_list)
+
+
+def _sleep_ident():
+    time.sleep(0.2)
+    return threading.get_ident()
+
+
+def _select_one():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+class TestConcurrentReads:
+    """parallel.aread tests."""
+
+    def test_reads_overlap(self, settings):
+        """Test gathered reads run at the same time, on different threads."""
+        settings.PROPERTY_MGMT_CONCURRENT_READS = True
+
+        async def run():
+            return await asyncio.gather(*(aread(_sleep_ident) for _ in range(3)))
+        started = time.perf_counter()
+        idents = async_to_sync(run)()
+        assert len(set(idents)) == 3 and time.perf_counter() - started < 0.5
+
+    def test_off_for_in_memory_sqlite(self, settings):
+        """Test the in-memory test database keeps reads on the request's thread."""
+        assert concurrent_reads() is False
+        settings.PROPERTY_MGMT_CONCURRENT_READS = True
+        assert concurrent_reads() is True
+
+    @pytest.mark.django_db
+    def test_profiled(self, settings):
+        """Test queries on a read's own connection count into the request's profile."""
+        settings.PROPERTY_MGMT_CONCURRENT_READS = True
+
+        async def run():
+            sample = _Sample()
+            token = _sample.set(sample)
+            try:
+                await aread(_select_one)
+            finally:
+                _sample.reset(token)
+            return sample.queries
+        assert async_to_sync(run)() == 1
@@ -0,0 +1,136 @@
+"""Tests for the occupancy timeline and availability search."""
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from property_mgmt.availability import (
+    available_properties, occupancy_timeline, rebuild_timeline,
+)
+from property_mgmt.importer import import_file
+from property_mgmt.leasing import OPEN_END
+from property_mgmt.models import Lease, OccupancySpan, Property
+
+
+@pytest.fixture
+def flats(db, hub_id):
+    """Three flats with different sizes and rents."""
+    return [
+        Property.objects.create(hub_id=hub_id, name=f'Flat {b}', address='x', bedrooms=b, monthly_rent=Decimal(500 * b))
+        for b in (1, 2, 3)
+    ]
+
+
+def _lease(prop, tenant, start, end=None, status='active'):
+    return Lease.objects.create(
+        hub_id=prop.hub_id, property=prop, tenant=tenant, start_date=start, end_date=end,
+        monthly_rent=prop.monthly_rent, status=status,
+    )
+
+
+@pytest.mark.django_db
+class TestTimeline:
+    """Incremental span maintenance tests."""
+
+    def test_create_adds_span(self, flats, tenant):
+        """Test an active lease gets a span, open ends stored as date.max."""
+        lease = _lease(flats[0], tenant, date(2025, 1, 1))
+        assert occupancy_timeline(flats[0].pk) == [(date(2025, 1, 1), OPEN_END, lease.pk)]
+
+    def test_edit_moves_span(self, flats, tenant):
+        """Test editing lease dates or property moves its span."""
+        lease = _lease(flats[0], tenant, date(2025, 1, 1))
+        lease.property = flats[1]
+        lease.end_date = date(2025, 6, 30)
+        lease.save()
+        assert occupancy_timeline(flats[0].pk) == []
+        assert occupancy_timeline(flats[1].pk) == [(date(2025, 1, 1), date(2025, 6, 30), lease.pk)]
+
+    def test_end_drops_span(self, flats, tenant):
+        """Test ending, drafting or soft-deleting a lease frees the property."""
+        for change in ({'status': 'ended'}, {'status': 'draft'}, {'is_deleted': True}):
+            lease = _lease(flats[0], tenant, date(2025, 1, 1))
+            for field, value in change.items():
+                setattr(lease, field, value)
+            lease.save()
+            assert not OccupancySpan.objects.filter(lease_id=lease.pk).exists()
+
+    def test_hard_delete_cascades(self, flats, tenant):
+        """Test deleting a lease row removes its span."""
+        lease = _lease(flats[0], tenant, date(2025, 1, 1))
+        lease.delete()
+        assert not OccupancySpan.objects.exists()
+
+    def test_rebuild(self, hub_id, flats, tenant):
+        """Test a rebuild restores spans written around the signals."""
+        _lease(flats[0], tenant, date(2025, 1, 1))
+        _lease(flats[1], tenant, date(2025, 1, 1), status='draft')
+        OccupancySpan.objects.all().delete()
+        assert rebuild_timeline(hub_id) == 1
+        assert OccupancySpan.objects.get().property_id == flats[0].pk
+
+    def test_import_rebuilds(self, hub_id, flats, tenant):
+        """Test bulk-imported leases show up in the timeline."""
+        csv = (
+            'property,tenant,start_date,end_date,monthly_rent,status\n'
+            f'Flat 2,{tenant.id_number},2030-01-01,2030-12-31,900,active\n'
+        ).encode()
+        import_file('leases', io.BytesIO(csv), 'leases.csv', hub_id)
+        assert occupancy_timeline(flats[1].pk)[0][:2] == (date(2030, 1, 1), date(2030, 12, 31))
+
+
+@pytest.mark.django_db
+class TestAvailability:
+    """available_properties tests."""
+
+    def test_free_between(self, hub_id, flats, tenant):
+        """Test only properties without an intersecting span are returned."""
+        _lease(flats[0], tenant, date(2025, 1, 1), date(2025, 3, 31))
+        _lease(flats[1], tenant, date(2025, 6, 1))
+        result = set(available_properties(hub_id, date(2025, 3, 1), date(2025, 5, 31)))
+        assert result == {flats[1], flats[2]}
+
+    def test_boundaries_inclusive(self, hub_id, flats, tenant):
+        """Test a lease ending on the start date still blocks it."""
+        _lease(flats[0], tenant, date(2025, 1, 1), date(2025, 3, 31))
+        assert flats[0] not in available_properties(hub_id, date(2025, 3, 31), date(2025, 4, 30))
+        assert flats[0] in available_properties(hub_id, date(2025, 4, 1), date(2025, 4, 30))
+
+    def test_open_ended_search(self, hub_id, flats, tenant):
+        """Test an open-ended search collides with any future lease."""
+        _lease(flats[0], tenant, date(2030, 1, 1), date(2030, 12, 31))
+        assert flats[0] not in available_properties(hub_id, date(2025, 1, 1))
+
+    def test_bedrooms_and_rent(self, hub_id, flats):
+        """Test bedroom and rent limits."""
+        result = list(available_properties(hub_id, date(2025, 1, 1), min_bedrooms=2, max_rent=Decimal('1000')))
+        assert result == [flats[1]]
+
+    def test_unlettable_excluded(self, hub_id, flats):
+        """Test sold or inactive properties are never available."""
+        Property.objects.filter(pk=flats[0].pk).update(status='sold')
+        Property.objects.filter(pk=flats[1].pk).update(is_active=False)
+        assert list(available_properties(hub_id, date(2025, 1, 1))) == [flats[2]]
+
+    def test_single_query(self, hub_id, flats, tenant, django_assert_num_queries):
+        """Test the search is one query regardless of property count."""
+        _lease(flats[0], tenant, date(2025, 1, 1))
+        with django_assert_num_queries(1):
+            list(available_properties(hub_id, date(2025, 1, 1), date(2025, 1, 31)))
+
+    def test_list_filter(self, auth_client, flats, tenant):
+        """Test the properties list filters by availability."""
+        _lease(flats[0], tenant, date(2025, 1, 1))
+        response = auth_client.get(reverse('property_mgmt:properties_list'), {
+            'available_from': '2025-02-01', 'available_to': '2025-02-28', 'min_bedrooms': '2',
+        }, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        assert [p.name for p in response.context['properties']] == ['Flat 2', 'Flat 3']
+
+    def test_list_filter_invalid_ignored(self, auth_client, flats):
+        """Test an invalid range leaves the list unfiltered."""
+        response = auth_client.get(reverse('property_mgmt:properties_list'), {
+            'available_from': '2025-02-01', 'available_to': '2025-01-01',
+        }, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        assert len(response.context['properties']) == 3
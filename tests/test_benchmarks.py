@@ -0,0 +1,60 @@
+"""Tests for the benchmark baseline checks."""
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from property_mgmt.benchmarks import compare, load_baseline, result, save_baseline
+
+
+class TestBaseline:
+    """Baseline storage and comparison tests."""
+
+    def test_save_keeps_other_entries(self, tmp_path):
+        """Test saving one size keeps the others."""
+        path = tmp_path / 'baseline.json'
+        save_baseline('views@1000', [result('list', 5.0, 2)], path)
+        save_baseline('views@50000', [result('list', 9.0, 2, bytes=10)], path)
+        assert load_baseline(path) == {
+            'views@1000': {'list': {'ms': 5.0, 'queries': 2}},
+            'views@50000': {'list': {'ms': 9.0, 'queries': 2}},
+        }
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing baseline file reads as empty."""
+        assert load_baseline(tmp_path / 'nope.json') == {}
+
+    def test_extra_query_fails(self):
+        """Test any additional query is a regression."""
+        failures = compare([result('list', 5.0, 3)], {'list': {'ms': 5.0, 'queries': 2}})
+        assert failures == ['list: 3 queries, baseline 2']
+
+    def test_slowdown_over_tolerance_fails(self):
+        """Test a slowdown beyond the tolerance is a regression."""
+        assert compare([result('list', 20.0, 2)], {'list': {'ms': 10.0, 'queries': 2}}, tolerance=0.5)
+        assert not compare([result('list', 14.0, 2)], {'list': {'ms': 10.0, 'queries': 2}}, tolerance=0.5)
+
+    def test_small_absolute_slowdown_ignored(self):
+        """Test sub-millisecond paths aren't failed on timer noise."""
+        assert not compare([result('list', 0.9, 2)], {'list': {'ms': 0.3, 'queries': 2}})
+
+    def test_unknown_rows_skipped(self):
+        """Test rows missing from the baseline don't fail."""
+        assert not compare([result('new', 100.0, 50)], {})
+
+
+@pytest.mark.django_db
+class TestBenchmarkCommand:
+    """property_mgmt_benchmark tests."""
+
+    def test_views_check(self, tmp_path):
+        """Test the views suite runs, saves a baseline and fails on a tightened one."""
+        path = tmp_path / 'baseline.json'
+        options = {'properties': 30, 'repeat': 1, 'baseline_file': str(path)}
+        call_command('property_mgmt_benchmark', 'views', save_baseline=True, **options)
+        rows = load_baseline(path)['views@30']
+        assert {'dashboard:cold', 'list:properties:first', 'export:properties:csv', 'bulk:properties:100_ids'} <= set(rows)
+
+        rows['list:properties:first']['queries'] = 0
+        save_baseline('views@30', [{'name': name, **row} for name, row in rows.items()], path)
+        with pytest.raises(CommandError, match='list:properties:first'):
+            call_command('property_mgmt_benchmark', 'views', check=True, **options)
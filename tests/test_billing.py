@@ -0,0 +1,122 @@
+"""Tests for rent charge generation."""
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from property_mgmt.billing import generate_all_hubs, generate_rent_charges, parse_period, prorate
+from property_mgmt.models import Lease, RentCharge
+
+
+@pytest.fixture
+def lease(db, hub_id, property, tenant):
+    return Lease.objects.create(
+        hub_id=hub_id, property=property, tenant=tenant,
+        start_date=date(2025, 1, 1), monthly_rent=Decimal('900.00'),
+    )
+
+
+class TestProrate:
+    """Proration of partial months."""
+
+    def test_full_month(self):
+        assert prorate(Decimal('900'), date(2024, 1, 1), None, date(2025, 2, 1)) == (
+            Decimal('900'), 28, date(2025, 2, 1), date(2025, 2, 28),
+        )
+
+    def test_starts_mid_month(self):
+        amount, days, start, end = prorate(Decimal('900'), date(2025, 4, 21), None, date(2025, 4, 1))
+        assert (amount, days, start, end) == (Decimal('300.00'), 10, date(2025, 4, 21), date(2025, 4, 30))
+
+    def test_ends_mid_month(self):
+        amount, days, _, end = prorate(Decimal('310'), date(2024, 1, 1), date(2025, 3, 10), date(2025, 3, 1))
+        assert (amount, days, end) == (Decimal('100.00'), 10, date(2025, 3, 10))
+
+    def test_outside_period(self):
+        assert prorate(Decimal('900'), date(2025, 5, 1), None, date(2025, 4, 1)) is None
+
+    def test_parse_period(self):
+        assert parse_period('2025-03') == date(2025, 3, 1)
+        assert parse_period(date(2025, 3, 17)) == date(2025, 3, 1)
+
+
+@pytest.mark.django_db
+class TestGenerateRentCharges:
+    """Batch charge generation."""
+
+    def test_creates_charge(self, hub_id, lease):
+        result = generate_rent_charges('2025-03', hub_id)
+        assert (result.leases, result.created, result.skipped) == (1, 1, 0)
+        charge = RentCharge.objects.get(lease=lease)
+        assert charge.period == date(2025, 3, 1)
+        assert charge.amount == Decimal('900.00')
+        assert charge.hub_id == hub_id
+
+    def test_rerun_is_idempotent(self, hub_id, lease):
+        generate_rent_charges('2025-03', hub_id)
+        result = generate_rent_charges('2025-03', hub_id)
+        assert (result.created, result.skipped) == (0, 1)
+        assert RentCharge.objects.filter(lease=lease).count() == 1
+
+    def test_concurrent_run_not_counted(self, hub_id, lease, property, tenant):
+        """Test charges a racing run inserted first count as skipped, not created."""
+        other = Lease.objects.create(
+            hub_id=hub_id, property=property, tenant=tenant,
+            start_date=date(2025, 1, 1), monthly_rent=Decimal('500.00'),
+        )
+        bulk_create = RentCharge.objects.bulk_create
+
+        def racing(charges, **kwargs):
+            first = next(c for c in charges if c.lease_id == lease.id)
+            RentCharge.objects.create(
+                hub_id=hub_id, lease=lease, period=first.period, period_start=first.period_start,
+                period_end=first.period_end, days=first.days, amount=first.amount,
+            )
+            return bulk_create(charges, **kwargs)
+
+        with mock.patch.object(RentCharge.objects, 'bulk_create', side_effect=racing):
+            result = generate_rent_charges('2025-03', hub_id)
+        assert (result.leases, result.created, result.skipped) == (2, 1, 1)
+        assert RentCharge.objects.filter(lease__in=[lease, other]).count() == 2
+
+    def test_skips_unbillable_leases(self, hub_id, lease, property, tenant):
+        Lease.objects.create(
+            hub_id=hub_id, property=property, tenant=tenant, start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31), monthly_rent=Decimal('500'), status='ended',
+        )
+        Lease.objects.create(
+            hub_id=hub_id, property=property, tenant=tenant, start_date=date(2025, 1, 1),
+            monthly_rent=Decimal('500'), status='draft',
+        )
+        assert generate_rent_charges('2025-03', hub_id).created == 1
+
+    def test_bills_final_month_of_ended_lease(self, hub_id, property, tenant):
+        Lease.objects.create(
+            hub_id=hub_id, property=property, tenant=tenant, start_date=date(2024, 1, 1),
+            end_date=date(2025, 3, 15), monthly_rent=Decimal('620'), status='ended',
+        )
+        generate_rent_charges('2025-03', hub_id)
+        assert RentCharge.objects.get().amount == Decimal('300.00')
+
+    def test_chunking(self, hub_id, property, tenant):
+        for month in range(1, 6):
+            Lease.objects.create(
+                hub_id=hub_id, property=property, tenant=tenant,
+                start_date=date(2025, month, 1), monthly_rent=Decimal('100'),
+            )
+        result = generate_rent_charges('2025-06', hub_id, chunk_size=2)
+        assert (result.leases, result.created) == (5, 5)
+
+    def test_all_hubs(self, hub_id, lease, property, tenant):
+        results = generate_all_hubs('2025-03')
+        assert [r.hub_id for r in results] == [hub_id]
+        assert RentCharge.objects.count() == 1
+
+    def test_command(self, hub_id, lease):
+        out = StringIO()
+        call_command('property_mgmt_generate_rent', period='2025-03', hub=str(hub_id), stdout=out)
+        assert '1 charges created' in out.getvalue()
+        assert RentCharge.objects.filter(lease=lease).exists()
@@ -0,0 +1,144 @@
+"""Tests for set-based bulk actions."""
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from property_mgmt.bulk import MAX_BULK_IDS, parse_ids, run_bulk_action
+from property_mgmt.models import BulkActionLog, Property, Tenant
+
+
+@pytest.fixture
+def properties(db, hub_id):
+    """Active properties, half of them matching the search 'Gran'."""
+    return [
+        Property.objects.create(hub_id=hub_id, name=f'{"Gran" if i % 2 else "Piso"} {i:02d}', address='Street')
+        for i in range(24)
+    ]
+
+
+def _bulk(auth_client, **data):
+    return auth_client.post(reverse('property_mgmt:properties_bulk_action'), data)
+
+
+@pytest.mark.django_db
+class TestRunBulkAction:
+    """run_bulk_action tests."""
+
+    def test_updates_in_chunks(self, hub_id, properties):
+        """Test every row is updated when the selection spans several chunks."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        log = run_bulk_action(qs, 'deactivate', hub_id, 'filter', chunk_size=5)
+        assert log.affected == 24
+        assert not Property.objects.filter(hub_id=hub_id, is_active=True).exists()
+
+    def test_skips_rows_in_target_state(self, hub_id, properties):
+        """Test rows already in the target state are not rewritten."""
+        Property.objects.filter(pk=properties[0].pk).update(is_active=False)
+        log = run_bulk_action(Property.objects.filter(hub_id=hub_id), 'deactivate', hub_id, 'filter')
+        assert log.affected == 23
+
+    def test_sets_updated_at(self, hub_id, properties):
+        """Test updated_at is maintained despite QuerySet.update()."""
+        old = timezone.now() - timedelta(days=1)
+        Property.objects.filter(hub_id=hub_id).update(updated_at=old)
+        run_bulk_action(Property.objects.filter(hub_id=hub_id), 'deactivate', hub_id, 'filter')
+        assert not Property.objects.filter(hub_id=hub_id, updated_at=old).exists()
+
+    def test_delete_sets_deleted_at(self, hub_id, properties):
+        """Test delete soft-deletes and stamps deleted_at."""
+        run_bulk_action(Property.objects.filter(pk=properties[0].pk), 'delete', hub_id, 'ids')
+        obj = Property.all_objects.get(pk=properties[0].pk)
+        assert obj.is_deleted
+        assert obj.deleted_at is not None
+
+    def test_unknown_action(self, hub_id, properties):
+        """Test unknown actions do nothing and log nothing."""
+        assert run_bulk_action(Property.objects.filter(hub_id=hub_id), 'explode', hub_id, 'filter') is None
+        assert not BulkActionLog.objects.exists()
+
+    def test_parse_ids(self):
+        """Test invalid ids are dropped."""
+        pk = uuid.uuid4()
+        assert parse_ids(f'{pk}, nope,,') == [pk]
+
+
+@pytest.mark.django_db
+class TestBulkActionView:
+    """Bulk action view tests."""
+
+    def test_select_all_matching(self, auth_client, hub_id, properties):
+        """Test select=all targets every row matching the search, not just the page."""
+        response = _bulk(auth_client, select='all', action='deactivate', q='Gran', per_page='10')
+        assert response.status_code == 200
+        assert Property.objects.filter(hub_id=hub_id, is_active=False).count() == 12
+        assert not Property.objects.filter(name__startswith='Piso', is_active=False).exists()
+
+    def test_writes_audit_log(self, auth_client, hub_id, admin_user, properties):
+        """Test one audit row records who did what to which selection."""
+        _bulk(auth_client, select='all', action='deactivate', q='Gran')
+        log = BulkActionLog.objects.get()
+        assert log.hub_id == hub_id
+        assert log.created_by == admin_user.id
+        assert (log.model_name, log.action, log.selection) == ('property', 'deactivate', 'filter')
+        assert log.criteria == {'q': 'Gran'}
+        assert log.affected == 12
+
+    def test_ids_selection_logged(self, auth_client, properties):
+        """Test explicit ids are recorded in the audit row."""
+        ids = [str(p.pk) for p in properties[:2]]
+        _bulk(auth_client, ids=','.join(ids), action='delete')
+        log = BulkActionLog.objects.get()
+        assert log.selection == 'ids'
+        assert sorted(log.criteria['ids']) == sorted(ids)
+        assert log.affected == 2
+
+    def test_preserves_page_sort_and_search(self, auth_client, properties):
+        """Test the re-rendered list keeps the caller's page, sort and search."""
+        response = _bulk(
+            auth_client, ids=str(properties[0].pk), action='deactivate',
+            q='Gran', sort='name', dir='desc', per_page='10', current_page='2',
+        )
+        assert response.context['page_obj'].number == 2
+        assert response.context['search_query'] == 'Gran'
+        assert response.context['sort_dir'] == 'desc'
+        names = [p.name for p in response.context['properties']]
+        assert names == ['Gran 03', 'Gran 01']
+
+    def test_preserves_cursor(self, auth_client, properties):
+        """Test cursor pagination state survives a bulk action."""
+        response = _bulk(
+            auth_client, ids=str(properties[0].pk), action='deactivate',
+            paging='cursor', current_cursor='', per_page='10',
+        )
+        assert response.context['paging'] == 'cursor'
+
+    def test_too_many_ids(self, auth_client, properties):
+        """Test explicit selections above the cap are rejected."""
+        ids = ','.join(str(uuid.uuid4()) for _ in range(MAX_BULK_IDS + 1))
+        response = _bulk(auth_client, ids=ids, action='delete')
+        assert response.status_code == 400
+        assert not BulkActionLog.objects.exists()
+
+    def test_invalid_ids_ignored(self, auth_client, properties):
+        """Test malformed ids are ignored instead of erroring."""
+        response = _bulk(auth_client, ids=f'bad,{properties[0].pk}', action='deactivate')
+        assert response.status_code == 200
+        assert BulkActionLog.objects.get().affected == 1
+
+    def test_other_hub_untouched(self, auth_client, properties):
+        """Test select=all stays within the session's hub."""
+        other = Property.objects.create(hub_id=uuid.uuid4(), name='Gran Otro', address='x')
+        _bulk(auth_client, select='all', action='deactivate', q='Gran')
+        other.refresh_from_db()
+        assert other.is_active
+
+    def test_tenants_select_all(self, auth_client, hub_id):
+        """Test select=all on tenants."""
+        for i in range(3):
+            Tenant.objects.create(hub_id=hub_id, name=f'Tenant {i}', is_active=False)
+        response = auth_client.post(reverse('property_mgmt:tenants_bulk_action'), {'select': 'all', 'action': 'activate'})
+        assert response.status_code == 200
+        assert Tenant.objects.filter(hub_id=hub_id, is_active=True).count() == 3
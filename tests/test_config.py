@@ -0,0 +1,116 @@
+"""Tests for the cached per-hub module settings."""
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from property_mgmt.billing import generate_rent_charges
+from property_mgmt.cache import hub_cache_key
+from property_mgmt.config import CACHE_KEY, LocalCache, get_hub_settings, hub_search_backend, local_cache
+from property_mgmt.ledger import post_rent_charges
+from property_mgmt.models import Lease, LedgerEntry, ModuleSettings, Property
+
+
+def _queries(func, *args):
+    with CaptureQueriesContext(connection) as ctx:
+        value = func(*args)
+    return value, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestHubSettings:
+    """get_hub_settings tests."""
+
+    def test_defaults_without_row(self, hub_id):
+        """Test hubs that never saved settings get the defaults."""
+        hub = get_hub_settings(hub_id)
+        assert (hub.default_page_size, hub.currency, hub.billing_day, hub.export_max_rows) == (10, 'EUR', 1, None)
+
+    def test_read_through(self, hub_id):
+        """Test only the first lookup queries; the shared cache serves other workers."""
+        ModuleSettings.objects.create(hub_id=hub_id, currency='USD')
+        assert _queries(get_hub_settings, hub_id) == (get_hub_settings(hub_id), 1)
+        assert _queries(get_hub_settings, str(hub_id))[1] == 0
+        local_cache.clear()
+        settings_, queries = _queries(get_hub_settings, hub_id)
+        assert (settings_.currency, queries) == ('USD', 0)
+
+    def test_save_invalidates(self, hub_id, django_capture_on_commit_callbacks):
+        """Test a save replaces the cached snapshot, in this worker and in the shared cache."""
+        row = ModuleSettings.objects.create(hub_id=hub_id)
+        assert get_hub_settings(hub_id).default_page_size == 10
+        row.default_page_size = 50
+        with django_capture_on_commit_callbacks(execute=True):
+            row.save()
+        assert _queries(get_hub_settings, hub_id) == (get_hub_settings(hub_id), 0)
+        assert get_hub_settings(hub_id).default_page_size == 50
+        assert cache.get(hub_cache_key(hub_id, CACHE_KEY)).default_page_size == 50
+
+    def test_delete_invalidates(self, hub_id):
+        """Test deleting the row brings back the defaults."""
+        row = ModuleSettings.objects.create(hub_id=hub_id, currency='GBP')
+        assert get_hub_settings(hub_id).currency == 'GBP'
+        row.delete()
+        assert get_hub_settings(hub_id).currency == 'EUR'
+
+
+class TestLocalCache:
+    """LocalCache tests."""
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry goes first."""
+        lru = LocalCache()
+        lru.set('a', 1, 60, 2)
+        lru.set('b', 2, 60, 2)
+        lru.get('a')
+        lru.set('c', 3, 60, 2)
+        assert (lru.get('a'), lru.get('b'), lru.get('c')) == (1, None, 3)
+
+    def test_ttl(self):
+        """Test expired entries are misses."""
+        lru = LocalCache()
+        lru.set('a', 1, 0, 2)
+        assert lru.get('a') is None and len(lru) == 0
+
+
+@pytest.mark.django_db
+class TestConsumers:
+    """Code paths reading the hub settings."""
+
+    def test_list_page_size(self, auth_client, hub_id):
+        """Test lists default to the hub's page size."""
+        ModuleSettings.objects.create(hub_id=hub_id, default_page_size=25, currency='USD')
+        response = auth_client.get(reverse('property_mgmt:properties_list'), HTTP_HX_REQUEST='true')
+        assert (response.context['per_page'], response.context['currency']) == (25, 'USD')
+
+    def test_export_limit(self, auth_client, hub_id):
+        """Test exports stop at the hub's row limit."""
+        ModuleSettings.objects.create(hub_id=hub_id, export_max_rows=2)
+        Property.objects.bulk_create([Property(hub_id=hub_id, name=f'P{i}', address='x') for i in range(5)])
+        response = auth_client.get(reverse('property_mgmt:properties_list'), {'export': 'csv'})
+        assert b''.join(response.streaming_content).decode('utf-8-sig').count('\n') == 3
+
+    def test_search_backend(self, hub_id):
+        """Test a hub can pick a usable backend and unusable picks fall back."""
+        ModuleSettings.objects.create(hub_id=hub_id, search_backend='basic')
+        assert hub_search_backend(hub_id).name == 'basic'
+        other = uuid.uuid4()
+        ModuleSettings.objects.create(hub_id=other, search_backend='postgres')
+        assert hub_search_backend(other).name == 'tokens'
+
+    def test_billing_day(self, hub_id, property, tenant):
+        """Test rent is posted on the hub's billing day, or the lease start if later."""
+        ModuleSettings.objects.create(hub_id=hub_id, billing_day=5)
+        for start in (date(2031, 1, 1), date(2031, 1, 20)):
+            Lease.objects.create(
+                hub_id=hub_id, property=Property.objects.create(hub_id=hub_id, name='P', address='x'),
+                tenant=tenant, start_date=start, monthly_rent=Decimal('900'),
+            )
+        generate_rent_charges('2031-01', hub_id)
+        post_rent_charges(hub_id)
+        assert sorted(LedgerEntry.objects.values_list('posted_on', flat=True)) == [date(2031, 1, 5), date(2031, 1, 20)]
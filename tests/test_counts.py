@@ -0,0 +1,148 @@
+"""Tests for datatable count strategies."""
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.urls import reverse
+
+from property_mgmt.counts import (
+    CountingPaginator, cached_count, count_rows, estimate_count, get_strategy, invalidate_counts,
+)
+from property_mgmt.models import Property, Tenant
+from property_mgmt.signals import bulk_updated
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def properties(db, hub_id):
+    """Properties over several pages."""
+    return Property.objects.bulk_create([
+        Property(hub_id=hub_id, name=f'Prop {i:03d}', address='Street', is_active=bool(i % 2))
+        for i in range(45)
+    ])
+
+
+@pytest.mark.django_db
+class TestCountStrategies:
+    """count_rows tests."""
+
+    def test_auto_is_cached_off_postgres(self):
+        """Test auto resolves to cached on SQLite."""
+        assert get_strategy() == 'cached'
+
+    def test_exact(self, hub_id, properties, django_assert_num_queries):
+        """Test exact counts hit the database every time."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        with django_assert_num_queries(2):
+            assert count_rows(qs, hub_id, 'exact') == (45, False)
+            assert count_rows(qs, hub_id, 'exact') == (45, False)
+
+    def test_cached_hits_cache(self, hub_id, properties, django_assert_num_queries):
+        """Test a repeated cached count doesn't query."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        assert cached_count(qs, hub_id) == 45
+        with django_assert_num_queries(0):
+            assert cached_count(qs, hub_id) == 45
+
+    def test_cached_per_filter(self, hub_id, properties):
+        """Test different filters get different cache entries."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        assert cached_count(qs, hub_id) == 45
+        assert cached_count(qs.filter(is_active=True), hub_id) == 22
+
+    def test_sort_order_shares_entry(self, hub_id, properties, django_assert_num_queries):
+        """Test the ordering doesn't split the cache."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        cached_count(qs.order_by('name'), hub_id)
+        with django_assert_num_queries(0):
+            cached_count(qs.order_by('-created_at'), hub_id)
+
+    def test_save_invalidates(self, hub_id, properties):
+        """Test a model save drops the hub's cached counts."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        assert cached_count(qs, hub_id) == 45
+        Property.objects.create(hub_id=hub_id, name='New', address='x')
+        assert cached_count(qs, hub_id) == 46
+
+    def test_bulk_write_invalidates(self, hub_id, properties):
+        """Test bulk_updated drops the model's cached counts."""
+        qs = Property.objects.filter(hub_id=hub_id, is_active=True)
+        assert cached_count(qs, hub_id) == 22
+        Property.objects.filter(hub_id=hub_id).update(is_active=True)
+        bulk_updated.send(sender=Property, hub_id=hub_id)
+        assert cached_count(qs, hub_id) == 45
+
+    def test_invalidation_scoped_to_model(self, hub_id, properties, django_assert_num_queries):
+        """Test invalidating tenants keeps property counts."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        cached_count(qs, hub_id)
+        invalidate_counts(hub_id, Tenant)
+        with django_assert_num_queries(0):
+            cached_count(qs, hub_id)
+
+    def test_estimate_off_postgres(self, hub_id, properties):
+        """Test estimates are unavailable on SQLite and fall back to cached counts."""
+        qs = Property.objects.filter(hub_id=hub_id)
+        assert estimate_count(qs) is None
+        assert count_rows(qs, hub_id, 'estimate') == (45, False)
+
+
+@pytest.mark.django_db
+class TestCountingPaginator:
+    """CountingPaginator tests."""
+
+    def test_corrects_overestimate(self, hub_id, properties, monkeypatch):
+        """Test a short page replaces an estimated total with the real one."""
+        monkeypatch.setattr('property_mgmt.counts.count_rows', lambda *args, **kwargs: (60, True))
+        paginator = CountingPaginator(Property.objects.filter(hub_id=hub_id).order_by('name'), 10, hub_id=hub_id)
+        assert paginator.count == 60
+        assert paginator.is_estimate
+        page = paginator.get_page(5)
+        assert len(page) == 5
+        assert paginator.count == 45
+        assert paginator.num_pages == 5
+        assert not paginator.is_estimate
+
+    def test_corrects_far_overestimate(self, hub_id, properties, monkeypatch):
+        """Test an empty page inside an estimated total counts and serves the real last page."""
+        monkeypatch.setattr('property_mgmt.counts.count_rows', lambda *args, **kwargs: (100000, True))
+        qs = Property.objects.filter(hub_id=hub_id).order_by('name')
+        paginator = CountingPaginator(qs, 10, hub_id=hub_id)
+        page = paginator.get_page(500)
+        assert (paginator.count, paginator.num_pages, page.number, len(page)) == (45, 5, 5, 5)
+        assert not paginator.is_estimate
+        page = async_to_sync(CountingPaginator(qs, 10, hub_id=hub_id).aget_page)(500)
+        assert (page.paginator.count, page.number, len(page)) == (45, 5, 5)
+
+    def test_elided_page_range(self, hub_id):
+        """Test the footer window stays constant on large lists."""
+        Property.objects.bulk_create([Property(hub_id=hub_id, name=f'P{i}', address='x') for i in range(500)])
+        paginator = CountingPaginator(Property.objects.filter(hub_id=hub_id).order_by('name'), 10, hub_id=hub_id)
+        window = list(paginator.get_elided_page_range(25, on_each_side=2, on_ends=1))
+        assert window == [1, paginator.ELLIPSIS, 23, 24, 25, 26, 27, paginator.ELLIPSIS, 50]
+
+
+@pytest.mark.django_db
+class TestListCounts:
+    """List view footer tests."""
+
+    def test_footer_window(self, auth_client, hub_id):
+        """Test the footer renders a window of page buttons, not every page."""
+        Property.objects.bulk_create([Property(hub_id=hub_id, name=f'P{i:04d}', address='x') for i in range(1000)])
+        response = auth_client.get(reverse('property_mgmt:properties_list'), {'page': 50}, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        content = response.content.decode()
+        assert 'of 1000' in content
+        assert content.count('pagination-btn') < 15
+
+    def test_list_count_cached(self, auth_client, hub_id, properties):
+        """Test later pages show the cached total."""
+        url = reverse('property_mgmt:properties_list')
+        auth_client.get(url, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        response = auth_client.get(url, {'page': 2}, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        assert response.context['page_obj'].paginator.count == 45
+        assert 'of 45' in response.content.decode()
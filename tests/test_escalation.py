@@ -0,0 +1,178 @@
+"""Tests for rent escalation."""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from property_mgmt import escalation
+from property_mgmt.escalation import (
+    add_months, apply_escalations, cpi_periods, escalate_cents, preview_escalations,
+)
+from property_mgmt.models import CPIIndex, EscalationRule, Lease, Property, RentHistory
+
+REVIEW = date(2031, 4, 1)
+
+
+@pytest.fixture
+def make_rule(hub_id, tenant):
+    def make(rent='1000.00', **rule):
+        prop = Property.objects.create(hub_id=hub_id, name='Flat', address='x', monthly_rent=Decimal(rent))
+        lease = Lease.objects.create(
+            hub_id=hub_id, property=prop, tenant=tenant, start_date=date.today() - timedelta(days=30),
+            monthly_rent=Decimal(rent),
+        )
+        rule.setdefault('next_review_date', REVIEW)
+        return EscalationRule.objects.create(hub_id=hub_id, lease=lease, **rule)
+    return make
+
+
+@pytest.fixture
+def cpi(db):
+    # March 2030 -> March 2031: +3.5%
+    CPIIndex.objects.create(index_name='IPC', period=date(2030, 3, 1), value=Decimal('110.000'))
+    CPIIndex.objects.create(index_name='IPC', period=date(2031, 3, 1), value=Decimal('113.850'))
+
+
+def _new_rent(hub_id):
+    changes, skipped = preview_escalations(hub_id, REVIEW)
+    return [c.new_rent for c in changes], skipped
+
+
+class TestArithmetic:
+    """Date and cents helpers."""
+
+    def test_add_months_clamps(self):
+        """Test month arithmetic clamps to the end of shorter months."""
+        assert add_months(date(2031, 1, 31), 1) == date(2031, 2, 28)
+        assert add_months(date(2031, 11, 15), 14) == date(2033, 1, 15)
+        assert add_months(date(2031, 3, 1), -13) == date(2030, 2, 1)
+
+    def test_cpi_periods(self):
+        """Test CPI reviews compare the month before the review with one interval earlier."""
+        assert cpi_periods(date(2031, 4, 15), 12) == (date(2030, 3, 1), date(2031, 3, 1))
+
+    @pytest.mark.parametrize('numpy', [True, False])
+    def test_escalate_cents(self, numpy, monkeypatch):
+        """Test rounding, bounds and steps match with and without NumPy."""
+        if not numpy:
+            monkeypatch.setattr(escalation, 'np', None)
+        new = escalate_cents(
+            [100001, 100000, 100000, 100000, 100000],
+            [103000, 120, 95, 1, 103000],
+            [100000, 100, 100, 1, 100000],
+            [None, None, 0, None, None],
+            [None, 5000, None, None, None],
+            [None, None, None, 123456, None],
+        )
+        assert new == [103001, 105000, 100000, 123456, 103000]
+
+
+@pytest.mark.django_db
+class TestPreview:
+    """preview_escalations tests."""
+
+    def test_fixed(self, hub_id, make_rule):
+        """Test a fixed rule raises the rent by its percentage."""
+        make_rule(rent='1234.56', kind='fixed', percent=Decimal('2.500'))
+        assert _new_rent(hub_id) == ([Decimal('1265.42')], [])
+
+    def test_cpi_with_cap(self, hub_id, make_rule, cpi):
+        """Test CPI rules follow the index, capped where set."""
+        make_rule(kind='cpi', index_name='IPC')
+        make_rule(kind='cpi', index_name='IPC', cap_percent=Decimal('2.000'))
+        assert sorted(_new_rent(hub_id)[0]) == [Decimal('1020.00'), Decimal('1035.00')]
+
+    def test_cpi_floor(self, hub_id, make_rule):
+        """Test a floor holds the rent when the index falls."""
+        CPIIndex.objects.create(index_name='IPC', period=date(2030, 3, 1), value=Decimal('110'))
+        CPIIndex.objects.create(index_name='IPC', period=date(2031, 3, 1), value=Decimal('99'))
+        make_rule(kind='cpi', index_name='IPC', floor_percent=Decimal('0'))
+        assert _new_rent(hub_id)[0] == [Decimal('1000.00')]
+
+    def test_missing_index_skipped(self, hub_id, make_rule):
+        """Test CPI rules without published values are skipped."""
+        rule = make_rule(kind='cpi', index_name='IPC')
+        assert _new_rent(hub_id) == ([], [rule.pk])
+
+    def test_steps(self, hub_id, make_rule):
+        """Test step rules take the next rent and are skipped once used up."""
+        make_rule(kind='step', steps=['1100.00', '1200'])
+        exhausted = make_rule(kind='step', steps=['1100.00'], reviews_applied=1)
+        assert _new_rent(hub_id) == ([Decimal('1100.00')], [exhausted.pk])
+
+    def test_not_due_or_inactive(self, hub_id, make_rule):
+        """Test rules not yet due or on inactive leases are ignored."""
+        make_rule(kind='fixed', percent=Decimal('3'), next_review_date=REVIEW + timedelta(days=1))
+        rule = make_rule(kind='fixed', percent=Decimal('3'))
+        Lease.objects.filter(pk=rule.lease_id).update(status='ended')
+        assert _new_rent(hub_id) == ([], [])
+
+    def test_writes_nothing(self, hub_id, make_rule):
+        """Test previewing leaves rents untouched."""
+        rule = make_rule(kind='fixed', percent=Decimal('3'))
+        preview_escalations(hub_id, REVIEW)
+        assert Lease.objects.get(pk=rule.lease_id).monthly_rent == Decimal('1000.00')
+        assert not RentHistory.objects.exists()
+
+
+@pytest.mark.django_db
+class TestApply:
+    """apply_escalations tests."""
+
+    def test_applies_and_records_history(self, hub_id, make_rule):
+        """Test rents, history and the next review are written together."""
+        rule = make_rule(kind='fixed', percent=Decimal('3'))
+        result = apply_escalations(hub_id, REVIEW)
+        assert (result.due, result.changed, result.skipped) == (1, 1, 0)
+
+        lease = Lease.objects.get(pk=rule.lease_id)
+        assert lease.monthly_rent == Decimal('1030.00')
+        assert Property.objects.get(pk=lease.property_id).monthly_rent == Decimal('1030.00')
+        history = RentHistory.objects.get()
+        assert (history.old_rent, history.new_rent, history.effective_date, history.reason) == (
+            Decimal('1000.00'), Decimal('1030.00'), REVIEW, 'fixed',
+        )
+        rule.refresh_from_db()
+        assert (rule.next_review_date, rule.reviews_applied) == (date(2032, 4, 1), 1)
+
+    def test_rerun_is_noop(self, hub_id, make_rule):
+        """Test a second run on the same day changes nothing."""
+        make_rule(kind='fixed', percent=Decimal('3'))
+        apply_escalations(hub_id, REVIEW)
+        assert apply_escalations(hub_id, REVIEW).changed == 0
+        assert RentHistory.objects.count() == 1
+
+    def test_property_rent_follows_current_lease_only(self, hub_id, make_rule, tenant):
+        """Test properties whose current lease wasn't escalated keep their rent."""
+        rule = make_rule(kind='fixed', percent=Decimal('3'))
+        Property.objects.filter(pk=rule.lease.property_id).update(current_lease=None)
+        apply_escalations(hub_id, REVIEW)
+        assert Property.objects.get(pk=rule.lease.property_id).monthly_rent == Decimal('1000.00')
+
+    def test_does_not_rebuild_occupancy(self, hub_id, make_rule, monkeypatch):
+        """Test a rent-only bulk write skips the occupancy rebuild."""
+        make_rule(kind='fixed', percent=Decimal('3'))
+        monkeypatch.setattr('property_mgmt.signals.rebuild_timeline', lambda *a, **k: pytest.fail('rebuilt'))
+        apply_escalations(hub_id, REVIEW)
+
+    def test_command(self, hub_id, make_rule, capsys):
+        """Test the command previews by default and applies with --apply."""
+        rule = make_rule(kind='fixed', percent=Decimal('3'))
+        call_command('property_mgmt_escalate_rents', date=REVIEW.isoformat())
+        out = capsys.readouterr().out
+        assert '1000.00 ->    1030.00  (+3.00%)' in out
+        assert 'preview only' in out
+        assert Lease.objects.get(pk=rule.lease_id).monthly_rent == Decimal('1000.00')
+
+        call_command('property_mgmt_escalate_rents', date=REVIEW.isoformat(), apply=True)
+        assert '1 rents changed' in capsys.readouterr().out
+        assert Lease.objects.get(pk=rule.lease_id).monthly_rent == Decimal('1030.00')
+
+    def test_command_defaults_to_local_date(self, hub_id, make_rule, capsys):
+        """Test the review date defaults to today in the active time zone, not the server's."""
+        make_rule(kind='fixed', percent=Decimal('3'))
+        with mock.patch('django.utils.timezone.localdate', return_value=REVIEW):
+            call_command('property_mgmt_escalate_rents', apply=True)
+        assert '1 rents changed' in capsys.readouterr().out
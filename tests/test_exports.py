@@ -0,0 +1,42 @@
+"""Tests for property_mgmt streaming exports."""
+import csv
+import io
+
+import pytest
+from django.urls import reverse
+
+from property_mgmt.exports import stream_excel
+
+
+@pytest.mark.django_db
+class TestStreamingExport:
+    """Streaming CSV/Excel export tests."""
+
+    def test_properties_csv_streams_rows(self, auth_client, property):
+        url = reverse('property_mgmt:properties_list')
+        response = auth_client.get(url, {'export': 'csv'})
+        assert response.streaming
+        body = b''.join(response.streaming_content).decode('utf-8-sig')
+        rows = list(csv.reader(io.StringIO(body)))
+        assert rows[0] == ['Name', 'Status', 'Is Active', 'Monthly Rent', 'Area Sqm', 'Bathrooms']
+        assert rows[1][:3] == ['Test Name', 'available', 'Yes']
+
+    def test_tenants_csv_respects_search(self, auth_client, tenant):
+        url = reverse('property_mgmt:tenants_list')
+        response = auth_client.get(url, {'export': 'csv', 'q': 'no-such-tenant'})
+        body = b''.join(response.streaming_content).decode('utf-8-sig')
+        assert len(body.strip().splitlines()) == 1
+
+    def test_excel_is_a_workbook(self, auth_client, property):
+        openpyxl = pytest.importorskip('openpyxl')
+        url = reverse('property_mgmt:properties_list')
+        response = auth_client.get(url, {'export': 'excel'})
+        assert response.status_code == 200
+        wb = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(wb.active.iter_rows(values_only=True))
+        assert rows[0][0] == 'Name'
+        assert rows[1][0] == 'Test Name'
+
+    def test_excel_without_openpyxl_returns_none(self, monkeypatch, property):
+        monkeypatch.setattr('property_mgmt.exports.Workbook', None)
+        assert stream_excel(None, [], [], 'x.xlsx') is None
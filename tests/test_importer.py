@@ -0,0 +1,127 @@
+"""Tests for the bulk import pipeline."""
+import io
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from property_mgmt.importer import import_file
+from property_mgmt.models import Lease, Property, SearchToken, Tenant
+
+
+def _csv(text):
+    return io.BytesIO(text.strip().encode('utf-8'))
+
+
+@pytest.mark.django_db
+class TestPropertyImport:
+    """Property rows."""
+
+    def test_creates_rows_in_chunks(self, hub_id):
+        rows = '\n'.join(f'Flat {i},Street {i},{500 + i},available,yes' for i in range(5))
+        data = _csv('Name,Address,Monthly Rent,Status,Is Active\n' + rows)
+        report = import_file('properties', data, 'p.csv', hub_id, chunk_size=2)
+        assert (report.rows, report.created, report.error_count) == (5, 5, 0)
+        prop = Property.objects.get(hub_id=hub_id, name='Flat 3')
+        assert prop.monthly_rent == Decimal('503')
+        assert prop.bedrooms == 0  # model default for a missing column
+        assert prop.search_document.startswith('flat 3')
+
+    def test_reports_invalid_rows(self, hub_id):
+        data = _csv('name,address,monthly_rent,status\nOk,x,100,rented\n,x,abc,bogus')
+        report = import_file('properties', data, 'p.csv', hub_id)
+        assert report.created == 1
+        assert report.error_count == 1
+        line, messages = report.errors[0]
+        assert line == 3
+        assert {m.split(':')[0] for m in messages} == {'name', 'monthly_rent', 'status'}
+
+    def test_accepts_choice_labels_and_boolean_words(self, hub_id):
+        data = _csv('name,address,status,is_active\nA,x,Under Maintenance,No')
+        import_file('properties', data, 'p.csv', hub_id)
+        prop = Property.objects.get(name='A')
+        assert (prop.status, prop.is_active) == ('maintenance', False)
+
+    def test_dry_run_writes_nothing(self, hub_id):
+        report = import_file('properties', _csv('name,address\nA,x'), 'p.csv', hub_id, dry_run=True)
+        assert report.created == 1
+        assert not Property.objects.exists()
+        assert report.summary().startswith('[dry run]')
+
+    def test_xlsx(self, hub_id):
+        openpyxl = pytest.importorskip('openpyxl')
+        wb = openpyxl.Workbook()
+        wb.active.append(['Name', 'Address', 'Bedrooms', 'Area Sqm'])
+        wb.active.append(['Loft', 'Calle 1', 2.0, 55.5])
+        buf = io.BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+        report = import_file('properties', buf, 'p.xlsx', hub_id)
+        assert report.created == 1
+        prop = Property.objects.get(name='Loft')
+        assert (prop.bedrooms, prop.area_sqm) == (2, Decimal('55.50'))
+
+
+@pytest.mark.django_db
+class TestTenantImport:
+    """Tenant rows and dedupe."""
+
+    def test_dedupes_within_file(self, hub_id):
+        data = _csv(
+            'name,email,id_number\n'
+            'Ana,ana@example.com,X1\n'
+            'Ana Dup,ANA@example.com,\n'
+            'Luis,luis@example.com,x 1\n'
+            'Marta,marta@example.com,M2'
+        )
+        report = import_file('tenants', data, 't.csv', hub_id)
+        assert (report.created, report.duplicates) == (2, 2)
+        assert set(Tenant.objects.values_list('name', flat=True)) == {'Ana', 'Marta'}
+
+    def test_updates_existing_tenant(self, hub_id, tenant, settings):
+        settings.PROPERTY_MGMT_SEARCH_BACKEND = 'tokens'
+        data = _csv('name,email,phone,id_number\nRenamed,other@example.com,+34 611,num-001')
+        report = import_file('tenants', data, 't.csv', hub_id)
+        assert (report.created, report.updated) == (0, 1)
+        tenant.refresh_from_db()
+        assert (tenant.name, tenant.email) == ('Renamed', 'other@example.com')
+        assert SearchToken.objects.filter(object_id=tenant.pk, token='renamed').exists()
+
+
+@pytest.mark.django_db
+class TestLeaseImport:
+    """Lease rows resolve references and reject overlaps."""
+
+    def test_imports_and_rejects_overlaps(self, hub_id, property, tenant):
+        data = _csv(
+            'property,tenant,start_date,end_date,monthly_rent\n'
+            'Test Name,NUM-001,2025-01-01,2025-06-30,900\n'
+            'Test Name,test@example.com,2025-07-01,,900\n'
+            'test name,NUM-001,2025-09-01,2025-12-31,900\n'
+            'Missing,nobody,2025-01-01,,900'
+        )
+        report = import_file('leases', data, 'l.csv', hub_id)
+        assert report.created == 2
+        assert sorted(line for line, _ in report.errors) == [4, 5]
+        assert Lease.objects.filter(property=property).count() == 2
+
+    def test_rejects_overlap_with_stored_lease(self, hub_id, property, tenant):
+        Lease.objects.create(
+            hub_id=hub_id, property=property, tenant=tenant,
+            start_date=date(2025, 1, 1), monthly_rent=Decimal('900'),
+        )
+        data = _csv('property,tenant,start_date,monthly_rent\nTest Name,NUM-001,2026-01-01,900')
+        report = import_file('leases', data, 'l.csv', hub_id)
+        assert (report.created, report.error_count) == (0, 1)
+
+
+@pytest.mark.django_db
+def test_import_command(hub_id, tmp_path):
+    path = tmp_path / 'props.csv'
+    path.write_text('name,address\nA,x\nB,y\n', encoding='utf-8')
+    out = StringIO()
+    call_command('property_mgmt_import', 'properties', str(path), hub=str(hub_id), stdout=out)
+    assert '2 created' in out.getvalue()
+    assert Property.objects.filter(hub_id=hub_id).count() == 2
@@ -0,0 +1,191 @@
+"""Tests for lease overlap detection and lease views."""
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import QuerySet
+from django.urls import reverse
+
+from property_mgmt.leasing import find_overlaps, overlapping_leases, validate_lease
+from property_mgmt.models import Lease, Property
+
+
+def _lease(hub_id, prop, tenant, start, end=None, status='active', save=True):
+    lease = Lease(
+        hub_id=hub_id, property=prop, tenant=tenant, start_date=start, end_date=end,
+        monthly_rent=Decimal('900.00'), status=status,
+    )
+    if save:
+        lease.save()
+    return lease
+
+
+def _spy_locks(locks):
+    select_for_update = QuerySet.select_for_update
+
+    def spy(qs, *args, **kwargs):
+        locks.append((qs.model, bool(connection.savepoint_ids)))
+        return select_for_update(qs, *args, **kwargs)
+    return mock.patch.object(QuerySet, 'select_for_update', spy)
+
+
+@pytest.mark.django_db
+class TestOverlapCheck:
+    """Single-lease overlap check."""
+
+    def test_detects_overlap(self, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        assert overlapping_leases(property.pk, date(2025, 6, 1), date(2026, 5, 31)).exists()
+
+    def test_adjacent_ranges_do_not_overlap(self, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        assert not overlapping_leases(property.pk, date(2026, 1, 1), None).exists()
+
+    def test_ranges_are_inclusive(self, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        assert overlapping_leases(property.pk, date(2025, 12, 31), date(2026, 6, 30)).exists()
+
+    def test_open_ended_lease_blocks_future(self, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1))
+        assert overlapping_leases(property.pk, date(2030, 1, 1), date(2030, 12, 31)).exists()
+
+    def test_ignores_inactive_and_deleted(self, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31), status='ended')
+        deleted = _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        deleted.is_deleted = True
+        deleted.save()
+        assert not overlapping_leases(property.pk, date(2025, 3, 1), date(2025, 4, 1)).exists()
+
+    def test_validate_allows_editing_itself(self, hub_id, property, tenant):
+        lease = _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        lease.end_date = date(2026, 6, 30)
+        validate_lease(lease)
+
+    def test_validate_rejects_overlap(self, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        with pytest.raises(ValidationError):
+            validate_lease(_lease(hub_id, property, tenant, date(2025, 6, 1), save=False))
+
+    def test_validate_rejects_reversed_dates(self, hub_id, property, tenant):
+        with pytest.raises(ValidationError):
+            validate_lease(_lease(hub_id, property, tenant, date(2025, 6, 1), date(2025, 1, 1), save=False))
+
+
+@pytest.mark.django_db
+class TestBulkOverlaps:
+    """Sort-and-sweep batch validation."""
+
+    def test_finds_overlaps_within_batch(self, hub_id, property, tenant):
+        other = Property.objects.create(hub_id=hub_id, name='Other', address='x')
+        batch = [
+            _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 6, 30), save=False),
+            _lease(hub_id, property, tenant, date(2025, 7, 1), date(2025, 12, 31), save=False),
+            _lease(hub_id, property, tenant, date(2025, 12, 1), None, save=False),
+            _lease(hub_id, other, tenant, date(2025, 1, 1), date(2025, 12, 31), save=False),
+        ]
+        overlaps = find_overlaps(batch, include_existing=False)
+        assert [(o.first, o.second) for o in overlaps] == [(batch[1], batch[2])]
+
+    def test_long_lease_covers_later_ones(self, hub_id, property, tenant):
+        batch = [
+            _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31), save=False),
+            _lease(hub_id, property, tenant, date(2025, 2, 1), date(2025, 2, 28), save=False),
+            _lease(hub_id, property, tenant, date(2025, 5, 1), date(2025, 5, 31), save=False),
+        ]
+        overlaps = find_overlaps(batch, include_existing=False)
+        assert {o.second.start_date for o in overlaps} == {date(2025, 2, 1), date(2025, 5, 1)}
+
+    def test_checks_against_existing_leases(self, hub_id, property, tenant):
+        existing = _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        batch = [_lease(hub_id, property, tenant, date(2025, 10, 1), None, save=False)]
+        overlaps = find_overlaps(batch)
+        assert len(overlaps) == 1
+        assert overlaps[0].first.pk == existing.pk
+
+    def test_skips_non_occupying_statuses(self, hub_id, property, tenant):
+        batch = [
+            _lease(hub_id, property, tenant, date(2025, 1, 1), None, save=False),
+            _lease(hub_id, property, tenant, date(2025, 1, 1), None, status='draft', save=False),
+        ]
+        assert find_overlaps(batch, include_existing=False) == []
+
+    def test_lock(self, hub_id, property, tenant):
+        """Test lock=True locks the batch's properties before reading their leases."""
+        batch = [_lease(hub_id, property, tenant, date(2025, 1, 1), None, save=False)]
+        locks = []
+        with _spy_locks(locks):
+            find_overlaps(batch)
+            assert locks == []
+            find_overlaps(batch, lock=True)
+        assert [model for model, _ in locks] == [Property]
+
+
+@pytest.mark.django_db
+class TestLeaseViews:
+    """Lease CRUD views."""
+
+    def _post_data(self, property, tenant, start='2025-01-01', end='2025-12-31'):
+        return {
+            'property': property.pk, 'tenant': tenant.pk, 'start_date': start, 'end_date': end,
+            'monthly_rent': '850.00', 'deposit': '1700.00', 'status': 'active',
+        }
+
+    def test_list_loads(self, auth_client, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1))
+        response = auth_client.get(reverse('property_mgmt:leases'))
+        assert response.status_code == 200
+        assert len(response.context['page_obj']) == 1
+
+    def test_search_by_tenant(self, auth_client, hub_id, property, tenant, settings):
+        settings.PROPERTY_MGMT_SEARCH_BACKEND = 'basic'
+        _lease(hub_id, property, tenant, date(2025, 1, 1))
+        url = reverse('property_mgmt:leases')
+        assert len(auth_client.get(url, {'q': 'test@example'}).context['page_obj']) == 1
+        assert len(auth_client.get(url, {'q': 'nobody'}).context['page_obj']) == 0
+
+    def test_add(self, auth_client, hub_id, property, tenant):
+        response = auth_client.post(reverse('property_mgmt:lease_add'), self._post_data(property, tenant))
+        assert response.status_code == 200
+        assert Lease.objects.filter(hub_id=hub_id, property=property).count() == 1
+
+    def test_add_overlap_rerenders_panel(self, auth_client, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 6, 1))
+        response = auth_client.post(reverse('property_mgmt:lease_add'), self._post_data(property, tenant))
+        assert response['HX-Retarget'] == '#lease-panel-content'
+        assert response.context['error']
+        assert Lease.objects.filter(hub_id=hub_id).count() == 1
+
+    def test_add_locks_property(self, auth_client, hub_id, property, tenant):
+        """Test the overlap check locks the property in the transaction that saves the lease."""
+        locks = []
+        with _spy_locks(locks):
+            auth_client.post(reverse('property_mgmt:lease_add'), self._post_data(property, tenant))
+        assert locks[0] == (Property, True)
+        assert Lease.objects.filter(hub_id=hub_id, property=property).count() == 1
+
+    def test_add_rejects_other_hub_property(self, auth_client, tenant):
+        foreign = Property.objects.create(hub_id=None, name='Foreign', address='x')
+        auth_client.post(reverse('property_mgmt:lease_add'), self._post_data(foreign, tenant))
+        assert not Lease.objects.exists()
+
+    def test_edit(self, auth_client, hub_id, property, tenant):
+        lease = _lease(hub_id, property, tenant, date(2025, 1, 1), date(2025, 12, 31))
+        url = reverse('property_mgmt:lease_edit', args=[lease.pk])
+        auth_client.post(url, self._post_data(property, tenant, end='2026-12-31'))
+        lease.refresh_from_db()
+        assert lease.end_date == date(2026, 12, 31)
+
+    def test_delete(self, auth_client, hub_id, property, tenant):
+        lease = _lease(hub_id, property, tenant, date(2025, 1, 1))
+        auth_client.post(reverse('property_mgmt:lease_delete', args=[lease.pk]))
+        lease.refresh_from_db()
+        assert lease.is_deleted
+
+    def test_export_csv(self, auth_client, hub_id, property, tenant):
+        _lease(hub_id, property, tenant, date(2025, 1, 1))
+        response = auth_client.get(reverse('property_mgmt:leases'), {'export': 'csv'})
+        body = b''.join(response.streaming_content).decode('utf-8-sig')
+        assert 'Test Name' in body and '2025-01-01' in body
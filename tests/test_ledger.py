@@ -0,0 +1,144 @@
+"""Tests for the rent ledger and materialized balances."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from property_mgmt.billing import generate_rent_charges
+from property_mgmt.ledger import (
+    leases_in_arrears, post_charge, post_entry, post_payment, post_rent_charges, rebuild_balances,
+    tenants_in_arrears,
+)
+from property_mgmt.models import Lease, LeaseBalance, LedgerEntry, Property, Tenant, TenantBalance
+
+TODAY = date(2031, 6, 1)
+
+
+@pytest.fixture
+def make_lease(hub_id, tenant):
+    def make(tenant=tenant, rent='1000.00'):
+        prop = Property.objects.create(hub_id=hub_id, name='Flat', address='x')
+        return Lease.objects.create(
+            hub_id=hub_id, property=prop, tenant=tenant, start_date=date(2031, 1, 1), monthly_rent=Decimal(rent),
+        )
+    return make
+
+
+@pytest.fixture
+def lease(make_lease):
+    return make_lease()
+
+
+def _balance(lease):
+    account = LeaseBalance.objects.get(lease=lease)
+    return account.balance, account.arrears_since
+
+
+@pytest.mark.django_db
+class TestPosting:
+    """post_entry tests."""
+
+    def test_charges_open_arrears(self, lease):
+        """Test the first unpaid charge dates the arrears and later ones don't move it."""
+        post_charge(lease, '1000', date(2031, 1, 1))
+        post_charge(lease, '1000', date(2031, 2, 1))
+        assert _balance(lease) == (Decimal('2000.00'), date(2031, 1, 1))
+
+    def test_payments_clear_oldest_first(self, lease):
+        """Test payments cover charges in posting order."""
+        for month in (1, 2, 3):
+            post_charge(lease, '1000', date(2031, month, 1))
+        post_payment(lease, '1500', date(2031, 3, 5))
+        assert _balance(lease) == (Decimal('1500.00'), date(2031, 2, 1))
+        post_payment(lease, '500', date(2031, 3, 6))
+        assert _balance(lease) == (Decimal('1000.00'), date(2031, 3, 1))
+        post_payment(lease, '1000', date(2031, 3, 7))
+        assert _balance(lease) == (Decimal('0.00'), None)
+
+    def test_prepayment_covers_next_charge(self, lease):
+        """Test a credit balance absorbs later charges."""
+        post_payment(lease, '1500', date(2031, 1, 1))
+        post_charge(lease, '1000', date(2031, 1, 1))
+        assert _balance(lease) == (Decimal('-500.00'), None)
+        post_charge(lease, '1000', date(2031, 2, 1))
+        assert _balance(lease) == (Decimal('500.00'), date(2031, 2, 1))
+
+    def test_adjustments_are_signed(self, lease):
+        """Test negative adjustments credit the account."""
+        post_charge(lease, '1000', date(2031, 1, 1))
+        post_entry(lease, 'adjustment', '-1000', date(2031, 1, 2), reference='Waived')
+        assert _balance(lease) == (Decimal('0.00'), None)
+
+    def test_tenant_balance_spans_leases(self, make_lease, tenant):
+        """Test tenant balances add up their leases and take the oldest arrears."""
+        first, second = make_lease(), make_lease()
+        post_charge(first, '1000', date(2031, 3, 1))
+        post_charge(second, '700', date(2031, 2, 1))
+        post_payment(first, '400', date(2031, 3, 2))
+        account = TenantBalance.objects.get(tenant=tenant)
+        assert (account.balance, account.arrears_since) == (Decimal('1300.00'), date(2031, 2, 1))
+
+
+@pytest.mark.django_db
+class TestArrears:
+    """Arrears queries."""
+
+    def test_days_in_arrears(self, hub_id, make_lease, tenant):
+        """Test only accounts unpaid for longer than the cutoff are returned."""
+        late = make_lease()
+        post_charge(late, '1000', date(2031, 3, 1))
+        other = Tenant.objects.create(hub_id=hub_id, name='Recent')
+        post_charge(make_lease(tenant=other), '1000', date(2031, 5, 1))
+
+        assert [b.tenant_id for b in tenants_in_arrears(hub_id, days=60, as_of=TODAY)] == [tenant.pk]
+        assert [b.lease_id for b in leases_in_arrears(hub_id, days=60, as_of=TODAY)] == [late.pk]
+        assert tenants_in_arrears(hub_id, days=30, as_of=TODAY).count() == 2
+
+    def test_lease_moves_to_new_tenant(self, hub_id, lease, tenant):
+        """Test reassigning a lease moves its balance between tenants."""
+        post_charge(lease, '1000', date(2031, 3, 1))
+        other = Tenant.objects.create(hub_id=hub_id, name='New')
+        lease.tenant = other
+        lease.save()
+        assert TenantBalance.objects.get(tenant=tenant).balance == Decimal('0.00')
+        assert TenantBalance.objects.get(tenant=other).arrears_since == date(2031, 3, 1)
+
+
+@pytest.mark.django_db
+class TestBulk:
+    """post_rent_charges and rebuild_balances tests."""
+
+    def test_post_rent_charges(self, hub_id, lease):
+        """Test generated charges are posted once, with balances updated."""
+        generate_rent_charges('2031-01', hub_id)
+        generate_rent_charges('2031-02', hub_id)
+        assert post_rent_charges(hub_id, chunk_size=1).posted == 2
+        assert post_rent_charges(hub_id).posted == 0
+        assert _balance(lease) == (Decimal('2000.00'), date(2031, 1, 1))
+        assert list(LedgerEntry.objects.order_by('running_debits').values_list('running_debits', flat=True)) == [
+            Decimal('1000.00'), Decimal('2000.00'),
+        ]
+
+    def test_rebuild_repairs_drift(self, hub_id, lease, tenant):
+        """Test a rebuild recomputes running totals and balances from the entries."""
+        post_charge(lease, '1000', date(2031, 1, 1))
+        post_charge(lease, '1000', date(2031, 2, 1))
+        post_payment(lease, '1000', date(2031, 2, 2))
+        LedgerEntry.objects.update(running_debits=0)
+        LeaseBalance.objects.update(balance=0, arrears_since=None)
+        TenantBalance.objects.all().delete()
+
+        result = rebuild_balances(hub_id, chunk_size=1)
+        assert (result.leases, result.entries, result.fixed) == (1, 3, 3)
+        assert _balance(lease) == (Decimal('1000.00'), date(2031, 2, 1))
+        assert TenantBalance.objects.get(tenant=tenant).balance == Decimal('1000.00')
+        assert rebuild_balances(hub_id).fixed == 0
+
+    def test_command(self, hub_id, lease, capsys):
+        """Test the command posts charges and rebuilds."""
+        generate_rent_charges('2031-01', hub_id)
+        call_command('property_mgmt_rebuild_balances', post_charges=True)
+        out = capsys.readouterr().out
+        assert '1 rent charges posted' in out
+        assert '1 leases, 1 entries, 0 running totals fixed' in out
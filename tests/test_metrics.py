@@ -0,0 +1,73 @@
+"""Tests for property_mgmt dashboard metrics cache."""
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from property_mgmt.metrics import compute_dashboard_metrics, get_dashboard_metrics
+from property_mgmt.models import Property, Lease
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def portfolio(db, hub_id, tenant):
+    today = timezone.localdate()
+    rented = Property.objects.create(hub_id=hub_id, name='A', address='x', status='rented', monthly_rent=Decimal('1000'))
+    Property.objects.create(hub_id=hub_id, name='B', address='x', status='available', monthly_rent=Decimal('800'))
+    Property.objects.create(hub_id=hub_id, name='C', address='x', status='sold', monthly_rent=Decimal('500'))
+    Lease.objects.create(
+        hub_id=hub_id, property=rented, tenant=tenant, start_date=today - timedelta(days=300),
+        end_date=today + timedelta(days=10), monthly_rent=Decimal('950'),
+    )
+    return rented
+
+
+@pytest.mark.django_db
+class TestDashboardMetrics:
+    """Dashboard metrics tests."""
+
+    def test_compute(self, hub_id, portfolio):
+        m = compute_dashboard_metrics(hub_id)
+        assert m['total_properties'] == 3
+        assert m['total_tenants'] == 1
+        assert m['occupancy_rate'] == 50.0
+        assert m['vacancies'] == 1
+        assert m['active_leases'] == 1
+        assert m['expiring_leases'] == 1
+        assert m['rent_roll'] == Decimal('950')
+        assert m['potential_rent'] == Decimal('1800')
+
+    def test_cached_hits_run_no_queries(self, hub_id, portfolio, django_assert_num_queries):
+        get_dashboard_metrics(str(hub_id))
+        with django_assert_num_queries(0):
+            get_dashboard_metrics(str(hub_id))
+
+    def test_save_invalidates(self, hub_id, portfolio):
+        assert get_dashboard_metrics(str(hub_id))['total_properties'] == 3
+        Property.objects.create(hub_id=hub_id, name='D', address='x')
+        assert get_dashboard_metrics(str(hub_id))['total_properties'] == 4
+
+    def test_delete_invalidates(self, hub_id, tenant):
+        assert get_dashboard_metrics(hub_id)['total_tenants'] == 1
+        tenant.delete()
+        assert get_dashboard_metrics(hub_id)['total_tenants'] == 0
+
+    def test_bulk_action_invalidates(self, auth_client, hub_id, property):
+        assert get_dashboard_metrics(hub_id)['total_properties'] == 1
+        auth_client.post(reverse('property_mgmt:properties_bulk_action'), {'ids': str(property.pk), 'action': 'delete'})
+        assert get_dashboard_metrics(hub_id)['total_properties'] == 0
+
+    def test_dashboard_view_uses_cache(self, auth_client, portfolio):
+        url = reverse('property_mgmt:dashboard')
+        auth_client.get(url)
+        response = auth_client.get(url)
+        assert response.context['total_properties'] == 3
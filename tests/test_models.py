@@ -83,3 +83,51 @@ class TestTenant:
         assert tenant.is_active != original
 
 
+
+
+class _RecordingEditor:
+    """Schema editor stand-in for a backend without partial indexes."""
+
+    class connection:
+        class features:
+            supports_partial_indexes = False
+
+    def __init__(self):
+        self.indexes = set()
+
+    def add_index(self, model, index):
+        self.indexes.add((model._meta.model_name, index.name))
+
+    def remove_index(self, model, index):
+        self.indexes.remove((model._meta.model_name, index.name))
+
+
+@pytest.mark.django_db
+class TestIndexFallbacks:
+    """Full-index fallbacks kept by the migrations."""
+
+    def test_match_partial_indexes(self):
+        """Test replaying the migrations leaves one fallback per current partial index on is_deleted."""
+        from django.apps import apps
+        from django.db import connection
+        from django.db.migrations.loader import MigrationLoader
+
+        from property_mgmt.migrations._fallback_indexes import FullIndexFallbacks, full_index, needs_fallback
+
+        loader = MigrationLoader(connection)
+        app_label = apps.get_containing_app_config('property_mgmt.models').label
+        editor = _RecordingEditor()
+        for key in loader.graph.forwards_plan(loader.graph.leaf_nodes(app_label)[0]):
+            if key[0] != app_label:
+                continue
+            operations = [op for op in loader.graph.nodes[key].operations if isinstance(op, FullIndexFallbacks)]
+            if operations:
+                state_apps = loader.project_state(key).apps
+                for operation in operations:
+                    operation._forwards(state_apps, editor)
+        expected = {
+            (model._meta.model_name, full_index(index).name)
+            for model in apps.get_app_config(app_label).get_models()
+            for index in model._meta.indexes if needs_fallback(index)
+        }
+        assert expected and editor.indexes == expected
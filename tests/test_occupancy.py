@@ -0,0 +1,164 @@
+"""Tests for property status derived from leases."""
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from property_mgmt.counts import _generation
+from property_mgmt.models import Lease, OccupancySpan, Property
+from property_mgmt.occupancy import reconcile_hub, reconcile_statuses, refresh_property
+from property_mgmt.search import get_search_backend
+
+
+def _lease(prop, tenant, start, end=None, status='active'):
+    return Lease.objects.create(
+        hub_id=prop.hub_id, property=prop, tenant=tenant, start_date=start, end_date=end,
+        monthly_rent=Decimal('800'), status=status,
+    )
+
+
+@pytest.fixture
+def today():
+    return timezone.localdate()
+
+
+@pytest.mark.django_db
+class TestLeaseWrites:
+    """Incremental status updates on lease writes."""
+
+    def test_current_lease_rents_property(self, property, tenant, today):
+        """Test a lease covering today marks the property rented."""
+        lease = _lease(property, tenant, today - timedelta(days=10))
+        property.refresh_from_db()
+        assert property.status == 'rented'
+        assert property.current_lease_id == lease.pk
+
+    def test_future_lease_keeps_available(self, property, tenant, today):
+        """Test a lease starting later doesn't rent the property yet."""
+        _lease(property, tenant, today + timedelta(days=10))
+        property.refresh_from_db()
+        assert property.status == 'available'
+        assert property.current_lease_id is None
+
+    def test_terminating_frees_property(self, property, tenant, today):
+        """Test terminating the current lease makes the property available."""
+        lease = _lease(property, tenant, today - timedelta(days=10))
+        lease.status = 'terminated'
+        lease.save()
+        property.refresh_from_db()
+        assert (property.status, property.current_lease_id) == ('available', None)
+
+    def test_moving_lease_updates_both(self, hub_id, property, tenant, today):
+        """Test moving a lease to another property updates the old and the new one."""
+        other = Property.objects.create(hub_id=hub_id, name='Other', address='x')
+        lease = _lease(property, tenant, today)
+        lease.property = other
+        lease.save()
+        property.refresh_from_db()
+        other.refresh_from_db()
+        assert property.status == 'available'
+        assert (other.status, other.current_lease_id) == ('rented', lease.pk)
+
+    def test_delete_frees_property(self, property, tenant, today):
+        """Test deleting the current lease clears the pointer."""
+        lease = _lease(property, tenant, today)
+        lease.delete()
+        property.refresh_from_db()
+        assert (property.status, property.current_lease_id) == ('available', None)
+
+    def test_manual_status_kept(self, property, tenant, today):
+        """Test maintenance isn't overwritten, but the lease pointer is kept."""
+        Property.objects.filter(pk=property.pk).update(status='maintenance')
+        lease = _lease(property, tenant, today)
+        property.refresh_from_db()
+        assert (property.status, property.current_lease_id) == ('maintenance', lease.pk)
+
+    def test_search_document_follows_status(self, hub_id, property, tenant, today):
+        """Test the derived status is searchable."""
+        _lease(property, tenant, today)
+        backend = get_search_backend()
+        assert property in backend.filter(Property.objects.filter(hub_id=hub_id), 'rented', hub_id)
+
+    def test_refresh_missing(self):
+        """Test refreshing an unknown property is a no-op."""
+        assert refresh_property(uuid.uuid4()) is False
+
+
+@pytest.mark.django_db
+class TestReconcile:
+    """Nightly reconciliation tests."""
+
+    def test_lease_starting_today(self, hub_id, property, tenant, today):
+        """Test a lease that starts on the reconcile date rents the property."""
+        lease = _lease(property, tenant, today + timedelta(days=1))
+        result = reconcile_hub(hub_id, as_of=today + timedelta(days=1))
+        property.refresh_from_db()
+        assert result.updated == 1
+        assert (property.status, property.current_lease_id) == ('rented', lease.pk)
+
+    def test_lease_expired(self, hub_id, property, tenant, today):
+        """Test an expired lease is ended and its property freed."""
+        lease = _lease(property, tenant, today - timedelta(days=30), today)
+        result = reconcile_hub(hub_id, as_of=today + timedelta(days=1))
+        lease.refresh_from_db()
+        property.refresh_from_db()
+        assert result.expired_leases == 1
+        assert lease.status == 'ended'
+        assert not OccupancySpan.objects.filter(lease_id=lease.pk).exists()
+        assert (property.status, property.current_lease_id) == ('available', None)
+
+    def test_expiry_skips_rebuild(self, hub_id, property, tenant, today):
+        """Test expiring leases drops the cached lease counts without rebuilding the timeline."""
+        _lease(property, tenant, today - timedelta(days=30), today)
+        generation = _generation(hub_id, Lease)
+        with mock.patch('property_mgmt.signals.rebuild_timeline') as rebuild:
+            assert reconcile_hub(hub_id, as_of=today + timedelta(days=1)).expired_leases == 1
+        assert not rebuild.called
+        assert _generation(hub_id, Lease) != generation
+
+    def test_fixes_drift(self, hub_id, tenant, today):
+        """Test statuses written around the engine are corrected in bulk."""
+        props = [Property.objects.create(hub_id=hub_id, name=f'P{i}', address='x') for i in range(5)]
+        for prop in props[:3]:
+            _lease(prop, tenant, today - timedelta(days=1))
+        Property.objects.filter(hub_id=hub_id).update(status='available', current_lease=None)
+        result = reconcile_hub(hub_id, as_of=today, chunk_size=2)
+        assert (result.properties, result.updated) == (5, 3)
+        assert Property.objects.filter(hub_id=hub_id, status='rented').count() == 3
+
+    def test_idempotent(self, hub_id, property, tenant, today):
+        """Test a second run changes nothing."""
+        _lease(property, tenant, today)
+        reconcile_hub(hub_id, as_of=today)
+        assert reconcile_hub(hub_id, as_of=today).updated == 0
+
+    def test_all_hubs(self, hub_id, property):
+        """Test reconciling without a hub covers every hub."""
+        assert [r.hub_id for r in reconcile_statuses()] == [hub_id]
+
+    def test_command(self, hub_id, property, tenant, today, capsys):
+        """Test the management command."""
+        _lease(property, tenant, today - timedelta(days=30), today - timedelta(days=1))
+        call_command('property_mgmt_reconcile_status', '--hub', str(hub_id))
+        assert '1 leases ended' in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestStatusFilter:
+    """Properties list status filter."""
+
+    def test_filter_by_status(self, auth_client, hub_id, tenant, today):
+        """Test the list filters on the stored status column."""
+        rented = Property.objects.create(hub_id=hub_id, name='Rented', address='x')
+        Property.objects.create(hub_id=hub_id, name='Free', address='x')
+        _lease(rented, tenant, today)
+        response = auth_client.get(
+            reverse('property_mgmt:properties_list'), {'status': 'rented'},
+            HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body',
+        )
+        assert [p.name for p in response.context['properties']] == ['Rented']
@@ -0,0 +1,231 @@
+"""Tests for property_mgmt keyset pagination."""
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.urls import reverse
+
+from property_mgmt.models import Property, Tenant
+from property_mgmt.pagination import KeysetPaginator, encode_cursor, sort_key, sort_ordering
+from property_mgmt.views import PROPERTY_SORT_FIELDS, TENANT_SORT_FIELDS
+
+
+@pytest.fixture
+def many_properties(db, hub_id):
+    """Properties with duplicate sort values and NULL areas."""
+    objs = []
+    for i in range(23):
+        objs.append(Property(
+            hub_id=hub_id,
+            name=f'Prop {i % 5}',
+            address='Street',
+            bathrooms=i % 3,
+            monthly_rent=Decimal(100 * (i % 4)),
+            area_sqm=None if i % 4 == 0 else Decimal(i),
+            status='rented' if i % 2 else 'available',
+            is_active=bool(i % 2),
+        ))
+    return Property.objects.bulk_create(objs)
+
+
+@pytest.fixture
+def many_tenants(db, hub_id):
+    """Tenants with duplicate sort values."""
+    return Tenant.objects.bulk_create([
+        Tenant(hub_id=hub_id, name=f'Tenant {i % 4}', email=f't{i % 3}@example.com',
+               phone=str(i % 2), id_number=f'ID-{i % 6}', is_active=bool(i % 2))
+        for i in range(17)
+    ])
+
+
+def _walk(qs, field, sort_dir, per_page=4):
+    paginator = KeysetPaginator(qs, field, sort_dir, per_page)
+    pages = [paginator.get_page()]
+    while pages[-1].next_cursor:
+        pages.append(paginator.get_page(pages[-1].next_cursor))
+    return paginator, pages
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    """Keyset paginator tests."""
+
+    @pytest.mark.parametrize('field', sorted(set(PROPERTY_SORT_FIELDS.values())))
+    @pytest.mark.parametrize('sort_dir', ['asc', 'desc'])
+    def test_property_pages_cover_all_rows(self, hub_id, many_properties, field, sort_dir):
+        """Walking forward visits every row exactly once."""
+        qs = Property.objects.filter(hub_id=hub_id, is_deleted=False)
+        _, pages = _walk(qs, field, sort_dir)
+        seen = [obj.pk for page in pages for obj in page]
+        assert len(seen) == len(set(seen)) == len(many_properties)
+
+    @pytest.mark.parametrize('field', sorted(set(TENANT_SORT_FIELDS.values())))
+    def test_tenant_pages_cover_all_rows(self, hub_id, many_tenants, field):
+        """Walking forward visits every tenant exactly once."""
+        qs = Tenant.objects.filter(hub_id=hub_id, is_deleted=False)
+        _, pages = _walk(qs, field, 'asc', per_page=5)
+        seen = [obj.pk for page in pages for obj in page]
+        assert len(seen) == len(set(seen)) == len(many_tenants)
+
+    @pytest.mark.parametrize('sort_dir', ['asc', 'desc'])
+    def test_previous_cursor_returns_prior_page(self, hub_id, many_properties, sort_dir):
+        """Stepping back from page N yields exactly page N-1."""
+        qs = Property.objects.filter(hub_id=hub_id, is_deleted=False)
+        paginator, pages = _walk(qs, 'area_sqm', sort_dir)
+        for prev, page in zip(pages, pages[1:]):
+            back = paginator.get_page(page.previous_cursor)
+            assert [o.pk for o in back] == [o.pk for o in prev]
+
+    def test_skips_count(self, hub_id, many_properties, django_assert_num_queries):
+        """Fetching a page runs a single query and no COUNT."""
+        qs = Property.objects.filter(hub_id=hub_id, is_deleted=False)
+        paginator = KeysetPaginator(qs, 'name', 'asc', 10)
+        with django_assert_num_queries(1):
+            page = paginator.get_page()
+        assert page.has_next and not page.has_previous
+
+    def test_foreign_cursor_is_ignored(self, hub_id, many_properties):
+        """A cursor issued for another sort order falls back to page one."""
+        qs = Property.objects.filter(hub_id=hub_id, is_deleted=False)
+        token = encode_cursor('monthly_rent', 'asc', 'next', ['100', many_properties[0].pk])
+        page = KeysetPaginator(qs, 'name', 'asc', 5).get_page(token)
+        assert not page.has_previous
+
+    def test_tampered_cursor_is_ignored(self, hub_id, many_properties):
+        """A token that fails signature validation falls back to page one."""
+        qs = Property.objects.filter(hub_id=hub_id, is_deleted=False)
+        page = KeysetPaginator(qs, 'name', 'asc', 5).get_page('garbage')
+        assert not page.has_previous
+
+
+@pytest.mark.django_db
+class TestCursorViews:
+    """Cursor mode on the list views."""
+
+    def test_properties_cursor_mode(self, auth_client, many_properties):
+        """Cursor mode renders next token and no total by default."""
+        url = reverse('property_mgmt:properties_list')
+        response = auth_client.get(url, {'paging': 'cursor'}, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        assert response.status_code == 200
+        assert response.context['page_obj'].next_cursor
+        assert b'results' not in response.content
+
+    def test_properties_cursor_mode_with_count(self, auth_client, many_properties):
+        """Passing count=1 includes the total."""
+        url = reverse('property_mgmt:properties_list')
+        response = auth_client.get(url, {'paging': 'cursor', 'count': '1'})
+        assert response.status_code == 200
+        assert response.context['page_obj'].paginator.count == len(many_properties)
+
+    def test_tenants_cursor_next_page(self, auth_client, many_tenants):
+        """Following the next token returns a second page."""
+        url = reverse('property_mgmt:tenants_list')
+        first = auth_client.get(url, {'paging': 'cursor'})
+        token = first.context['page_obj'].next_cursor
+        second = auth_client.get(url, {'paging': 'cursor', 'cursor': token})
+        assert second.status_code == 200
+        assert second.context['page_obj'].has_previous
+
+
+@pytest.fixture
+def keyed_properties(db, hub_id):
+    """Properties whose names differ only in case and accents, with NULL areas and equal rents."""
+    names = ['alpha', 'Alpha', 'ALPHA', 'Élan', 'elan', 'beta', 'Zeta', 'zeta  house', 'Gamma', 'gamma']
+    return Property.objects.bulk_create([
+        Property(
+            hub_id=hub_id, name=names[i % len(names)], address='Street',
+            monthly_rent=Decimal(100 * (i % 3)), area_sqm=None if i % 3 == 0 else Decimal(i % 5),
+        )
+        for i in range(23)
+    ])
+
+
+def _expected(objs, key, descending, nulls):
+    ordered = sorted(objs, key=lambda o: (key(o), o.pk))
+    if descending:
+        ordered.reverse()
+    return [o.pk for o in sorted(ordered, key=nulls)]
+
+
+def _view_pages(client, sort, sort_dir, paging):
+    url = reverse('property_mgmt:properties_list')
+    params = {'sort': sort, 'dir': sort_dir, 'per_page': 10, 'paging': paging}
+    page = client.get(url, params).context['page_obj']
+    pages = [page]
+    while page.next_cursor if paging == 'cursor' else page.has_next():
+        if paging == 'cursor':
+            params['cursor'] = page.next_cursor
+        else:
+            params['page'] = page.next_page_number()
+        page = client.get(url, params).context['page_obj']
+        pages.append(page)
+    return pages
+
+
+SORT_KEYS = {
+    'name': lambda o: sort_key(o.name),
+    'area_sqm': lambda o: o.area_sqm or Decimal('0'),
+    'monthly_rent': lambda o: o.monthly_rent,
+}
+
+NULLS = {'area_sqm': lambda o: o.area_sqm is None}
+
+
+@pytest.mark.django_db
+class TestSortKeys:
+    """Sort key column tests."""
+
+    def test_name_key(self, hub_id):
+        """Test name keys ignore case, accents and spacing and follow renames."""
+        prop = Property.objects.create(hub_id=hub_id, name='Élan  TOWER', address='x')
+        assert prop.name_key == 'elan tower'
+        prop.name = 'Straße'
+        prop.save(update_fields=['name'])
+        assert Property.objects.get(pk=prop.pk).name_key == 'strasse'
+        tenant, = Tenant.objects.bulk_create([Tenant(hub_id=hub_id, name='ÁNA')])
+        assert Tenant.objects.get(pk=tenant.pk).name_key == 'ana'
+
+    @pytest.mark.parametrize('descending', [False, True])
+    def test_null_area_sorts_last(self, hub_id, keyed_properties, descending):
+        """Test properties without an area come last in both directions."""
+        qs = Property.objects.filter(hub_id=hub_id).order_by(*sort_ordering(Property, 'area_key', descending))
+        areas = [o.area_sqm for o in qs]
+        known = [a for a in areas if a is not None]
+        assert areas == known + [None] * (len(areas) - len(known))
+        assert known == sorted(known, reverse=descending)
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='SQLite query plan')
+    @pytest.mark.parametrize('descending', [False, True])
+    @pytest.mark.parametrize('field', ['name_key', 'area_key'])
+    def test_sorts_from_index(self, hub_id, field, descending):
+        """Test key sorts read the index in order instead of sorting."""
+        qs = Property.objects.filter(hub_id=hub_id).order_by(*sort_ordering(Property, field, descending))
+        plan = qs[:11].explain()
+        assert f'pm_prop_hub_{field.replace("_", "")}' in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+@pytest.mark.django_db
+class TestPageBoundaries:
+    """Walking every page of the property list."""
+
+    @pytest.mark.parametrize('paging', ['offset', 'cursor'])
+    @pytest.mark.parametrize('sort_dir', ['asc', 'desc'])
+    @pytest.mark.parametrize('sort', sorted(SORT_KEYS))
+    def test_no_duplicates_or_gaps(self, auth_client, keyed_properties, sort, sort_dir, paging):
+        """Test pages concatenate to the full (key, id) order, whatever the paging."""
+        pages = _view_pages(auth_client, sort, sort_dir, paging)
+        seen = [obj.pk for page in pages for obj in page]
+        nulls = NULLS.get(sort, lambda o: False)
+        assert seen == _expected(keyed_properties, SORT_KEYS[sort], sort_dir == 'desc', nulls)
+        assert [len(page) for page in pages] == [10, 10, 3]
+
+    @pytest.mark.parametrize('sort_dir', ['asc', 'desc'])
+    @pytest.mark.parametrize('sort', sorted(SORT_KEYS))
+    def test_backwards(self, auth_client, keyed_properties, sort, sort_dir):
+        """Test previous cursors step back through the same pages."""
+        pages = _view_pages(auth_client, sort, sort_dir, 'cursor')
+        url = reverse('property_mgmt:properties_list')
+        params = {'sort': sort, 'dir': sort_dir, 'per_page': 10, 'paging': 'cursor'}
+        for prev, page in zip(pages, pages[1:]):
+            back = auth_client.get(url, {**params, 'cursor': page.previous_cursor}).context['page_obj']
+            assert [o.pk for o in back] == [o.pk for o in prev]
@@ -0,0 +1,116 @@
+"""Tests for per-view profiling."""
+import logging
+
+import pytest
+from django.template.backends.django import Template as BackendTemplate
+from django.urls import reverse
+
+from property_mgmt.profiling import get_profiles, record, reset_profiles
+
+
+@pytest.fixture(autouse=True)
+def clean_profiles():
+    reset_profiles()
+    yield
+    reset_profiles()
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.PROPERTY_MGMT_PROFILING = True
+    return settings
+
+
+def _view(name):
+    return next(v for v in get_profiles()['views'] if v['view'] == name)
+
+
+@pytest.mark.django_db
+class TestProfiledViews:
+    """profiled decorator tests."""
+
+    def test_off_by_default(self, auth_client, property):
+        """Test nothing is recorded unless profiling is enabled."""
+        auth_client.get(reverse('property_mgmt:properties_list'))
+        assert get_profiles()['views'] == []
+
+    def test_records_metrics(self, profiling, auth_client, property):
+        """Test a request records queries, db time, render time and size."""
+        response = auth_client.get(reverse('property_mgmt:properties_list'))
+        stats = _view('properties_list')
+        assert stats['count'] == 1
+        assert sum(stats['histogram'].values()) == 1
+        assert stats['avg']['queries'] >= 1
+        assert stats['avg']['db_ms'] > 0
+        assert stats['avg']['render_ms'] > 0
+        assert stats['max']['bytes'] == len(response.content)
+
+    def test_partial_render_timed(self, profiling, auth_client, property):
+        """Test htmx partials rendered inside the view count as render time."""
+        auth_client.get(reverse('property_mgmt:properties_list'), HTTP_HX_REQUEST='true')
+        assert _view('properties_list')['avg']['render_ms'] > 0
+
+    def test_template_render_untouched(self, profiling, auth_client, property):
+        """Test profiling leaves Django's template rendering unpatched."""
+        original = BackendTemplate.render
+        auth_client.get(reverse('property_mgmt:properties_list'))
+        assert BackendTemplate.render is original
+
+    def test_streaming_size_skipped(self, profiling, auth_client, property):
+        """Test streamed exports are timed without a response size."""
+        auth_client.get(reverse('property_mgmt:properties_list'), {'export': 'csv'})
+        stats = _view('properties_list')
+        assert stats['count'] == 1
+        assert 'bytes' not in stats['avg']
+
+    def test_threshold_logged(self, profiling, auth_client, property, caplog):
+        """Test a request over a threshold is logged."""
+        profiling.PROPERTY_MGMT_PROFILING_THRESHOLDS = {'queries': 0}
+        with caplog.at_level(logging.WARNING, logger='property_mgmt.profiling'):
+            auth_client.get(reverse('property_mgmt:properties_list'))
+        assert 'Slow view properties_list (queries)' in caplog.text
+
+    def test_under_thresholds_not_logged(self, profiling, auth_client, caplog):
+        """Test fast requests stay quiet."""
+        profiling.PROPERTY_MGMT_PROFILING_THRESHOLDS = {metric: None for metric in get_profiles()['thresholds']}
+        with caplog.at_level(logging.WARNING, logger='property_mgmt.profiling'):
+            auth_client.get(reverse('property_mgmt:dashboard'))
+        assert caplog.text == ''
+
+
+class TestHistogram:
+    """Histogram aggregation tests."""
+
+    def test_buckets_and_order(self):
+        """Test samples land in their buckets and views sort by time spent."""
+        for total in (3, 40, 40, 7000):
+            record('slow', {'total_ms': total, 'queries': 2, 'db_ms': 1, 'render_ms': 1, 'bytes': 100})
+        record('fast', {'total_ms': 1, 'queries': 1, 'db_ms': 0, 'render_ms': 0, 'bytes': 10})
+        views = get_profiles()['views']
+        assert [v['view'] for v in views] == ['slow', 'fast']
+        assert views[0]['histogram']['<=5ms'] == 1
+        assert views[0]['histogram']['<=50ms'] == 2
+        assert views[0]['histogram']['>5000ms'] == 1
+        assert views[0]['max']['total_ms'] == 7000
+
+
+@pytest.mark.django_db
+class TestProfilingEndpoint:
+    """profiling_view tests."""
+
+    def test_returns_json(self, profiling, auth_client, property):
+        """Test the endpoint lists profiled views."""
+        auth_client.get(reverse('property_mgmt:dashboard'))
+        data = auth_client.get(reverse('property_mgmt:profiling')).json()
+        assert data['enabled'] is True
+        assert [v['view'] for v in data['views']] == ['dashboard']
+
+    def test_post_resets(self, profiling, auth_client):
+        """Test POST clears the histograms."""
+        auth_client.get(reverse('property_mgmt:dashboard'))
+        auth_client.post(reverse('property_mgmt:profiling'))
+        assert get_profiles()['views'] == []
+
+    def test_requires_login(self, client):
+        """Test anonymous users are redirected."""
+        assert client.get(reverse('property_mgmt:profiling')).status_code == 302
@@ -0,0 +1,142 @@
+"""Tests for the lease renewal scheduler."""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from property_mgmt.models import Lease, Property, RenewalTask, RenewalWatermark
+from property_mgmt.renewals import RenewalScheduler, renewal_candidates, schedule_renewals
+from property_mgmt.signals import renewal_tasks_created
+
+TODAY = date(2031, 3, 1)
+
+
+@pytest.fixture
+def make_lease(hub_id, tenant):
+    def make(end_date, status='active', **kwargs):
+        prop = Property.objects.create(hub_id=hub_id, name=f'Flat {end_date}', address='x')
+        return Lease.objects.create(
+            hub_id=hub_id, property=prop, tenant=tenant, start_date=TODAY - timedelta(days=300),
+            end_date=end_date, monthly_rent=Decimal('900'), status=status, **kwargs,
+        )
+    return make
+
+
+@pytest.mark.django_db
+class TestScheduleRenewals:
+    """schedule_renewals tests."""
+
+    def test_creates_tasks_in_window(self, hub_id, make_lease):
+        """Test only active leases ending within the notice period get a task."""
+        due = make_lease(TODAY + timedelta(days=30))
+        make_lease(TODAY + timedelta(days=90))
+        make_lease(TODAY - timedelta(days=1))
+        make_lease(TODAY + timedelta(days=10), status='draft')
+        make_lease(None)
+
+        result = schedule_renewals(hub_id, TODAY, notice_days=60)
+        assert (result.candidates, result.created) == (1, 1)
+        task = RenewalTask.objects.get()
+        assert (task.lease_id, task.due_date, task.status, task.hub_id) == (due.pk, due.end_date, 'open', hub_id)
+
+    def test_rerun_is_incremental(self, hub_id, make_lease):
+        """Test a second run reads no old candidates and creates nothing."""
+        make_lease(TODAY + timedelta(days=30))
+        schedule_renewals(hub_id, TODAY, notice_days=60)
+        watermark = RenewalWatermark.objects.get(hub_id=hub_id)
+        assert watermark.scanned_through == TODAY + timedelta(days=60)
+        assert not renewal_candidates(hub_id, TODAY, TODAY + timedelta(days=60), watermark).exists()
+        assert schedule_renewals(hub_id, TODAY, notice_days=60).created == 0
+
+    def test_next_day_picks_up_horizon(self, hub_id, make_lease):
+        """Test the window advances with the calendar."""
+        schedule_renewals(hub_id, TODAY, notice_days=60)
+        later = make_lease(TODAY + timedelta(days=61))
+        result = schedule_renewals(hub_id, TODAY + timedelta(days=1), notice_days=60)
+        assert (result.candidates, result.created) == (1, 1)
+        assert RenewalTask.objects.get().lease_id == later.pk
+
+    def test_new_lease_inside_scanned_window(self, hub_id, make_lease):
+        """Test leases written after a run are caught even if they end before the watermark."""
+        schedule_renewals(hub_id, TODAY, notice_days=60)
+        lease = make_lease(TODAY + timedelta(days=20))
+        assert schedule_renewals(hub_id, TODAY, notice_days=60).created == 1
+        lease.end_date = TODAY + timedelta(days=25)
+        lease.save()
+        assert schedule_renewals(hub_id, TODAY, notice_days=60).created == 1
+        assert set(RenewalTask.objects.values_list('due_date', flat=True)) == {
+            TODAY + timedelta(days=20), TODAY + timedelta(days=25),
+        }
+
+    def test_scoped_to_hub(self, hub_id, make_lease):
+        """Test other hubs' leases are not touched."""
+        make_lease(TODAY + timedelta(days=5))
+        Lease.objects.update(hub_id='00000000-0000-0000-0000-000000000001')
+        assert schedule_renewals(hub_id, TODAY, notice_days=60).created == 0
+
+    def test_signal_sent_on_commit(self, hub_id, make_lease, django_capture_on_commit_callbacks):
+        """Test notifications go out per batch once the tasks are committed."""
+        for days in (5, 6, 7):
+            make_lease(TODAY + timedelta(days=days))
+        batches = []
+
+        def receiver(sender, hub_id, tasks, **kwargs):
+            batches.append(len(tasks))
+
+        renewal_tasks_created.connect(receiver)
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                schedule_renewals(hub_id, TODAY, notice_days=60, chunk_size=2)
+        finally:
+            renewal_tasks_created.disconnect(receiver)
+        assert batches == [2, 1]
+
+    def test_concurrent_run_not_announced(self, hub_id, make_lease, django_capture_on_commit_callbacks):
+        """Test tasks a racing run inserted first are neither counted nor announced."""
+        raced = make_lease(TODAY + timedelta(days=5))
+        make_lease(TODAY + timedelta(days=6))
+        bulk_create = RenewalTask.objects.bulk_create
+        batches = []
+
+        def racing(tasks, **kwargs):
+            RenewalTask.objects.create(hub_id=hub_id, lease=raced, due_date=raced.end_date)
+            return bulk_create(tasks, **kwargs)
+
+        def receiver(sender, hub_id, tasks, **kwargs):
+            batches.append([t.lease_id for t in tasks])
+
+        renewal_tasks_created.connect(receiver)
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                with mock.patch.object(RenewalTask.objects, 'bulk_create', side_effect=racing):
+                    result = schedule_renewals(hub_id, TODAY, notice_days=60)
+        finally:
+            renewal_tasks_created.disconnect(receiver)
+        assert (result.candidates, result.created) == (2, 1)
+        assert len(batches) == 1 and raced.pk not in batches[0]
+        assert RenewalTask.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestRenewalRunners:
+    """Command and in-process runner tests."""
+
+    def test_command(self, hub_id, make_lease, capsys):
+        """Test the command schedules every hub."""
+        make_lease(TODAY + timedelta(days=10))
+        call_command('property_mgmt_renewals', date=TODAY.isoformat(), days=30)
+        assert '1 renewal tasks created' in capsys.readouterr().out
+        assert RenewalTask.objects.count() == 1
+
+    def test_scheduler_run_once(self, hub_id, make_lease, settings, monkeypatch):
+        """Test one scheduler tick raises tasks and swallows errors."""
+        settings.PROPERTY_MGMT_RENEWAL_NOTICE_DAYS = 3650
+        monkeypatch.setattr('property_mgmt.renewals.connections.close_all', lambda: None)
+        make_lease(date.today() + timedelta(days=10))
+        results = RenewalScheduler(interval=60).run_once()
+        assert [r.created for r in results] == [1]
+
+        monkeypatch.setattr('property_mgmt.renewals.schedule_all_hubs', lambda: 1 / 0)
+        assert RenewalScheduler(interval=60).run_once() == []
@@ -0,0 +1,143 @@
+"""Tests for archiving, purging and restoring soft-deleted rows."""
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from property_mgmt.billing import generate_rent_charges
+from property_mgmt.models import ArchivedRow, Lease, ModuleSettings, Property, SearchToken, Tenant
+from property_mgmt.retention import (
+    RETENTION_BLOCKERS, RETENTION_DEPENDENTS, RETENTION_MODELS, purge_expired, restore_archived, retention_days,
+)
+from property_mgmt.search import get_search_backend
+
+LONG_AGO = timezone.now() - timedelta(days=365)
+
+
+def _delete(obj, when=LONG_AGO):
+    type(obj).objects.filter(pk=obj.pk).update(is_deleted=True, deleted_at=when)
+
+
+@pytest.fixture
+def lease(hub_id, property, tenant):
+    return Lease.objects.create(
+        hub_id=hub_id, property=property, tenant=tenant, start_date=date(2030, 1, 1), monthly_rent=Decimal('900'),
+    )
+
+
+def _exists(obj):
+    return type(obj).all_objects.filter(pk=obj.pk).exists()
+
+
+@pytest.mark.django_db
+class TestRetentionWindow:
+    """retention_days tests."""
+
+    def test_default_and_override(self, hub_id, settings):
+        """Test the hub setting wins over the project setting and the default."""
+        assert retention_days(uuid.uuid4()) == 90
+        settings.PROPERTY_MGMT_RETENTION_DAYS = 30
+        assert retention_days(hub_id) == 30
+        ModuleSettings.objects.create(hub_id=hub_id, retention_days=7)
+        assert retention_days(hub_id) == 7
+
+    def test_settings_page_saves_window(self, auth_client, hub_id):
+        """Test the settings page stores the hub's retention window."""
+        data = {'default_page_size': '10', 'currency': 'EUR', 'billing_day': '1', 'retention_days': '14'}
+        response = auth_client.post(reverse('property_mgmt:settings'), data)
+        assert response.context['saved']
+        assert ModuleSettings.objects.get(hub_id=hub_id).retention_days == 14
+        response = auth_client.post(reverse('property_mgmt:settings'), {**data, 'retention_days': '0'})
+        assert not response.context['saved'] and response.context['form'].errors
+
+
+@pytest.mark.django_db
+class TestPurge:
+    """purge_expired tests."""
+
+    def test_purges_expired_only(self, hub_id, property, tenant):
+        """Test rows deleted within the window stay; older ones are archived."""
+        get_search_backend('tokens').index(tenant)
+        _delete(property, timezone.now() - timedelta(days=10))
+        _delete(tenant)
+        result = purge_expired(hub_id)
+        assert (result.tenants, result.properties) == (1, 0)
+        assert not _exists(tenant) and _exists(property)
+        assert not SearchToken.objects.filter(object_id=tenant.pk).exists()
+        archived = ArchivedRow.objects.get(object_id=tenant.pk)
+        assert (archived.model_name, archived.data['name']) == ('tenant', tenant.name)
+
+    def test_leases_go_first(self, hub_id, property, tenant, lease):
+        """Test a deleted lease frees its deleted property and tenant in the same run."""
+        for obj in (lease, property, tenant):
+            _delete(obj)
+        result = purge_expired(hub_id, chunk_size=1)
+        assert (result.leases, result.tenants, result.properties) == (1, 1, 1)
+        assert not any(_exists(obj) for obj in (lease, property, tenant))
+
+    def test_live_lease_blocks_parents(self, hub_id, property, tenant, lease):
+        """Test properties and tenants a live lease points at are kept."""
+        _delete(property)
+        _delete(tenant)
+        assert purge_expired(hub_id)[1:4] == (0, 0, 0)
+        assert _exists(lease)
+
+    def test_charged_lease_is_kept(self, hub_id, lease):
+        """Test a lease with rent charges is never purged."""
+        generate_rent_charges('2030-01', hub_id)
+        _delete(lease)
+        assert purge_expired(hub_id).leases == 0
+
+    def test_relations_are_classified(self):
+        """Test every row pointing at a purged model is either a blocker or a dependent."""
+        for model in RETENTION_MODELS:
+            handled = {(m, f) for m, f in RETENTION_BLOCKERS[model] + RETENTION_DEPENDENTS[model]}
+            for rel in model._meta.related_objects:
+                if (rel.related_model, rel.field.name) == (Property, 'current_lease'):
+                    continue
+                assert (rel.related_model, rel.field.name) in handled, rel
+
+
+@pytest.mark.django_db
+class TestRestore:
+    """restore_archived tests."""
+
+    def test_lease_brings_back_parents(self, hub_id, property, tenant, lease):
+        """Test restoring a lease restores its archived property and tenant as live rows."""
+        created_at = Property.objects.get(pk=property.pk).created_at
+        for obj in (lease, property, tenant):
+            _delete(obj)
+        purge_expired(hub_id)
+
+        result = restore_archived(hub_id, 'lease')
+        assert (result.leases, result.tenants, result.properties, result.skipped) == (1, 1, 1, 0)
+        restored = Property.objects.get(pk=property.pk)
+        assert restored.created_at == created_at
+        assert restored.search_document
+        assert Lease.objects.get(pk=lease.pk).monthly_rent == Decimal('900.00')
+        assert not ArchivedRow.objects.exists()
+
+    def test_orphan_lease_is_skipped(self, hub_id, property, tenant, lease):
+        """Test a lease whose property is gone for good stays archived."""
+        for obj in (lease, property, tenant):
+            _delete(obj)
+        purge_expired(hub_id)
+        ArchivedRow.objects.filter(model_name='property').delete()
+        result = restore_archived(hub_id, 'lease')
+        assert (result.leases, result.skipped) == (0, 1)
+        assert ArchivedRow.objects.filter(model_name='lease').exists()
+
+    def test_commands(self, hub_id, tenant, capsys):
+        """Test the purge and restore commands."""
+        _delete(tenant)
+        call_command('property_mgmt_purge_deleted', dry_run=True)
+        assert '1 rows to purge' in capsys.readouterr().out
+        call_command('property_mgmt_purge_deleted', hub=str(hub_id))
+        assert '1 rows purged' in capsys.readouterr().out
+        call_command('property_mgmt_restore_archived', hub=str(hub_id), ids=[str(tenant.pk)])
+        assert '1 tenants' in capsys.readouterr().out
+        assert Tenant.objects.filter(pk=tenant.pk).exists()
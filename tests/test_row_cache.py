@@ -0,0 +1,86 @@
+"""Tests for cached datatable rows and the row template helpers."""
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.template import Context, Template
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import translation
+
+from property_mgmt.models import Property, Tenant
+from property_mgmt.templatetags.property_mgmt_tags import ROW_PK
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _render(template, context_name, rows):
+    return render_to_string(f'property_mgmt/partials/{template}', {context_name: rows, 'page_obj': rows})
+
+
+@pytest.mark.django_db
+class TestRowCache:
+    """Row fragment caching tests."""
+
+    def test_row_reused_until_updated(self, property):
+        """Test a row is served from cache until updated_at changes."""
+        rows = list(Property.objects.filter(pk=property.pk))
+        assert 'Test Name' in _render('properties_list.html', 'properties', rows)
+
+        Property.objects.filter(pk=property.pk).update(name='Renamed')
+        rows = list(Property.objects.filter(pk=property.pk))
+        assert 'Renamed' not in _render('properties_list.html', 'properties', rows)
+
+        property.name = 'Renamed'
+        property.save()
+        rows = list(Property.objects.filter(pk=property.pk))
+        assert 'Renamed' in _render('properties_list.html', 'properties', rows)
+
+    def test_keyed_on_language(self, tenant):
+        """Test each language caches its own fragment."""
+        rows = list(Tenant.objects.filter(pk=tenant.pk))
+        key = make_template_fragment_key('pm_tenant_row', [tenant.pk, rows[0].updated_at, 'es'])
+        _render('tenants_list.html', 'tenants', rows)
+        assert cache.get(key) is None
+        with translation.override('es'):
+            _render('tenants_list.html', 'tenants', rows)
+        assert cache.get(key) is not None
+
+    def test_row_urls(self, property):
+        """Test hoisted URLs resolve to the row's own pk."""
+        content = _render('properties_list.html', 'properties', [property])
+        assert reverse('property_mgmt:property_edit', args=[property.pk]) in content
+        assert reverse('property_mgmt:property_delete', args=[property.pk]) in content
+        assert reverse('property_mgmt:property_toggle_status', args=[property.pk]) in content
+        assert ROW_PK not in content
+
+    def test_list_view_renders_cached_rows(self, auth_client, property):
+        """Test a second list render matches the first."""
+        url = reverse('property_mgmt:properties_list')
+        first = auth_client.get(url, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body').content
+        second = auth_client.get(url, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body').content
+        assert first == second
+
+
+@pytest.mark.django_db
+class TestRowTags:
+    """Template helper tests."""
+
+    def test_capture(self):
+        """Test capture renders its block once into a variable."""
+        out = Template(
+            '{% load property_mgmt_tags %}{% capture x %} <b>{{ v }}</b> {% endcapture %}[{{ x }}{{ x }}]'
+        ).render(Context({'v': 1}))
+        assert out == '[<b>1</b><b>1</b>]'
+
+    def test_row_ids(self, property):
+        """Test the select-all id list is a JSON array."""
+        assert json.loads(Template('{% load property_mgmt_tags %}{{ rows|row_ids|safe }}').render(
+            Context({'rows': [property]})
+        )) == [str(property.pk)]
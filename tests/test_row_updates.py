@@ -0,0 +1,65 @@
+"""Tests for the single-row responses of the property and tenant write views."""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from property_mgmt.models import Property, Tenant
+
+
+def _post(client, url, data=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(url, data or {}, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+    assert response.status_code == 200
+    return response, [q['sql'] for q in ctx.captured_queries]
+
+
+@pytest.mark.django_db
+class TestRowResponses:
+    """Write endpoints answer with the changed row only."""
+
+    def test_toggle_renders_one_row(self, auth_client, property):
+        """Test a toggle swaps its own row without counting or paging the list."""
+        response, queries = _post(auth_client, reverse('property_mgmt:property_toggle_status', args=[property.pk]))
+        content = response.content.decode()
+        assert content.count('<tr') == 1
+        assert f'id="row-{property.pk}"' in content
+        assert (response['HX-Retarget'], response['HX-Reswap']) == (f'#row-{property.pk}', 'outerHTML')
+        # The session, then one UPDATE ... RETURNING: no count or page query.
+        assert queries[-1].startswith('UPDATE') and 'RETURNING' in queries[-1]
+        assert len(queries) <= 2
+
+    def test_edit_renders_changed_row(self, auth_client, tenant):
+        """Test an edit returns the row with the new values."""
+        response, _ = _post(auth_client, reverse('property_mgmt:tenant_edit', args=[tenant.pk]), {'name': 'Renamed'})
+        assert 'Renamed' in response.content.decode()
+        assert response['HX-Retarget'] == f'#row-{tenant.pk}'
+
+    def test_delete_is_out_of_band(self, auth_client, property):
+        """Test a delete removes the row out of band and swaps nothing else."""
+        response, _ = _post(auth_client, reverse('property_mgmt:property_delete', args=[property.pk]))
+        assert f'<tr id="row-{property.pk}" hx-swap-oob="delete">' in response.content.decode()
+        assert response['HX-Reswap'] == 'none'
+        assert Property.all_objects.get(pk=property.pk).is_deleted
+
+    def test_add_prepends_row(self, auth_client, hub_id):
+        """Test a created row is prepended to a page that has rows."""
+        response, _ = _post(auth_client, reverse('property_mgmt:tenant_add'), {'name': 'New', 'current_rows': '10'})
+        new = Tenant.objects.get(name='New')
+        assert response.content.decode().count('<tr') == 1
+        assert f'id="row-{new.pk}"' in response.content.decode()
+        assert (response['HX-Retarget'], response['HX-Reswap']) == ('#datatable-body tbody', 'afterbegin')
+
+    def test_add_to_empty_page_renders_list(self, auth_client, hub_id):
+        """Test adding to an empty page renders the list, keeping the search."""
+        response, _ = _post(
+            auth_client, reverse('property_mgmt:property_add'),
+            {'name': 'Loft', 'address': 'x', 'current_rows': '0', 'q': 'loft', 'per_page': '25'},
+        )
+        assert 'HX-Retarget' not in response
+        assert (response.context['search_query'], response.context['per_page']) == ('loft', 25)
+
+    def test_list_rows_have_ids(self, auth_client, property):
+        """Test list rows carry the id the row responses target."""
+        response = auth_client.get(reverse('property_mgmt:properties_list'), HTTP_HX_REQUEST='true')
+        assert f'id="row-{property.pk}"' in response.content.decode()
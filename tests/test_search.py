@@ -0,0 +1,124 @@
+"""Tests for property_mgmt search backends."""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from property_mgmt.models import Property, SearchToken, Tenant
+from property_mgmt import search
+from property_mgmt.search import get_search_backend, normalize, usable_search_backends
+
+
+@pytest.fixture
+def properties(db, hub_id):
+    return [
+        Property.objects.create(hub_id=hub_id, name='Ático Gran Vía', address='Gran Vía 12, Madrid'),
+        Property.objects.create(hub_id=hub_id, name='Local Serrano', address='Calle Serrano 4', property_type='commercial'),
+        Property.objects.create(hub_id=hub_id, name='Gran Piso', address='Calle Mayor 1'),
+    ]
+
+
+@pytest.mark.django_db
+class TestNormalize:
+    """Search document normalization."""
+
+    def test_strips_accents_and_case(self):
+        assert normalize('  Ático   GRAN Vía ') == 'atico gran via'
+
+    def test_document_maintained_on_save(self, properties):
+        obj = properties[0]
+        assert obj.search_document.startswith('atico gran via')
+        obj.name = 'Renamed'
+        obj.save(update_fields=['name'])
+        obj.refresh_from_db()
+        assert obj.search_document.startswith('renamed')
+
+
+@pytest.mark.django_db
+class TestTokenBackend:
+    """Token side-index backend."""
+
+    backend = get_search_backend('tokens')
+
+    def _search(self, model, hub_id, query):
+        qs = self.backend.filter(model.objects.filter(hub_id=hub_id), query, hub_id)
+        return list(self.backend.order_by_rank(qs))
+
+    def test_prefix_and_accent_insensitive(self, hub_id, properties):
+        self.backend.index_many(properties)
+        names = {p.name for p in self._search(Property, hub_id, 'via')}
+        assert names == {'Ático Gran Vía'}
+
+    def test_all_words_must_match(self, hub_id, properties):
+        self.backend.index_many(properties)
+        assert [p.name for p in self._search(Property, hub_id, 'calle serr')] == ['Local Serrano']
+
+    def test_ranks_exact_hits_first(self, hub_id, properties):
+        Property.objects.create(hub_id=hub_id, name='Apartamento Granada', address='Calle Real 2')
+        self.backend.index_many(Property.objects.filter(hub_id=hub_id))
+        results = self._search(Property, hub_id, 'gran')
+        assert [p.name for p in results] == ['Gran Piso', 'Ático Gran Vía', 'Apartamento Granada']
+
+    def test_identifier_compaction(self, hub_id):
+        tenant = Tenant(hub_id=hub_id, name='Ana', phone='+34 600 123 456')
+        tenant.save()
+        self.backend.index(tenant)
+        assert self._search(Tenant, hub_id, '34600123') == [tenant]
+
+    def test_scoped_to_hub(self, hub_id, properties):
+        self.backend.index_many(properties)
+        other = Property.objects.create(hub_id=None, name='Gran Otro', address='x')
+        self.backend.index(other)
+        assert other not in self._search(Property, hub_id, 'gran')
+
+    def test_signals_maintain_tokens(self, hub_id, settings):
+        settings.PROPERTY_MGMT_SEARCH_BACKEND = 'tokens'
+        tenant = Tenant.objects.create(hub_id=hub_id, name='Lucia Perez', email='lucia@example.com')
+        assert SearchToken.objects.filter(object_id=tenant.pk, token='lucia').exists()
+        tenant.delete()
+        assert not SearchToken.objects.filter(object_id=tenant.pk).exists()
+
+    def test_reindex_command(self, hub_id, properties):
+        SearchToken.objects.all().delete()
+        call_command('property_mgmt_reindex_search', backend='tokens', stdout=StringIO())
+        assert SearchToken.objects.filter(object_id=properties[1].pk, token='serrano').exists()
+
+
+class TestBackendChoice:
+    """get_search_backend fallbacks."""
+
+    def test_postgres_needs_pg_trgm(self, settings, monkeypatch):
+        """Test PostgreSQL without pg_trgm searches with basic, not the trigram ranking."""
+        monkeypatch.setattr(search.connection, 'vendor', 'postgresql')
+        monkeypatch.setattr(search, 'has_trigram_extension', lambda: False)
+        assert get_search_backend().name == 'basic'
+        assert get_search_backend('postgres').name == 'basic'
+        assert usable_search_backends() == {'basic'}
+        monkeypatch.setattr(search, 'has_trigram_extension', lambda: True)
+        assert get_search_backend().name == 'postgres'
+        assert usable_search_backends() == {'basic', 'postgres'}
+
+    def test_no_extension_off_postgres(self):
+        """Test other databases never report pg_trgm."""
+        assert search.has_trigram_extension() is False
+        assert get_search_backend('postgres').name == 'basic'
+
+
+@pytest.mark.django_db
+class TestSearchViews:
+    """Search through the list views."""
+
+    def test_property_search(self, auth_client, properties, settings):
+        settings.PROPERTY_MGMT_SEARCH_BACKEND = 'tokens'
+        get_search_backend('tokens').index_many(properties)
+        url = reverse('property_mgmt:properties_list')
+        response = auth_client.get(url, {'q': 'serrano'})
+        assert response.status_code == 200
+        assert [p.name for p in response.context['page_obj']] == ['Local Serrano']
+
+    def test_basic_backend_still_available(self, auth_client, properties, settings):
+        settings.PROPERTY_MGMT_SEARCH_BACKEND = 'basic'
+        url = reverse('property_mgmt:properties_list')
+        response = auth_client.get(url, {'q': 'Serr'})
+        assert [p.name for p in response.context['page_obj']] == ['Local Serrano']
@@ -0,0 +1,110 @@
+"""Tests for the single-statement toggle and soft delete."""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.db import OperationalError, connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from property_mgmt import views, writes
+from property_mgmt.models import Property, Tenant
+
+PARALLEL_USERS = 8
+CLICKS = 10
+
+
+@pytest.mark.django_db
+class TestToggleActive:
+    """toggle_active tests."""
+
+    def test_one_statement(self, hub_id, property):
+        """Test the toggle is one UPDATE returning the flipped row."""
+        with CaptureQueriesContext(connection) as ctx:
+            obj = writes.toggle_active(Property, hub_id, property.pk)
+        assert len(ctx.captured_queries) == 1
+        assert 'RETURNING' in ctx.captured_queries[0]['sql']
+        assert (obj.pk, obj.is_active, obj.name) == (property.pk, False, property.name)
+        assert obj.updated_at > property.updated_at
+        assert Property.objects.get(pk=property.pk).is_active is False
+
+    def test_scoped_to_live_hub_rows(self, hub_id, tenant):
+        """Test rows of another hub and deleted rows are not matched."""
+        assert writes.toggle_active(Tenant, '00000000-0000-0000-0000-000000000000', tenant.pk) is None
+        Tenant.objects.filter(pk=tenant.pk).update(is_deleted=True)
+        assert writes.toggle_active(Tenant, hub_id, tenant.pk) is None
+        assert Tenant.all_objects.get(pk=tenant.pk).is_active is True
+
+    def test_without_returning(self, hub_id, property):
+        """Test backends without UPDATE ... RETURNING update, then read the row."""
+        with mock.patch.object(writes, '_can_return', return_value=False):
+            assert writes.toggle_active(Property, hub_id, property.pk).is_active is False
+            assert writes.toggle_active(Property, hub_id, property.pk).is_active is True
+
+    def test_soft_delete(self, hub_id, property):
+        """Test a soft delete matches the live row once."""
+        assert writes.soft_delete(Property, hub_id, property.pk)
+        assert not writes.soft_delete(Property, hub_id, property.pk)
+        assert Property.all_objects.get(pk=property.pk).deleted_at is not None
+
+
+@pytest.mark.django_db
+class TestViews:
+    """Toggle and delete views."""
+
+    def test_missing_row_is_404(self, auth_client, property):
+        """Test toggling or deleting a deleted row answers 404."""
+        auth_client.post(reverse('property_mgmt:property_delete', args=[property.pk]))
+        for name in ('property_mgmt:property_toggle_status', 'property_mgmt:property_delete'):
+            assert auth_client.post(reverse(name, args=[property.pk])).status_code == 404
+
+
+def _click(request_factory, session_key, pk):
+    # Called directly rather than through the test Client, whose exception
+    # hook is process-wide and would re-raise one thread's error in another.
+    # In-memory SQLite shares one table lock between connections and fails a
+    # blocked statement at once instead of waiting, as other databases do;
+    # the toggle's UPDATE is the request's last query, so a locked request
+    # changed nothing and can be sent again.
+    while True:
+        request = request_factory.post('/', HTTP_HX_REQUEST='true')
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        try:
+            return views.tenant_toggle_status(request, pk=pk)
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentToggles:
+    """Parallel toggles."""
+
+    def test_no_lost_toggles(self, auth_client, tenant, rf):
+        """Test every parallel click flips the row exactly once."""
+        session_key = auth_client.session.session_key
+
+        def clicks(_):
+            try:
+                return [_click(rf, session_key, tenant.pk) for _ in range(CLICKS)]
+            finally:
+                connections.close_all()
+
+        # Switch threads often so requests interleave inside their queries.
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(PARALLEL_USERS) as pool:
+                responses = [r for user in pool.map(clicks, range(PARALLEL_USERS)) for r in user]
+        finally:
+            sys.setswitchinterval(interval)
+        total = PARALLEL_USERS * CLICKS
+        assert [r.status_code for r in responses] == [200] * total
+        # Serial flips from active alternate inactive/active, so each state is
+        # returned to half the clicks and an even count ends active again.
+        assert sum(b'"checkbox" checked' in r.content for r in responses) == total // 2
+        tenant.refresh_from_db()
+        assert tenant.is_active is True
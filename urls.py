@@ -1,18 +1,19 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'property_mgmt'
 
+# ASGI deployments can serve the dashboard and lists from their async variants.
+ASYNC_VIEWS = getattr(settings, 'PROPERTY_MGMT_ASYNC_VIEWS', False)
+
 urlpatterns = [
     # Dashboard
-    path('', views.dashboard, name='dashboard'),
-
-    # Navigation tab aliases
-    path('leases/', views.dashboard, name='leases'),
-
+    path('', views.dashboard_async if ASYNC_VIEWS else views.dashboard, name='dashboard'),
+    path('analytics/', views.analytics_view, name='analytics'),
 
     # Property
-    path('properties/', views.properties_list, name='properties_list'),
+    path('properties/', views.properties_list_async if ASYNC_VIEWS else views.properties_list, name='properties_list'),
     path('properties/add/', views.property_add, name='property_add'),
     path('properties/<uuid:pk>/edit/', views.property_edit, name='property_edit'),
     path('properties/<uuid:pk>/delete/', views.property_delete, name='property_delete'),
@@ -20,13 +21,20 @@ urlpatterns = [
     path('properties/bulk/', views.properties_bulk_action, name='properties_bulk_action'),
 
     # Tenant
-    path('tenants/', views.tenants_list, name='tenants_list'),
+    path('tenants/', views.tenants_list_async if ASYNC_VIEWS else views.tenants_list, name='tenants_list'),
     path('tenants/add/', views.tenant_add, name='tenant_add'),
     path('tenants/<uuid:pk>/edit/', views.tenant_edit, name='tenant_edit'),
     path('tenants/<uuid:pk>/delete/', views.tenant_delete, name='tenant_delete'),
     path('tenants/<uuid:pk>/toggle/', views.tenant_toggle_status, name='tenant_toggle_status'),
     path('tenants/bulk/', views.tenants_bulk_action, name='tenants_bulk_action'),
 
+    # Lease
+    path('leases/', views.leases_list, name='leases'),
+    path('leases/add/', views.lease_add, name='lease_add'),
+    path('leases/<uuid:pk>/edit/', views.lease_edit, name='lease_edit'),
+    path('leases/<uuid:pk>/delete/', views.lease_delete, name='lease_delete'),
+
     # Settings
     path('settings/', views.settings_view, name='settings'),
+    path('settings/profiling/', views.profiling_view, name='profiling'),
 ]
@@ -1,36 +1,244 @@
 """
 Property Management Module Views
 """
-from django.core.paginator import Paginator
-from django.db.models import Q, Count
-from django.shortcuts import get_object_or_404, render as django_render
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_POST
 
 from apps.accounts.decorators import login_required, permission_required
 from apps.core.htmx import htmx_view
-from apps.core.services import export_to_csv, export_to_excel
+from apps.core.services import export_to_excel
 from apps.modules_runtime.navigation import with_module_nav
 
-from .models import Property, Tenant, Lease
+from .models import PAGE_SIZES, ModuleSettings, Property, Tenant, Lease
+from .analytics import get_portfolio_analytics
+from .bulk import MAX_BULK_IDS, parse_ids, run_bulk_action
+from .config import get_hub_settings, hub_search_backend
+from .counts import CountingPaginator, count_rows
+from .exports import stream_csv, stream_excel
+from .forms import LeaseForm, ModuleSettingsForm, PropertyFilterForm
+from .metrics import aget_dashboard_metrics, get_dashboard_metrics
+from .pagination import KeysetPaginator, sort_ordering
+from .parallel import aread
+from .profiling import before_render, get_profiles, profiled, reset_profiles, timed_render
+from .writes import soft_delete, toggle_active
+
+PER_PAGE_CHOICES = [size for size, label in PAGE_SIZES]
+# List filters recorded in the audit row of a "select all matching" bulk action.
+FILTER_PARAMS = tuple(PropertyFilterForm.base_fields)
+
+
+def _list_params(request):
+    """
+    List state parameters for a request.
+
+    GET requests carry them in the query string. Write requests posted from
+    a datatable include the same inputs plus ``current_page`` and
+    ``current_cursor``, so the re-rendered list stays where the user was.
+    """
+    if request.method == 'GET':
+        return request.GET
+    params = request.POST.copy()
+    params['page'] = params.get('current_page', 1)
+    params['cursor'] = params.get('current_cursor', '')
+    return params
+
+
+def _paginate(request, qs, sort_field, sort_dir, per_page):
+    """
+    Paginate a sorted list queryset.
+
+    Offset pagination is the default; its total comes from the configured
+    count strategy (see ``counts.py``) and the footer gets a windowed
+    ``page_range``. ``?paging=cursor`` switches to keyset pagination on
+    ``(sort field, id)``, which skips counting unless ``?count=1`` is passed.
+    """
+    params = _list_params(request)
+    hub_id = request.session.get('hub_id')
+    if params.get('paging') == 'cursor':
+        paginator = KeysetPaginator(
+            qs, sort_field, sort_dir, per_page,
+            counter=lambda qs: count_rows(qs, hub_id, allow_estimate=False)[0],
+        )
+        page_obj = paginator.get_page(params.get('cursor'))
+        return page_obj, {
+            'paging': 'cursor',
+            'cursor': params.get('cursor', ''),
+            'show_count': params.get('count') == '1',
+        }
+    paginator = CountingPaginator(qs, per_page, hub_id=hub_id)
+    page_obj = paginator.get_page(params.get('page', 1))
+    return page_obj, {
+        'paging': 'offset',
+        'show_count': True,
+        'page_range': paginator.get_elided_page_range(page_obj.number, on_each_side=2, on_ends=1),
+    }
+
+
+def _list_queryset(request, model, sort_fields, default_sort='name', search=None, refine=None):
+    """
+    Hub-scoped, searched and sorted queryset for a datatable, plus the list
+    state (search, sort, view, per-page) parsed from the request.
+
+    ``search(qs, query, hub_id)`` replaces the search backend for models
+    without a search document; such results are not relevance-ranked.
+    ``refine(qs, params)`` applies extra list filters.
+    """
+    params = _list_params(request)
+    hub_id = request.session.get('hub_id')
+    hub_settings = get_hub_settings(hub_id)
+    search_query = params.get('q', '').strip()
+    sort_field = params.get('sort')
+    sort_dir = params.get('dir', 'asc')
+    current_view = params.get('view', 'table')
+    per_page = int(params.get('per_page', hub_settings.default_page_size))
+    if per_page not in PER_PAGE_CHOICES:
+        per_page = hub_settings.default_page_size
+
+    qs = model.objects.filter(hub_id=hub_id, is_deleted=False)
+
+    if refine is not None:
+        qs = refine(qs, params)
+
+    search_backend = hub_search_backend(hub_id)
+    if search_query:
+        qs = (search or search_backend.filter)(qs, search_query, hub_id)
+
+    rank_results = bool(search_query) and search is None and sort_field in ('relevance', None)
+    if sort_field not in sort_fields:
+        sort_field = default_sort
+    qs = qs.order_by(*sort_ordering(model, sort_fields[sort_field], sort_dir == 'desc'))
+    if rank_results and params.get('paging') != 'cursor':
+        qs = search_backend.order_by_rank(qs)
+
+    return qs, {
+        'search_query': search_query, 'sort_field': sort_field,
+        'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
+        'currency': hub_settings.currency,
+    }
 
-PER_PAGE_CHOICES = [10, 25, 50, 100]
 
+def _with_exports(model, sort_fields, fields, headers, basename, **list_options):
+    """
+    Serve ``?export=csv|excel`` for a list view as a streaming download,
+    ahead of the page/partial rendering decorators. ``list_options`` are
+    passed through to ``_list_queryset``.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            export_format = request.GET.get('export')
+            if export_format not in ('csv', 'excel'):
+                return view_func(request, *args, **kwargs)
+            qs, _ = _list_queryset(request, model, sort_fields, **list_options)
+            limit = get_hub_settings(request.session.get('hub_id')).export_max_rows
+            if limit:
+                qs = qs[:limit]
+            if export_format == 'csv':
+                return stream_csv(qs, fields, headers, f'{basename}.csv')
+            return (
+                stream_excel(qs, fields, headers, f'{basename}.xlsx')
+                or export_to_excel(qs, fields=fields, headers=headers, filename=f'{basename}.xlsx')
+            )
+        return wrapper
+    return decorator
+
+
+def _list_context(request, model, sort_fields, context_name, **list_options):
+    """Datatable context for the page, sort and search described by the request."""
+    qs, state = _list_queryset(request, model, sort_fields, **list_options)
+    page_obj, paging_ctx = _paginate(request, qs, sort_fields[state['sort_field']], state['sort_dir'], state['per_page'])
+    return {context_name: page_obj, 'page_obj': page_obj, **state, **paging_ctx}
+
+
+def _bulk_action(request, model, sort_fields, template, context_name, **list_options):
+    """
+    Run a bulk action on the posted selection, then re-render the caller's
+    current page of the list.
+
+    ``select=all`` targets every row matching the list's search; otherwise
+    ``ids`` holds at most ``MAX_BULK_IDS`` comma-separated ids.
+    """
+    hub_id = request.session.get('hub_id')
+    if request.POST.get('select') == 'all':
+        qs, state = _list_queryset(request, model, sort_fields, **list_options)
+        criteria = {key: request.POST[key] for key in FILTER_PARAMS if request.POST.get(key)}
+        selection, criteria = 'filter', {'q': state['search_query'], **criteria}
+    else:
+        ids = parse_ids(request.POST.get('ids', ''))
+        if len(ids) > MAX_BULK_IDS:
+            return HttpResponseBadRequest(_('Too many rows selected; use "select all matching" instead.'))
+        qs = model.objects.filter(hub_id=hub_id, is_deleted=False, id__in=ids)
+        selection, criteria = 'ids', {'ids': [str(i) for i in ids]}
+    run_bulk_action(
+        qs, request.POST.get('action', ''), hub_id, selection, criteria,
+        user_id=request.session.get('local_user_id'),
+    )
+    return timed_render(request, template, _list_context(request, model, sort_fields, context_name, **list_options))
+
+
+def _row_response(request, template, obj):
+    """
+    Re-render only ``obj``'s datatable row after a write that changed just
+    that row. htmx swaps it over the row itself whatever target the request
+    named, so the rest of the table keeps its page, sort and search.
+    """
+    response = timed_render(request, template, {'item': obj})
+    response['HX-Retarget'] = f'#row-{obj.pk}'
+    response['HX-Reswap'] = 'outerHTML'
+    return response
+
+
+def _row_added(request, template, obj, render_list):
+    """
+    Prepend a created row to the current page. An empty page has no table
+    to insert into, so it is rendered whole by ``render_list(request)``.
+    """
+    if request.POST.get('current_rows', '0') in ('', '0'):
+        return render_list(request)
+    response = timed_render(request, template, {'item': obj})
+    response['HX-Retarget'] = '#datatable-body tbody'
+    response['HX-Reswap'] = 'afterbegin'
+    return response
+
+
+def _row_removed(request, pk):
+    """Remove row ``pk`` with an out-of-band swap; nothing else is replaced."""
+    response = timed_render(request, 'property_mgmt/partials/row_removed.html', {'pk': pk})
+    response['HX-Reswap'] = 'none'
+    return response
 
 # ======================================================================
 # Dashboard
 # ======================================================================
 
+@profiled
 @login_required
 @with_module_nav('property_mgmt', 'dashboard')
 @htmx_view('property_mgmt/pages/index.html', 'property_mgmt/partials/dashboard_content.html')
+@before_render
 def dashboard(request):
     hub_id = request.session.get('hub_id')
-    return {
-        'total_properties': Property.objects.filter(hub_id=hub_id, is_deleted=False).count(),
-        'total_tenants': Tenant.objects.filter(hub_id=hub_id, is_deleted=False).count(),
-    }
+    return {**get_dashboard_metrics(hub_id), 'analytics': get_portfolio_analytics(hub_id)}
+
+
+@profiled
+@login_required
+@with_module_nav('property_mgmt', 'analytics')
+@htmx_view('property_mgmt/pages/analytics.html', 'property_mgmt/partials/analytics_content.html')
+@before_render
+def analytics_view(request):
+    hub_id = request.session.get('hub_id')
+    return {'analytics': get_portfolio_analytics(hub_id)}
 
 
 # ======================================================================
@@ -38,81 +246,49 @@ def dashboard(request):
 # ======================================================================
 
 PROPERTY_SORT_FIELDS = {
-    'name': 'name',
+    'name': 'name_key',
     'status': 'status',
     'is_active': 'is_active',
     'monthly_rent': 'monthly_rent',
-    'area_sqm': 'area_sqm',
+    'area_sqm': 'area_key',
     'bathrooms': 'bathrooms',
     'created_at': 'created_at',
 }
 
-def _build_properties_context(hub_id, per_page=10):
-    qs = Property.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name')
-    paginator = Paginator(qs, per_page)
-    page_obj = paginator.get_page(1)
-    return {
-        'properties': page_obj,
-        'page_obj': page_obj,
-        'search_query': '',
-        'sort_field': 'name',
-        'sort_dir': 'asc',
-        'current_view': 'table',
-        'per_page': per_page,
-    }
+PROPERTY_ROW_TEMPLATE = 'property_mgmt/partials/property_row_update.html'
+
+def _render_properties_list(request):
+    ctx = _list_context(request, Property, PROPERTY_SORT_FIELDS, 'properties', refine=_refine_properties)
+    return timed_render(request, 'property_mgmt/partials/properties_list.html', ctx)
 
-def _render_properties_list(request, hub_id, per_page=10):
-    ctx = _build_properties_context(hub_id, per_page)
-    return django_render(request, 'property_mgmt/partials/properties_list.html', ctx)
+PROPERTY_EXPORT_FIELDS = ['name', 'status', 'is_active', 'monthly_rent', 'area_sqm', 'bathrooms']
+PROPERTY_EXPORT_HEADERS = ['Name', 'Status', 'Is Active', 'Monthly Rent', 'Area Sqm', 'Bathrooms']
 
+def _refine_properties(qs, params):
+    return PropertyFilterForm(params).apply(qs)
+
+@profiled
 @login_required
+@_with_exports(
+    Property, PROPERTY_SORT_FIELDS, PROPERTY_EXPORT_FIELDS, PROPERTY_EXPORT_HEADERS, 'properties',
+    refine=_refine_properties,
+)
 @with_module_nav('property_mgmt', 'properties')
 @htmx_view('property_mgmt/pages/properties.html', 'property_mgmt/partials/properties_content.html')
+@before_render
 def properties_list(request):
-    hub_id = request.session.get('hub_id')
-    search_query = request.GET.get('q', '').strip()
-    sort_field = request.GET.get('sort', 'name')
-    sort_dir = request.GET.get('dir', 'asc')
-    page_number = request.GET.get('page', 1)
-    current_view = request.GET.get('view', 'table')
-    per_page = int(request.GET.get('per_page', 10))
-    if per_page not in PER_PAGE_CHOICES:
-        per_page = 10
-
-    qs = Property.objects.filter(hub_id=hub_id, is_deleted=False)
-
-    if search_query:
-        qs = qs.filter(Q(name__icontains=search_query) | Q(address__icontains=search_query) | Q(property_type__icontains=search_query) | Q(status__icontains=search_query))
-
-    order_by = PROPERTY_SORT_FIELDS.get(sort_field, 'name')
-    if sort_dir == 'desc':
-        order_by = f'-{order_by}'
-    qs = qs.order_by(order_by)
+    ctx = _list_context(request, Property, PROPERTY_SORT_FIELDS, 'properties', refine=_refine_properties)
+    return _properties_response(request, ctx)
 
-    export_format = request.GET.get('export')
-    if export_format in ('csv', 'excel'):
-        fields = ['name', 'status', 'is_active', 'monthly_rent', 'area_sqm', 'bathrooms']
-        headers = ['Name', 'Status', 'Is Active', 'Monthly Rent', 'Area Sqm', 'Bathrooms']
-        if export_format == 'csv':
-            return export_to_csv(qs, fields=fields, headers=headers, filename='properties.csv')
-        return export_to_excel(qs, fields=fields, headers=headers, filename='properties.xlsx')
-
-    paginator = Paginator(qs, per_page)
-    page_obj = paginator.get_page(page_number)
+def _properties_response(request, ctx):
+    ctx['filter_form'] = PropertyFilterForm(_list_params(request))
 
     if request.htmx and request.htmx.target == 'datatable-body':
-        return django_render(request, 'property_mgmt/partials/properties_list.html', {
-            'properties': page_obj, 'page_obj': page_obj,
-            'search_query': search_query, 'sort_field': sort_field,
-            'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
-        })
+        return timed_render(request, 'property_mgmt/partials/properties_list.html', ctx)
 
-    return {
-        'properties': page_obj, 'page_obj': page_obj,
-        'search_query': search_query, 'sort_field': sort_field,
-        'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
-    }
+    return ctx
 
+@profiled
 @login_required
 def property_add(request):
     hub_id = request.session.get('hub_id')
@@ -137,9 +313,10 @@ def property_add(request):
         obj.status = status
         obj.is_active = is_active
         obj.save()
-        return _render_properties_list(request, hub_id)
-    return django_render(request, 'property_mgmt/partials/panel_property_add.html', {})
+        return _row_added(request, PROPERTY_ROW_TEMPLATE, obj, _render_properties_list)
+    return timed_render(request, 'property_mgmt/partials/panel_property_add.html', {})
 
+@profiled
 @login_required
 def property_edit(request, pk):
     hub_id = request.session.get('hub_id')
@@ -155,42 +332,36 @@ def property_edit(request, pk):
         obj.status = request.POST.get('status', '').strip()
         obj.is_active = request.POST.get('is_active') == 'on'
         obj.save()
-        return _render_properties_list(request, hub_id)
-    return django_render(request, 'property_mgmt/partials/panel_property_edit.html', {'obj': obj})
+        return _row_response(request, PROPERTY_ROW_TEMPLATE, obj)
+    return timed_render(request, 'property_mgmt/partials/panel_property_edit.html', {'obj': obj})
 
+@profiled
 @login_required
 @require_POST
 def property_delete(request, pk):
     hub_id = request.session.get('hub_id')
-    obj = get_object_or_404(Property, pk=pk, hub_id=hub_id, is_deleted=False)
-    obj.is_deleted = True
-    obj.deleted_at = timezone.now()
-    obj.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
-    return _render_properties_list(request, hub_id)
+    if not soft_delete(Property, hub_id, pk):
+        raise Http404
+    return _row_removed(request, pk)
 
+@profiled
 @login_required
 @require_POST
 def property_toggle_status(request, pk):
     hub_id = request.session.get('hub_id')
-    obj = get_object_or_404(Property, pk=pk, hub_id=hub_id, is_deleted=False)
-    obj.is_active = not obj.is_active
-    obj.save(update_fields=['is_active', 'updated_at'])
-    return _render_properties_list(request, hub_id)
+    obj = toggle_active(Property, hub_id, pk)
+    if obj is None:
+        raise Http404
+    return _row_response(request, PROPERTY_ROW_TEMPLATE, obj)
 
+@profiled
 @login_required
 @require_POST
 def properties_bulk_action(request):
-    hub_id = request.session.get('hub_id')
-    ids = [i.strip() for i in request.POST.get('ids', '').split(',') if i.strip()]
-    action = request.POST.get('action', '')
-    qs = Property.objects.filter(hub_id=hub_id, is_deleted=False, id__in=ids)
-    if action == 'activate':
-        qs.update(is_active=True)
-    elif action == 'deactivate':
-        qs.update(is_active=False)
-    elif action == 'delete':
-        qs.update(is_deleted=True, deleted_at=timezone.now())
-    return _render_properties_list(request, hub_id)
+    return _bulk_action(
+        request, Property, PROPERTY_SORT_FIELDS, 'property_mgmt/partials/properties_list.html', 'properties',
+        refine=_refine_properties,
+    )
 
 
 # ======================================================================
@@ -198,7 +369,7 @@ def properties_bulk_action(request):
 # ======================================================================
 
 TENANT_SORT_FIELDS = {
-    'name': 'name',
+    'name': 'name_key',
     'is_active': 'is_active',
     'email': 'email',
     'phone': 'phone',
@@ -206,72 +377,32 @@ TENANT_SORT_FIELDS = {
     'created_at': 'created_at',
 }
 
-def _build_tenants_context(hub_id, per_page=10):
-    qs = Tenant.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name')
-    paginator = Paginator(qs, per_page)
-    page_obj = paginator.get_page(1)
-    return {
-        'tenants': page_obj,
-        'page_obj': page_obj,
-        'search_query': '',
-        'sort_field': 'name',
-        'sort_dir': 'asc',
-        'current_view': 'table',
-        'per_page': per_page,
-    }
+TENANT_ROW_TEMPLATE = 'property_mgmt/partials/tenant_row_update.html'
+
+def _render_tenants_list(request):
+    ctx = _list_context(request, Tenant, TENANT_SORT_FIELDS, 'tenants')
+    return timed_render(request, 'property_mgmt/partials/tenants_list.html', ctx)
 
-def _render_tenants_list(request, hub_id, per_page=10):
-    ctx = _build_tenants_context(hub_id, per_page)
-    return django_render(request, 'property_mgmt/partials/tenants_list.html', ctx)
+TENANT_EXPORT_FIELDS = ['name', 'is_active', 'email', 'phone', 'id_number']
+TENANT_EXPORT_HEADERS = ['Name', 'Is Active', 'Email', 'Phone', 'Id Number']
 
+@profiled
 @login_required
+@_with_exports(Tenant, TENANT_SORT_FIELDS, TENANT_EXPORT_FIELDS, TENANT_EXPORT_HEADERS, 'tenants')
 @with_module_nav('property_mgmt', 'tenants')
 @htmx_view('property_mgmt/pages/tenants.html', 'property_mgmt/partials/tenants_content.html')
+@before_render
 def tenants_list(request):
-    hub_id = request.session.get('hub_id')
-    search_query = request.GET.get('q', '').strip()
-    sort_field = request.GET.get('sort', 'name')
-    sort_dir = request.GET.get('dir', 'asc')
-    page_number = request.GET.get('page', 1)
-    current_view = request.GET.get('view', 'table')
-    per_page = int(request.GET.get('per_page', 10))
-    if per_page not in PER_PAGE_CHOICES:
-        per_page = 10
-
-    qs = Tenant.objects.filter(hub_id=hub_id, is_deleted=False)
-
-    if search_query:
-        qs = qs.filter(Q(name__icontains=search_query) | Q(email__icontains=search_query) | Q(phone__icontains=search_query) | Q(id_number__icontains=search_query))
-
-    order_by = TENANT_SORT_FIELDS.get(sort_field, 'name')
-    if sort_dir == 'desc':
-        order_by = f'-{order_by}'
-    qs = qs.order_by(order_by)
-
-    export_format = request.GET.get('export')
-    if export_format in ('csv', 'excel'):
-        fields = ['name', 'is_active', 'email', 'phone', 'id_number']
-        headers = ['Name', 'Is Active', 'Email', 'Phone', 'Id Number']
-        if export_format == 'csv':
-            return export_to_csv(qs, fields=fields, headers=headers, filename='tenants.csv')
-        return export_to_excel(qs, fields=fields, headers=headers, filename='tenants.xlsx')
-
-    paginator = Paginator(qs, per_page)
-    page_obj = paginator.get_page(page_number)
+    ctx = _list_context(request, Tenant, TENANT_SORT_FIELDS, 'tenants')
+    return _tenants_response(request, ctx)
 
+def _tenants_response(request, ctx):
     if request.htmx and request.htmx.target == 'datatable-body':
-        return django_render(request, 'property_mgmt/partials/tenants_list.html', {
-            'tenants': page_obj, 'page_obj': page_obj,
-            'search_query': search_query, 'sort_field': sort_field,
-            'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
-        })
+        return timed_render(request, 'property_mgmt/partials/tenants_list.html', ctx)
 
-    return {
-        'tenants': page_obj, 'page_obj': page_obj,
-        'search_query': search_query, 'sort_field': sort_field,
-        'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
-    }
+    return ctx
 
+@profiled
 @login_required
 def tenant_add(request):
     hub_id = request.session.get('hub_id')
@@ -288,9 +419,10 @@ def tenant_add(request):
         obj.id_number = id_number
         obj.is_active = is_active
         obj.save()
-        return _render_tenants_list(request, hub_id)
-    return django_render(request, 'property_mgmt/partials/panel_tenant_add.html', {})
+        return _row_added(request, TENANT_ROW_TEMPLATE, obj, _render_tenants_list)
+    return timed_render(request, 'property_mgmt/partials/panel_tenant_add.html', {})
 
+@profiled
 @login_required
 def tenant_edit(request, pk):
     hub_id = request.session.get('hub_id')
@@ -302,48 +434,273 @@ def tenant_edit(request, pk):
         obj.id_number = request.POST.get('id_number', '').strip()
         obj.is_active = request.POST.get('is_active') == 'on'
         obj.save()
-        return _render_tenants_list(request, hub_id)
-    return django_render(request, 'property_mgmt/partials/panel_tenant_edit.html', {'obj': obj})
+        return _row_response(request, TENANT_ROW_TEMPLATE, obj)
+    return timed_render(request, 'property_mgmt/partials/panel_tenant_edit.html', {'obj': obj})
 
+@profiled
 @login_required
 @require_POST
 def tenant_delete(request, pk):
     hub_id = request.session.get('hub_id')
-    obj = get_object_or_404(Tenant, pk=pk, hub_id=hub_id, is_deleted=False)
-    obj.is_deleted = True
-    obj.deleted_at = timezone.now()
-    obj.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
-    return _render_tenants_list(request, hub_id)
+    if not soft_delete(Tenant, hub_id, pk):
+        raise Http404
+    return _row_removed(request, pk)
 
+@profiled
 @login_required
 @require_POST
 def tenant_toggle_status(request, pk):
     hub_id = request.session.get('hub_id')
-    obj = get_object_or_404(Tenant, pk=pk, hub_id=hub_id, is_deleted=False)
-    obj.is_active = not obj.is_active
-    obj.save(update_fields=['is_active', 'updated_at'])
-    return _render_tenants_list(request, hub_id)
+    obj = toggle_active(Tenant, hub_id, pk)
+    if obj is None:
+        raise Http404
+    return _row_response(request, TENANT_ROW_TEMPLATE, obj)
 
+@profiled
 @login_required
 @require_POST
 def tenants_bulk_action(request):
+    return _bulk_action(request, Tenant, TENANT_SORT_FIELDS, 'property_mgmt/partials/tenants_list.html', 'tenants')
+
+
+# ======================================================================
+# Lease
+# ======================================================================
+
+LEASE_SORT_FIELDS = {
+    'start_date': 'start_date',
+    'end_date': 'end_date',
+    'monthly_rent': 'monthly_rent',
+    'status': 'status',
+    'created_at': 'created_at',
+}
+
+def _search_leases(qs, query, hub_id):
+    """Match leases whose property or tenant matches the search backend."""
+    backend = hub_search_backend(hub_id)
+    properties = backend.filter(Property.objects.filter(hub_id=hub_id, is_deleted=False), query, hub_id)
+    tenants = backend.filter(Tenant.objects.filter(hub_id=hub_id, is_deleted=False), query, hub_id)
+    return qs.filter(Q(property_id__in=properties.values('id')) | Q(tenant_id__in=tenants.values('id')))
+
+def _build_leases_context(hub_id, per_page=None):
+    hub_settings = get_hub_settings(hub_id)
+    per_page = per_page or hub_settings.default_page_size
+    qs = (
+        Lease.objects.filter(hub_id=hub_id, is_deleted=False)
+        .select_related('property', 'tenant').order_by('start_date', 'id')
+    )
+    paginator = CountingPaginator(qs, per_page, hub_id=hub_id)
+    page_obj = paginator.get_page(1)
+    return {
+        'leases': page_obj,
+        'page_obj': page_obj,
+        'search_query': '',
+        'sort_field': 'start_date',
+        'sort_dir': 'asc',
+        'current_view': 'table',
+        'per_page': per_page,
+        'currency': hub_settings.currency,
+        'page_range': paginator.get_elided_page_range(1, on_each_side=2, on_ends=1),
+    }
+
+def _render_leases_list(request, hub_id, per_page=None):
+    ctx = _build_leases_context(hub_id, per_page)
+    return timed_render(request, 'property_mgmt/partials/leases_list.html', ctx)
+
+def _render_lease_panel(request, template, form, obj=None):
+    """Re-render a lease panel in place, e.g. to show validation errors."""
+    error = ' '.join(e for errors in form.errors.values() for e in errors)
+    response = timed_render(request, template, {'form': form, 'obj': obj, 'error': error})
+    if form.is_bound:
+        response['HX-Retarget'] = '#lease-panel-content'
+        response['HX-Reswap'] = 'innerHTML'
+    return response
+
+LEASE_EXPORT_FIELDS = ['property__name', 'tenant__name', 'start_date', 'end_date', 'monthly_rent', 'deposit', 'status']
+LEASE_EXPORT_HEADERS = ['Property', 'Tenant', 'Start Date', 'End Date', 'Monthly Rent', 'Deposit', 'Status']
+
+@profiled
+@login_required
+@_with_exports(
+    Lease, LEASE_SORT_FIELDS, LEASE_EXPORT_FIELDS, LEASE_EXPORT_HEADERS, 'leases',
+    default_sort='start_date', search=_search_leases,
+)
+@with_module_nav('property_mgmt', 'leases')
+@htmx_view('property_mgmt/pages/leases.html', 'property_mgmt/partials/leases_content.html')
+@before_render
+def leases_list(request):
+    qs, state = _list_queryset(request, Lease, LEASE_SORT_FIELDS, default_sort='start_date', search=_search_leases)
+    qs = qs.select_related('property', 'tenant')
+    page_obj, paging_ctx = _paginate(request, qs, LEASE_SORT_FIELDS[state['sort_field']], state['sort_dir'], state['per_page'])
+    ctx = {'leases': page_obj, 'page_obj': page_obj, **state, **paging_ctx}
+
+    if request.htmx and request.htmx.target == 'datatable-body':
+        return timed_render(request, 'property_mgmt/partials/leases_list.html', ctx)
+
+    return ctx
+
+@profiled
+@login_required
+def lease_add(request):
     hub_id = request.session.get('hub_id')
-    ids = [i.strip() for i in request.POST.get('ids', '').split(',') if i.strip()]
-    action = request.POST.get('action', '')
-    qs = Tenant.objects.filter(hub_id=hub_id, is_deleted=False, id__in=ids)
-    if action == 'activate':
-        qs.update(is_active=True)
-    elif action == 'deactivate':
-        qs.update(is_active=False)
-    elif action == 'delete':
-        qs.update(is_deleted=True, deleted_at=timezone.now())
-    return _render_tenants_list(request, hub_id)
+    template = 'property_mgmt/partials/panel_lease_add.html'
+    if request.method == 'POST':
+        form = LeaseForm(request.POST, hub_id=hub_id)
+        with transaction.atomic():
+            # The overlap check locks the property until the lease is saved.
+            valid = form.is_valid()
+            if valid:
+                form.save()
+        if not valid:
+            return _render_lease_panel(request, template, form)
+        return _render_leases_list(request, hub_id)
+    return _render_lease_panel(request, template, LeaseForm(hub_id=hub_id))
+
+@profiled
+@login_required
+def lease_edit(request, pk):
+    hub_id = request.session.get('hub_id')
+    obj = get_object_or_404(Lease, pk=pk, hub_id=hub_id, is_deleted=False)
+    template = 'property_mgmt/partials/panel_lease_edit.html'
+    if request.method == 'POST':
+        form = LeaseForm(request.POST, instance=obj, hub_id=hub_id)
+        with transaction.atomic():
+            valid = form.is_valid()
+            if valid:
+                form.save()
+        if not valid:
+            return _render_lease_panel(request, template, form, obj)
+        return _render_leases_list(request, hub_id)
+    return _render_lease_panel(request, template, LeaseForm(instance=obj, hub_id=hub_id), obj)
+
+@profiled
+@login_required
+@require_POST
+def lease_delete(request, pk):
+    hub_id = request.session.get('hub_id')
+    obj = get_object_or_404(Lease, pk=pk, hub_id=hub_id, is_deleted=False)
+    obj.is_deleted = True
+    obj.deleted_at = timezone.now()
+    obj.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
+    return _render_leases_list(request, hub_id)
+
 
 
+@profiled
 @login_required
 @permission_required('property_mgmt.manage_settings')
 @with_module_nav('property_mgmt', 'settings')
 @htmx_view('property_mgmt/pages/settings.html', 'property_mgmt/partials/settings_content.html')
+@before_render
 def settings_view(request):
-    return {}
+    hub_id = request.session.get('hub_id')
+    instance = ModuleSettings.objects.filter(hub_id=hub_id).first() or ModuleSettings(hub_id=hub_id)
+    form = ModuleSettingsForm(request.POST or None, instance=instance)
+    saved = request.method == 'POST' and form.is_valid()
+    if saved:
+        form.save()
+    return {'form': form, 'saved': saved}
+
+
+@login_required
+@permission_required('property_mgmt.manage_settings')
+def profiling_view(request):
+    """Per-view profiling histograms as JSON; POST clears them."""
+    if request.method == 'POST':
+        reset_profiles()
+    return JsonResponse(get_profiles())
+
 
+# ======================================================================
+# Async (ASGI) variants
+# ======================================================================
+#
+# Served instead of their sync counterparts when PROPERTY_MGMT_ASYNC_VIEWS
+# is set (see urls.py). Independent queries run concurrently, each on its
+# own connection (parallel.aread); the page is then rendered by the same
+# login/nav/htmx decorator stack as the sync view, in a worker thread.
+
+async def _alist_context(request, model, sort_fields, context_name, **list_options):
+    """
+    Async ``_list_context``: offset pages fetch their rows while the total
+    is counted. Cursor pages don't count, so they run ``_paginate`` as is.
+    """
+    qs, state = await sync_to_async(_list_queryset)(request, model, sort_fields, **list_options)
+    params = _list_params(request)
+    if params.get('paging') == 'cursor':
+        page_obj, paging_ctx = await sync_to_async(_paginate)(
+            request, qs, sort_fields[state['sort_field']], state['sort_dir'], state['per_page'],
+        )
+    else:
+        paginator = CountingPaginator(qs, state['per_page'], hub_id=await request.session.aget('hub_id'))
+        page_obj = await paginator.aget_page(params.get('page', 1))
+        paging_ctx = {
+            'paging': 'offset',
+            'show_count': True,
+            'page_range': paginator.get_elided_page_range(page_obj.number, on_each_side=2, on_ends=1),
+        }
+    return {context_name: page_obj, 'page_obj': page_obj, **state, **paging_ctx}
+
+
+async def _arender(request, page_view, load):
+    """
+    Build the context with ``load()`` and render it with the sync
+    ``page_view``. Anonymous requests skip ``load`` and get the login
+    redirect from ``page_view``.
+    """
+    context = await load() if await request.session.aget('local_user_id') else {}
+    return await sync_to_async(page_view)(request, context)
+
+
+@login_required
+@with_module_nav('property_mgmt', 'dashboard')
+@htmx_view('property_mgmt/pages/index.html', 'property_mgmt/partials/dashboard_content.html')
+@before_render
+def _dashboard_page(request, context):
+    return context
+
+
+@login_required
+@with_module_nav('property_mgmt', 'properties')
+@htmx_view('property_mgmt/pages/properties.html', 'property_mgmt/partials/properties_content.html')
+@before_render
+def _properties_page(request, context):
+    return _properties_response(request, context)
+
+
+@login_required
+@with_module_nav('property_mgmt', 'tenants')
+@htmx_view('property_mgmt/pages/tenants.html', 'property_mgmt/partials/tenants_content.html')
+@before_render
+def _tenants_page(request, context):
+    return _tenants_response(request, context)
+
+
+@profiled
+async def dashboard_async(request):
+    async def load():
+        hub_id = await request.session.aget('hub_id')
+        metrics, analytics = await asyncio.gather(
+            aget_dashboard_metrics(hub_id), aread(get_portfolio_analytics, hub_id),
+        )
+        return {**metrics, 'analytics': analytics}
+    return await _arender(request, _dashboard_page, load)
+
+
+@profiled
+async def properties_list_async(request):
+    if request.GET.get('export'):
+        # Downloads stream from the sync export path; this view profiles them.
+        return await sync_to_async(properties_list.__wrapped__)(request)
+    return await _arender(request, _properties_page, lambda: _alist_context(
+        request, Property, PROPERTY_SORT_FIELDS, 'properties', refine=_refine_properties,
+    ))
+
+
+@profiled
+async def tenants_list_async(request):
+    if request.GET.get('export'):
+        return await sync_to_async(tenants_list.__wrapped__)(request)
+    return await _arender(request, _tenants_page, lambda: _alist_context(
+        request, Tenant, TENANT_SORT_FIELDS, 'tenants',
+    ))
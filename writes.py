@@ -0,0 +1,82 @@
+"""
+Single-statement row writes for the datatable toggle and delete views.
+
+``toggle_active`` flips ``is_active`` in the database with
+``UPDATE ... SET is_active = NOT is_active ... RETURNING``, so concurrent
+clicks each flip the row once and the flipped row comes back from the
+same statement. Backends without ``UPDATE ... RETURNING`` (MySQL, SQLite
+older than 3.35) run the same ``UPDATE`` and read the row back in one
+transaction. ``soft_delete`` is one conditional ``UPDATE``.
+
+Both match only live rows of the given hub and report a miss (``None`` /
+``False``) so the views can keep answering 404. ``QuerySet.update()`` and
+raw SQL bypass the model signals, so both send ``bulk_updated``.
+"""
+from django.db import connections, transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+from .signals import bulk_updated
+
+
+def _can_return(conn):
+    if conn.vendor == 'postgresql':
+        return True
+    if conn.vendor == 'sqlite':
+        return conn.Database.sqlite_version_info >= (3, 35)
+    return False
+
+
+def _toggle_returning(model, conn, hub_id, pk, now):
+    opts = model._meta
+    qn = conn.ops.quote_name
+    field = opts.get_field
+    where = [f'{qn(opts.pk.column)} = %s', f'{qn(field("is_deleted").column)} = %s']
+    params = [
+        field('updated_at').get_db_prep_save(now, conn),
+        opts.pk.get_db_prep_save(pk, conn),
+        field('is_deleted').get_db_prep_save(False, conn),
+    ]
+    if hub_id is None:
+        where.append(f'{qn(field("hub_id").column)} IS NULL')
+    else:
+        where.append(f'{qn(field("hub_id").column)} = %s')
+        params.append(field('hub_id').get_db_prep_save(hub_id, conn))
+    is_active = qn(field('is_active').column)
+    sql = 'UPDATE {} SET {} = NOT {}, {} = %s WHERE {} RETURNING {}'.format(
+        qn(opts.db_table), is_active, is_active, qn(field('updated_at').column), ' AND '.join(where),
+        ', '.join(qn(f.column) for f in opts.concrete_fields),
+    )
+    # raw() applies the backend's converters, as a SELECT would.
+    return next(iter(model.all_objects.raw(sql, params)), None)
+
+
+def toggle_active(model, hub_id, pk):
+    """
+    Flip ``is_active`` on the live ``model`` row ``pk`` of the hub in one
+    statement. Returns the updated instance, or ``None`` if there is no
+    such row.
+    """
+    conn = connections[model.all_objects.db]
+    now = timezone.now()
+    if _can_return(conn):
+        obj = _toggle_returning(model, conn, hub_id, pk, now)
+    else:
+        with transaction.atomic(using=conn.alias):
+            rows = model.all_objects.filter(pk=pk, hub_id=hub_id, is_deleted=False)
+            flip = Case(When(is_active=True, then=Value(False)), default=Value(True))
+            obj = rows.first() if rows.update(is_active=flip, updated_at=now) else None
+    if obj is not None:
+        bulk_updated.send(sender=model, hub_id=hub_id, fields=['is_active'])
+    return obj
+
+
+def soft_delete(model, hub_id, pk):
+    """Soft-delete the live ``model`` row ``pk`` of the hub. Returns whether a row was deleted."""
+    now = timezone.now()
+    deleted = model.all_objects.filter(pk=pk, hub_id=hub_id, is_deleted=False).update(
+        is_deleted=True, deleted_at=now, updated_at=now,
+    )
+    if deleted:
+        bulk_updated.send(sender=model, hub_id=hub_id, fields=['is_deleted'])
+    return bool(deleted)